@@ -0,0 +1,180 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+import httpx
+
+# Query parameter the Data API filters list requests on (inclusive, ISO 8601)
+MODIFIED_SINCE_PARAM = "modifiedSince"
+# Sort asked for with it, so offsets stay stable while the filtered set is paged
+ORDER_BY_PARAM = "orderBy"
+MODIFIED_ORDER = "ModifiedDate ASC, Id ASC"
+
+
+class CongaAPIError(Exception):
+    """A Conga request answered with an error status (or no usable token)."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class CongaClient:
+    """Async client for the Conga Data API sharing one client-credentials token.
+
+    The token is renewed `refresh_buffer` seconds before it expires; concurrent
+    callers that find it stale wait for a single token request. A 401 drops the
+    token and the request is retried once with a fresh one.
+
+    With `coalesce`, identical GETs (same URL, Accept header and credentials)
+    made while one is already in flight wait for that request instead of
+    sending their own, and all of them receive the same response.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        timeout: float = 30.0,
+        refresh_buffer: float = 60,
+        max_connections: int = 100,
+        coalesce: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_buffer = refresh_buffer
+        self.coalesce = coalesce
+        # One keep-alive pool for every caller, so requests reuse warm connections
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.http = httpx.AsyncClient(timeout=timeout, limits=limits, transport=transport)
+
+        self._token = None
+        self._expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self._in_flight: Dict[tuple, asyncio.Task] = {}
+
+        self.token_requests = 0
+        # Requests sent upstream, GETs asked of the client, and GETs served by another's request
+        self.requests = 0
+        self.gets = 0
+        self.coalesced = 0
+
+    def _token_valid(self) -> bool:
+        return self._token is not None and time.time() < self._expires_at - self.refresh_buffer
+
+    async def token(self) -> str:
+        if self._token_valid():
+            return self._token
+        async with self._token_lock:
+            if self._token_valid():
+                return self._token
+            self.token_requests += 1
+            try:
+                response = await self.http.post(self.token_url, data={
+                    "grant_type": "client_credentials",
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                })
+            except httpx.HTTPError as exc:
+                raise CongaAPIError(0, f"Token request failed: {exc}") from exc
+            if response.status_code != 200:
+                raise CongaAPIError(response.status_code, f"Token request failed: {response.text[:200]}")
+            data = response.json()
+            self._token = data["access_token"]
+            self._expires_at = time.time() + float(data.get("expires_in", 3600))
+            return self._token
+
+    def invalidate_token(self, token: Optional[str] = None):
+        """Drop the cached token, unless it was already replaced since `token` was used."""
+        if token is None or token == self._token:
+            self._token = None
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params=None,
+        content: Optional[bytes] = None,
+        headers: Optional[dict] = None,
+    ) -> httpx.Response:
+        """Send a request to `path` (relative to base_url) with the shared token.
+
+        Returns the response whatever its status; raises CongaAPIError when no
+        token can be obtained or the request fails in transport.
+        """
+        if method != "GET":
+            return await self._send(method, path, params, content, headers)
+
+        self.gets += 1
+        if not self.coalesce:
+            return await self._send(method, path, params, content, headers)
+        accept = next((value for name, value in (headers or {}).items() if name.lower() == "accept"), None)
+        key = (self.client_id, str(httpx.URL(self.base_url + path, params=params)), accept)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send(method, path, params, content, headers))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.coalesced += 1
+        # Shielded, so a caller that gives up doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "token_requests": self.token_requests,
+            "gets": self.gets,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / self.gets if self.gets else 0.0,
+            "in_flight": len(self._in_flight),
+        }
+
+    def _finished(self, key: tuple, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved even if every waiter gave up
+
+    async def _send(self, method, path, params, content, headers) -> httpx.Response:
+        for attempt in range(2):
+            token = await self.token()
+            self.requests += 1
+            try:
+                response = await self.http.request(
+                    method,
+                    self.base_url + path,
+                    params=params,
+                    content=content,
+                    headers={**(headers or {}), "Authorization": f"Bearer {token}"},
+                )
+            except httpx.HTTPError as exc:
+                raise CongaAPIError(0, f"{method} {path} failed: {exc}") from exc
+            if response.status_code == 401 and attempt == 0:
+                self.invalidate_token(token)
+                continue
+            return response
+
+    async def get_json(self, path: str, params: Optional[dict] = None):
+        """GET `path` (relative to base_url) and return the decoded JSON body."""
+        response = await self.request("GET", path, params, headers={"Accept": "application/json"})
+        if response.status_code >= 400:
+            raise CongaAPIError(response.status_code, f"GET {path}: {response.text[:200]}")
+        return response.json()
+
+    async def list_records(
+        self, object_type: str, limit: int, offset: int = 0, modified_since: Optional[str] = None,
+    ) -> dict:
+        """One page of records, sorted by ModifiedDate then Id when `modified_since` is given."""
+        params = {"limit": limit, "offset": offset}
+        if modified_since:
+            params[MODIFIED_SINCE_PARAM] = modified_since
+            params[ORDER_BY_PARAM] = MODIFIED_ORDER
+        return await self.get_json(f"/v1/objects/{object_type}", params)
+
+    async def close(self):
+        await self.http.aclose()
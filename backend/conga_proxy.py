@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from fnmatch import fnmatch
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode
+
+from conga_client import CongaAPIError, CongaClient
+from response_cache import LocalCacheStore, make_etag
+
+logger = logging.getLogger(__name__)
+
+# Request headers passed through to Conga; the client's own Authorization is replaced
+FORWARDED_HEADERS = ("accept", "accept-language", "content-type")
+
+
+class ProxyEntry(NamedTuple):
+    status: int
+    body: bytes
+    media_type: Optional[str]
+    etag: Optional[str]
+    fetched_at: float
+
+
+class CongaProxy:
+    """Forwards requests to the Conga Data API with the backend's shared token.
+
+    GETs whose path matches one of `cache_paths` (fnmatch patterns) are served
+    from memory for `ttl` seconds. For `stale` seconds after that the old copy
+    is still returned while a single background request refreshes it. Every
+    other request goes upstream; a successful write drops all cached entries.
+
+    Writes go out with the backend's own credentials, so only paths matching
+    one of `write_paths` accept them; by default the proxy is read-only.
+    """
+
+    def __init__(
+        self,
+        client: CongaClient,
+        ttl: float = 60,
+        stale: float = 300,
+        cache_paths: Iterable[str] = (),
+        max_entries: int = 1024,
+        write_paths: Iterable[str] = (),
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.stale = stale
+        self.cache_paths = list(cache_paths)
+        self.max_entries = max_entries
+        self.write_paths = list(write_paths)
+        self.store = LocalCacheStore(max_entries)
+        self._refreshing = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.upstream_errors = 0
+
+    def writable(self, path: str) -> bool:
+        return any(fnmatch(path, pattern) for pattern in self.write_paths)
+
+    def cacheable(self, method: str, path: str) -> bool:
+        return method == "GET" and self.ttl > 0 and any(fnmatch(path, pattern) for pattern in self.cache_paths)
+
+    async def forward(
+        self,
+        method: str,
+        path: str,
+        params: List[Tuple[str, str]],
+        body: bytes = b"",
+        headers: Optional[dict] = None,
+        use_cache: bool = True,
+    ) -> Tuple[ProxyEntry, str]:
+        """Answer one proxied request; returns the entry and HIT, STALE, MISS or BYPASS."""
+        headers = {name: value for name, value in (headers or {}).items() if name.lower() in FORWARDED_HEADERS}
+        if not self.cacheable(method, path):
+            self.bypassed += 1
+            entry = await self._fetch(method, path, params, body, headers)
+            if method != "GET" and entry.status < 400:
+                self.store = LocalCacheStore(self.max_entries)
+            return entry, "BYPASS"
+
+        # Responses differ by content negotiation, so Accept is part of the key
+        accept = next((value for name, value in headers.items() if name.lower() == "accept"), "")
+        key = path + "?" + urlencode(sorted(params)) + "|" + accept
+        entry = await self.store.get(key) if use_cache else None
+        if entry is not None:
+            if time.monotonic() - entry.fetched_at <= self.ttl:
+                self.hits += 1
+                return entry, "HIT"
+            self.stale_hits += 1
+            if key not in self._refreshing:
+                self._refreshing[key] = asyncio.create_task(self._refresh(key, path, params, headers))
+            return entry, "STALE"
+
+        self.misses += 1
+        entry = await self._fetch(method, path, params, body, headers)
+        await self._store(key, entry)
+        return entry, "MISS"
+
+    def age(self, entry: ProxyEntry) -> int:
+        return int(time.monotonic() - entry.fetched_at)
+
+    async def close(self):
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+        self._refreshing.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "ttl_seconds": self.ttl,
+            "stale_seconds": self.stale,
+            "cache_paths": self.cache_paths,
+            "write_paths": self.write_paths,
+            "entries": len(self.store),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "upstream_errors": self.upstream_errors,
+            "upstream_requests": self.client.requests,
+            "token_requests": self.client.token_requests,
+            "client_gets": self.client.gets,
+            "coalesced": self.client.coalesced,
+            "coalesced_ratio": self.client.coalesced / self.client.gets if self.client.gets else 0.0,
+        }
+
+    async def _fetch(self, method, path, params, body, headers) -> ProxyEntry:
+        try:
+            response = await self.client.request(method, path, params, content=body or None, headers=headers)
+        except CongaAPIError:
+            self.upstream_errors += 1
+            raise
+        etag = make_etag(response.content) if response.status_code == 200 else None
+        return ProxyEntry(
+            response.status_code, response.content, response.headers.get("content-type"), etag, time.monotonic(),
+        )
+
+    async def _store(self, key: str, entry: ProxyEntry):
+        # Kept for the stale window as well; freshness is judged from fetched_at
+        if entry.status == 200:
+            await self.store.set(key, entry, self.ttl + self.stale)
+
+    async def _refresh(self, key, path, params, headers):
+        try:
+            self.refreshes += 1
+            entry = await self._fetch("GET", path, params, b"", headers)
+            if entry.status == 200:
+                await self._store(key, entry)
+            else:
+                self.refresh_failures += 1
+        except Exception:
+            self.refresh_failures += 1
+            logger.exception("Refreshing cached Conga response %s failed", key)
+        finally:
+            self._refreshing.pop(key, None)
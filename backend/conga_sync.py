@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import ASCENDING, IndexModel, ReplaceOne
+
+from conga_client import CongaClient
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_COLLECTION = "conga_sync_checkpoints"
+# The first load filters on this too, so it pages through the same sorted result
+INITIAL_WATERMARK = "1970-01-01T00:00:00.000Z"
+RECORD_INDEXES = [
+    IndexModel([("Id", ASCENDING)], name="id_unique", unique=True),
+    IndexModel([("ModifiedDate", ASCENDING)], name="modified_date"),
+]
+
+
+def collection_name(object_type: str) -> str:
+    return f"conga_{object_type.lower()}"
+
+
+def parse_modified(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed.astimezone(timezone.utc) if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def records_of(body) -> list:
+    if isinstance(body, list):
+        return body
+    return body.get("Data") or body.get("data") or []
+
+
+def check_order(object_type: str, since: str, page: list):
+    """Keyset paging is only complete over records sorted by (ModifiedDate, Id) from `since` on."""
+    previous = (parse_modified(since), "")
+    for record in page:
+        key = (parse_modified(record["ModifiedDate"]), record["Id"])
+        if key < previous:
+            raise RuntimeError(
+                f"Conga returned {object_type} records out of (ModifiedDate, Id) order after {since}; "
+                "the watermark was not moved past them"
+            )
+        previous = key
+
+
+class CongaSyncWorker:
+    """Mirrors Conga objects into `conga_<type>` collections, one delta at a time.
+
+    Each object keeps a checkpoint with the latest ModifiedDate applied (the
+    watermark) and the Ids already applied at exactly that date. Records are
+    read in (ModifiedDate, Id) order with keyset paging: every page asks for
+    records modified since the previous page's last one, inclusive, and skips
+    the Ids already applied at that date. A record changed while the run is
+    paging moves past the cursor and is read again later, rather than shifting
+    an offset over rows not yet read. Offsets are only used within a single
+    ModifiedDate shared by more than a page of records. A page that is not in
+    that order fails the run before the watermark moves past it.
+
+    Records are upserted by Id with unordered bulk writes and the checkpoint
+    moves after every page, so an interrupted run resumes where it stopped.
+    Deletions in Conga are not seen by a modified-date filter and stay in the
+    local copy.
+    """
+
+    def __init__(
+        self,
+        client: CongaClient,
+        db,
+        object_types: Iterable[str],
+        page_size: int = 500,
+        interval: float = 300,
+    ):
+        self.client = client
+        self.db = db
+        self.object_types = list(object_types)
+        self.page_size = page_size
+        self.interval = interval
+
+        self._locks: Dict[str, asyncio.Lock] = {name: asyncio.Lock() for name in self.object_types}
+        self._indexed = set()
+        self._wake = asyncio.Event()
+        self._requested: set = set()
+        self._closing = False
+        self._task = None
+
+        self.runs = 0
+        self.failures = 0
+        self.last_results: Dict[str, dict] = {}
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def trigger(self, object_type: Optional[str] = None) -> List[str]:
+        """Ask the background loop for an immediate sync of one or all objects."""
+        requested = [object_type] if object_type else self.object_types
+        self._requested.update(requested)
+        self._wake.set()
+        return requested
+
+    async def close(self):
+        self._closing = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def sync_all(self, object_types: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        results = {}
+        for object_type in object_types or self.object_types:
+            try:
+                results[object_type] = await self.sync_object(object_type)
+            except Exception as exc:
+                self.failures += 1
+                logger.exception("Syncing Conga %s failed", object_type)
+                results[object_type] = self.last_results[object_type] = {"error": str(exc)}
+        return results
+
+    async def sync_object(self, object_type: str) -> dict:
+        """Apply everything modified since the object's checkpoint; returns run counters."""
+        async with self._locks.setdefault(object_type, asyncio.Lock()):
+            records = self.db[collection_name(object_type)]
+            if object_type not in self._indexed:
+                await records.create_indexes(RECORD_INDEXES)
+                self._indexed.add(object_type)
+
+            checkpoint = await self.db[CHECKPOINT_COLLECTION].find_one({"_id": object_type}) or {}
+            watermark = checkpoint.get("watermark") or INITIAL_WATERMARK
+            boundary = set(checkpoint.get("boundary_ids", []))
+            result = {"pages": 0, "fetched": 0, "skipped": 0, "upserted": 0, "modified": 0}
+            started = time.perf_counter()
+
+            offset = 0
+            while True:
+                since = watermark
+                page = records_of(await self.client.list_records(
+                    object_type, limit=self.page_size, offset=offset, modified_since=since,
+                ))
+                result["pages"] += 1
+                result["fetched"] += len(page)
+                check_order(object_type, since, page)
+
+                changed = [
+                    record for record in page
+                    if not (record.get("ModifiedDate") == since and record.get("Id") in boundary)
+                ]
+                result["skipped"] += len(page) - len(changed)
+                if changed:
+                    synced_at = datetime.now(timezone.utc)
+                    written = await records.bulk_write(
+                        [ReplaceOne({"Id": record["Id"]}, {**record, "_synced_at": synced_at}, upsert=True)
+                         for record in changed],
+                        ordered=False,
+                    )
+                    result["upserted"] += written.upserted_count
+                    result["modified"] += written.modified_count
+
+                for record in changed:
+                    if parse_modified(record["ModifiedDate"]) == parse_modified(watermark):
+                        boundary.add(record["Id"])
+                    else:
+                        watermark, boundary = record["ModifiedDate"], {record["Id"]}
+
+                if len(page) < self.page_size:
+                    break
+                # A full page that never left `since` holds only records at that
+                # date; step over it, as the next page starts from `since` again
+                offset = offset + len(page) if watermark == since else 0
+                await self._save_checkpoint(object_type, watermark, boundary)
+
+            await self._save_checkpoint(object_type, watermark, boundary)
+
+            result["seconds"] = round(time.perf_counter() - started, 3)
+            result["watermark"] = watermark
+            result["finished_at"] = datetime.now(timezone.utc)
+            await self.db[CHECKPOINT_COLLECTION].update_one(
+                {"_id": object_type}, {"$set": {"last_run": result}}, upsert=True,
+            )
+            self.runs += 1
+            self.last_results[object_type] = result
+            return result
+
+    async def checkpoints(self) -> List[dict]:
+        cursor = self.db[CHECKPOINT_COLLECTION].find({}, {"boundary_ids": 0})
+        return [{"object": document.pop("_id"), **document} for document in await cursor.to_list(None)]
+
+    def stats(self) -> dict:
+        return {
+            "objects": self.object_types,
+            "interval_seconds": self.interval,
+            "page_size": self.page_size,
+            "runs": self.runs,
+            "failures": self.failures,
+            "pending": sorted(self._requested),
+            "last_results": self.last_results,
+            "api_requests": self.client.requests,
+            "token_requests": self.client.token_requests,
+        }
+
+    async def _save_checkpoint(self, object_type: str, watermark: str, boundary: set):
+        await self.db[CHECKPOINT_COLLECTION].update_one(
+            {"_id": object_type},
+            {
+                "$set": {"watermark": watermark, "boundary_ids": sorted(boundary), "updated_at": datetime.now(timezone.utc)},
+                # Offset-paging state saved by earlier versions
+                "$unset": {"pass": ""},
+            },
+            upsert=True,
+        )
+
+    async def _run(self):
+        self._requested.update(self.object_types)
+        while not self._closing:
+            requested = [object_type for object_type in self.object_types if object_type in self._requested]
+            self._requested = set()
+            if requested:
+                await self.sync_all(requested)
+            if self._closing:
+                return
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                self._requested.update(self.object_types)
+            self._wake.clear()
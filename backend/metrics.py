@@ -0,0 +1,299 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import monitoring
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, shared by the request and Mongo command histograms
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Command fields that can be arbitrarily large and say nothing about why it was slow
+BULKY_COMMAND_FIELDS = {"documents", "updates", "deletes", "lsid", "$clusterTime", "$db", "txnNumber"}
+COMMAND_SUMMARY_LIMIT = 500
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Iterable[str], values: Iterable) -> str:
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Prometheus-style histogram keyed by a tuple of label values; safe to observe from any thread."""
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...], buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    cumulative += count
+                    bucket_labels = format_labels(self.label_names + ("le",), labels + (bound,))
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                inf_labels = format_labels(self.label_names + ("le",), labels + ("+Inf",))
+                lines.append(f"{self.name}_bucket{inf_labels} {series['count']}")
+                plain = format_labels(self.label_names, labels)
+                lines.append(f"{self.name}_sum{plain} {series['sum']}")
+                lines.append(f"{self.name}_count{plain} {series['count']}")
+        return lines
+
+
+def render_metric(name: str, kind: str, help: str, samples: Dict[tuple, float], label_names: Tuple[str, ...] = ()) -> List[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in sorted(samples.items()):
+        lines.append(f"{name}{format_labels(label_names, labels)} {value}")
+    return lines
+
+
+class RequestTiming:
+    """Mongo time spent on behalf of one HTTP request, filled in by CommandMetrics."""
+
+    def __init__(self, capture_commands: bool):
+        self.capture_commands = capture_commands
+        self.db_seconds = 0.0
+        self.db_commands = 0
+        self.slowest = None
+        self._started = {}
+
+
+current_request: ContextVar[Optional[RequestTiming]] = ContextVar("current_request", default=None)
+
+
+def summarize_command(command: dict) -> str:
+    summary = {key: value for key, value in command.items() if key not in BULKY_COMMAND_FIELDS}
+    for key in ("documents", "updates", "deletes"):
+        if key in command:
+            summary[key] = f"<{len(command[key])} items>"
+    text = repr(summary)
+    return text if len(text) <= COMMAND_SUMMARY_LIMIT else text[:COMMAND_SUMMARY_LIMIT] + "..."
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Times every Mongo command and charges it to the HTTP request that issued it.
+
+    Motor runs pymongo in a thread pool but copies the calling context, so
+    `current_request` still points at the issuing request inside these callbacks.
+    """
+
+    def __init__(self):
+        self.durations = Histogram(
+            "mongodb_command_duration_seconds", "Duration of MongoDB commands.", ("command",),
+        )
+        self.failures = defaultdict(int)
+
+    def started(self, event):
+        timing = current_request.get()
+        if timing is not None and timing.capture_commands:
+            timing._started[event.request_id] = summarize_command(event.command)
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self.failures[(event.command_name,)] += 1
+        self._finished(event)
+
+    def _finished(self, event):
+        seconds = event.duration_micros / 1e6
+        self.durations.observe((event.command_name,), seconds)
+        timing = current_request.get()
+        if timing is None:
+            return
+        timing.db_seconds += seconds
+        timing.db_commands += 1
+        summary = timing._started.pop(event.request_id, None)
+        if timing.slowest is None or seconds > timing.slowest[0]:
+            timing.slowest = (seconds, event.command_name, summary)
+
+    def render(self) -> List[str]:
+        return self.durations.render() + render_metric(
+            "mongodb_command_failures_total", "counter", "Failed MongoDB commands.", dict(self.failures), ("command",),
+        )
+
+
+class RequestMetrics:
+    """Per-route latency, DB time and in-flight counts for the HTTP server."""
+
+    def __init__(self, slow_request_seconds: float = 0):
+        self.slow_request_seconds = slow_request_seconds
+        self.in_flight = 0
+        self.requests = defaultdict(int)
+        self.latency = Histogram(
+            "http_request_duration_seconds", "Time to fully send an HTTP response.", ("method", "route"),
+        )
+        self.db_time = Histogram(
+            "http_request_db_seconds", "MongoDB time spent per HTTP request.", ("method", "route"),
+        )
+
+    def record(self, method: str, route: str, status: int, seconds: float, timing: RequestTiming):
+        self.requests[(method, route, str(status))] += 1
+        self.latency.observe((method, route), seconds)
+        self.db_time.observe((method, route), timing.db_seconds)
+        if self.slow_request_seconds and seconds >= self.slow_request_seconds:
+            slowest = "none"
+            if timing.slowest is not None:
+                command_seconds, command_name, summary = timing.slowest
+                slowest = f"{command_name} {command_seconds * 1000:.1f}ms {summary or ''}"
+            logger.warning(
+                "Slow request %s %s -> %s in %.1fms (db %.1fms over %d commands; slowest: %s)",
+                method, route, status, seconds * 1000, timing.db_seconds * 1000, timing.db_commands, slowest,
+            )
+
+    def render(self) -> List[str]:
+        return (
+            render_metric("http_requests_in_flight", "gauge", "HTTP requests being served.", {(): self.in_flight})
+            + render_metric(
+                "http_requests_total", "counter", "HTTP requests served.", dict(self.requests),
+                ("method", "route", "status"),
+            )
+            + self.latency.render()
+            + self.db_time.render()
+        )
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request until its last body chunk is sent."""
+
+    def __init__(self, app, metrics: RequestMetrics, routes: Iterable = ()):
+        self.app = app
+        self.metrics = metrics
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming(capture_commands=bool(self.metrics.slow_request_seconds))
+        token = current_request.set(timing)
+        started = time.perf_counter()
+        status = 500
+        finished = False
+
+        async def send_wrapper(message):
+            nonlocal status, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished = True
+                self._record(scope, status, started, timing)
+
+        self.metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.in_flight -= 1
+            current_request.reset(token)
+            if not finished:
+                self._record(scope, status, started, timing)
+
+    def _record(self, scope, status, started, timing):
+        # Label by route template so path parameters don't explode the series count.
+        # Responses served by middleware (e.g. cache hits) never reach the router.
+        route = scope.get("route")
+        if route is None:
+            route = next((r for r in self.routes if r.matches(scope)[0] == Match.FULL), None)
+        route_path = getattr(route, "path", None) or "unmatched"
+        self.metrics.record(scope["method"], route_path, status, time.perf_counter() - started, timing)
+
+
+def render_pool_stats(pools: dict) -> List[str]:
+    """Gauges and counters from PoolStats.snapshot()."""
+    def samples(key):
+        return {(address,): stats[key] for address, stats in pools.items()}
+
+    return (
+        render_metric("mongodb_pool_connections_open", "gauge", "Open pooled connections.", samples("open"), ("address",))
+        + render_metric(
+            "mongodb_pool_connections_checked_out", "gauge", "Connections in use.", samples("checked_out"), ("address",),
+        )
+        + render_metric("mongodb_pool_checkouts_total", "counter", "Connection checkouts.", samples("checkouts"), ("address",))
+        + render_metric(
+            "mongodb_pool_checkout_failures_total", "counter", "Failed connection checkouts.",
+            samples("checkout_failures"), ("address",),
+        )
+    )
+
+
+def render_buffer_stats(stats: dict) -> List[str]:
+    """Status write buffer counters and batch-size histogram from StatusWriteBuffer.stats()."""
+    lines = render_metric("status_buffer_pending", "gauge", "Status checks waiting to be flushed.", {(): stats["pending"]})
+    for name, key, help in (
+        ("status_buffer_documents_total", "documents", "Status checks flushed."),
+        ("status_buffer_batches_total", "batches", "insert_many batches flushed."),
+        ("status_buffer_failed_total", "failed", "Buffered status checks that failed to write."),
+        ("status_buffer_rejected_total", "rejected", "Status checks rejected because the buffer was full."),
+        ("status_buffer_flush_seconds_total", "flush_seconds_total", "Time spent flushing batches."),
+    ):
+        lines += render_metric(name, "counter", help, {(): stats[key]})
+
+    lines += ["# HELP status_buffer_batch_size Documents per flushed batch.", "# TYPE status_buffer_batch_size histogram"]
+    cumulative = 0
+    for bound, count in stats["batch_size_buckets"].items():
+        cumulative += count
+        lines.append(f'status_buffer_batch_size_bucket{{le="{bound}"}} {cumulative}')
+    lines += [f"status_buffer_batch_size_sum {stats['documents']}", f"status_buffer_batch_size_count {stats['batches']}"]
+    return lines
+
+
+def render_cache_stats(stats: dict) -> List[str]:
+    """Response cache counters from ResponseCache.stats()."""
+    lines = []
+    for key, help in (
+        ("hits", "Response cache hits."),
+        ("misses", "Response cache misses."),
+        ("not_modified", "Responses answered with 304 Not Modified."),
+        ("invalidations", "Response cache invalidations."),
+        ("errors", "Response cache store errors."),
+    ):
+        lines += render_metric(f"response_cache_{key}_total", "counter", help, {(): stats[key]})
+    return lines
+
+
+def render_proxy_stats(stats: dict) -> List[str]:
+    """Conga proxy cache and upstream counters from CongaProxy.stats()."""
+    lines = render_metric("conga_proxy_cache_entries", "gauge", "Cached Conga responses.", {(): stats["entries"]})
+    for key, help in (
+        ("hits", "Conga proxy requests answered from a fresh cache entry."),
+        ("stale_hits", "Conga proxy requests answered from a stale entry while it was refreshed."),
+        ("misses", "Cacheable Conga proxy requests that waited for upstream."),
+        ("bypassed", "Conga proxy requests that are never cached."),
+        ("refresh_failures", "Background refreshes of stale entries that failed."),
+        ("upstream_errors", "Conga requests that failed in transport or authentication."),
+        ("upstream_requests", "Requests sent to the Conga API."),
+        ("token_requests", "Conga access tokens fetched."),
+        ("client_gets", "GETs asked of the Conga client, coalesced or not."),
+        ("coalesced", "GETs answered by an identical request already in flight."),
+    ):
+        lines += render_metric(f"conga_proxy_{key}_total", "counter", help, {(): stats[key]})
+    return lines
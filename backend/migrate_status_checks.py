@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+One-time migration of status_checks between storage modes
+
+The backend stores status checks either in a regular collection
+(STATUS_COLLECTION_MODE=standard, retention through a TTL index on timestamp)
+or in a MongoDB 6.0+ time-series collection with client_name as the metaField
+(STATUS_COLLECTION_MODE=timeseries, retention through expireAfterSeconds).
+MongoDB can't convert a collection in place, so switching modes copies the data:
+
+    1. Stop the backend, or at least stop writers to status_checks.
+    2. python migrate_status_checks.py --to timeseries     (or --to standard)
+    3. Set STATUS_COLLECTION_MODE in .env to the same mode and start the backend.
+
+MongoDB can't rename time-series collections, so the two directions differ:
+
+    standard -> timeseries: status_checks is renamed to
+        status_checks_backup_<timestamp>, a time-series status_checks is created
+        with its indexes and retention, and the backup is copied into it. Drop
+        the backup once satisfied (or pass --drop-backup).
+    timeseries -> standard: documents are copied into status_checks_migrating,
+        which gets the standard indexes and TTL index; the time-series
+        collection is then dropped and status_checks_migrating takes its name.
+
+Time-series collections don't support unique indexes, so duplicate ids are no
+longer rejected after moving to timeseries. Documents already past the
+retention window are skipped.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
+
+# Reuse the backend's .env loading, index declarations and collection options
+import server
+
+TEMP_COLLECTION = "status_checks_migrating"
+
+
+def copy_documents(source, target, batch_size, since=None):
+    """Copy documents in batches; returns the number written."""
+    query = {"timestamp": {"$gte": since}} if since else {}
+    projection = {"_id": 0, **{field: 1 for field in server.StatusCheck.model_fields}}
+    copied, batch = 0, []
+    for document in source.find(query, projection, batch_size=batch_size):
+        batch.append(document)
+        if len(batch) >= batch_size:
+            copied += insert_batch(target, batch)
+            batch = []
+            print(f"   copied {copied} documents...", end="\r")
+    if batch:
+        copied += insert_batch(target, batch)
+    return copied
+
+
+def create_target(db, name, mode):
+    """Create the destination collection with the mode's options, indexes and retention."""
+    target = db.create_collection(name, **server.status_collection_options(mode))
+    target.create_indexes(server.status_check_indexes(mode))
+    if mode == "standard" and server.STATUS_RETENTION_SECONDS:
+        target.create_index(
+            [("timestamp", 1)],
+            name=server.STATUS_TTL_INDEX_NAME,
+            expireAfterSeconds=server.STATUS_RETENTION_SECONDS,
+        )
+    return target
+
+
+def insert_batch(target, batch):
+    try:
+        return len(target.insert_many(batch, ordered=False).inserted_ids)
+    except BulkWriteError as exc:
+        # Duplicate ids going into a standard collection: keep the first copy
+        return exc.details["nInserted"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate status_checks between standard and time-series storage")
+    parser.add_argument("--to", choices=["standard", "timeseries"], required=True, dest="mode")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--drop-backup", action="store_true", help="drop the pre-migration backup (standard -> timeseries)")
+    args = parser.parse_args()
+
+    client = MongoClient(server.mongo_url)
+    db = client[os.environ['DB_NAME']]
+    existing = {info["name"]: info for info in db.list_collections()}
+
+    if "status_checks" not in existing:
+        print("❌ status_checks does not exist; start the backend with the desired STATUS_COLLECTION_MODE instead")
+        return 1
+    current = "timeseries" if existing["status_checks"].get("type") == "timeseries" else "standard"
+    if current == args.mode:
+        print(f"✅ status_checks is already a {current} collection")
+        return 0
+    if TEMP_COLLECTION in existing:
+        print(f"❌ {TEMP_COLLECTION} exists from an interrupted run; inspect and drop it first")
+        return 1
+
+    since = None
+    if server.STATUS_RETENTION_SECONDS:
+        since = datetime.utcnow() - timedelta(seconds=server.STATUS_RETENTION_SECONDS)
+
+    print(f"🔄 Migrating status_checks: {current} -> {args.mode}")
+    if args.mode == "timeseries":
+        backup = f"status_checks_backup_{datetime.utcnow():%Y%m%d%H%M%S}"
+        db.status_checks.rename(backup)
+        source, target = db[backup], create_target(db, "status_checks", args.mode)
+    else:
+        source, target = db.status_checks, create_target(db, TEMP_COLLECTION, args.mode)
+
+    source_count = source.count_documents({"timestamp": {"$gte": since}} if since else {})
+    copied = copy_documents(source, target, args.batch_size, since)
+    print(f"   copied {copied} of {source_count} documents")
+
+    if args.mode == "timeseries":
+        if copied < source_count:
+            print(f"❌ Not every document was copied; the original data is still in {backup}")
+            return 1
+        if args.drop_backup:
+            db.drop_collection(backup)
+            print(f"   dropped {backup}")
+        else:
+            print(f"   previous data kept in {backup}")
+    else:
+        db.drop_collection("status_checks")
+        target.rename("status_checks")
+
+    print(f"✅ status_checks is now a {args.mode} collection")
+    print(f"   Set STATUS_COLLECTION_MODE={args.mode} in .env before starting the backend")
+    client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+from collections import defaultdict
+
+from pymongo import monitoring
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters per server address, fed by pymongo pool events."""
+
+    def __init__(self):
+        self.pools = defaultdict(lambda: {
+            "open": 0,
+            "checked_out": 0,
+            "created": 0,
+            "closed": 0,
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "cleared": 0,
+        })
+
+    def snapshot(self) -> dict:
+        return {f"{host}:{port}": dict(stats) for (host, port), stats in self.pools.items()}
+
+    def pool_created(self, event):
+        self.pools[event.address]
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.pools[event.address]["cleared"] += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        stats = self.pools[event.address]
+        stats["open"] += 1
+        stats["created"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        stats = self.pools[event.address]
+        stats["open"] -= 1
+        stats["closed"] += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.pools[event.address]["checkout_failures"] += 1
+
+    def connection_checked_out(self, event):
+        stats = self.pools[event.address]
+        stats["checked_out"] += 1
+        stats["checkouts"] += 1
+
+    def connection_checked_in(self, event):
+        self.pools[event.address]["checked_out"] -= 1
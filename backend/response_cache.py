@@ -0,0 +1,165 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # optional: only needed for a shared cache
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    media_type: str
+    headers: dict
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class LocalCacheStore:
+    """In-process TTL + LRU store; also the stand-in when no shared store is configured."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: CachedResponse, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    async def bump_generation(self, namespace: str):
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCacheStore:
+    """Shared store so every worker process sees the same entries and invalidations."""
+
+    def __init__(self, url: str, prefix: str = "response-cache"):
+        self.redis = aioredis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self.redis.get(f"{self.prefix}:{key}")
+        if raw is None:
+            return None
+        entry = orjson.loads(raw)
+        return CachedResponse(entry["body"].encode(), entry["etag"], entry["media_type"], entry["headers"])
+
+    async def set(self, key: str, value: CachedResponse, ttl: float):
+        raw = orjson.dumps({**value._asdict(), "body": value.body.decode()})
+        await self.redis.set(f"{self.prefix}:{key}", raw, px=int(ttl * 1000))
+
+    async def generation(self, namespace: str) -> int:
+        return int(await self.redis.get(f"{self.prefix}:generation:{namespace}") or 0)
+
+    async def bump_generation(self, namespace: str):
+        await self.redis.incr(f"{self.prefix}:generation:{namespace}")
+
+
+class ResponseCache:
+    """Caches rendered GET responses per namespace.
+
+    Entry keys embed the namespace's generation, so invalidating a namespace is a
+    single counter bump; stale entries are never read again and age out by TTL.
+    A response is stored under the generation read before it was rendered, so
+    one that raced an invalidation is filed where no lookup will find it.
+    """
+
+    def __init__(self, store, ttl: float):
+        self.store = store
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @classmethod
+    def from_url(cls, url: Optional[str], ttl: float, max_entries: int = 1024) -> "ResponseCache":
+        if url and url.startswith("redis"):
+            if aioredis is not None:
+                return cls(RedisCacheStore(url), ttl)
+            logger.warning("RESPONSE_CACHE_URL is set but the redis package is not installed; using a local cache")
+        return cls(LocalCacheStore(max_entries), ttl)
+
+    async def generation(self, namespace: str) -> Optional[int]:
+        """The namespace's current generation, or None when the store can't be reached."""
+        try:
+            return await self.store.generation(namespace)
+        except Exception:
+            logger.exception("Response cache lookup failed")
+            self.errors += 1
+            return None
+
+    async def get(self, namespace: str, key: str, generation: Optional[int] = None) -> Optional[CachedResponse]:
+        try:
+            if generation is None:
+                generation = await self.store.generation(namespace)
+            entry = await self.store.get(f"{namespace}:{generation}:{key}")
+        except Exception:
+            logger.exception("Response cache lookup failed")
+            self.errors += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def set(self, namespace: str, key: str, value: CachedResponse, generation: int):
+        try:
+            await self.store.set(f"{namespace}:{generation}:{key}", value, self.ttl)
+        except Exception:
+            logger.exception("Response cache store failed")
+            self.errors += 1
+
+    async def invalidate(self, namespace: str):
+        self.invalidations += 1
+        try:
+            await self.store.bump_generation(namespace)
+        except Exception:
+            logger.exception("Response cache invalidation failed")
+            self.errors += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.store).__name__,
+            "ttl_seconds": self.ttl,
+            "entries": len(self.store) if isinstance(self.store, LocalCacheStore) else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
@@ -1,26 +1,178 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import BulkWriteError, PyMongoError
 import os
+import asyncio
+import json
+import base64
+import orjson
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List
+from urllib.parse import urlencode
+from metrics import (
+    CommandMetrics, MetricsMiddleware, RequestMetrics,
+    render_buffer_stats, render_cache_stats, render_pool_stats, render_proxy_stats,
+)
+from conga_client import CongaAPIError, CongaClient
+from conga_proxy import CongaProxy
+from conga_sync import CongaSyncWorker
+from mongo_pool import PoolStats
+from response_cache import CachedResponse, ResponseCache, make_etag
+from status_buffer import BufferFull, StatusWriteBuffer
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Optional
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection, opened by the lifespan handler
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+client = None
+db = None
+
+# Connection pool settings are per process: size them against the number of
+# uvicorn workers and the server's connection limit. zstd needs the zstandard
+# package and snappy needs python-snappy; zlib is always available.
+MONGO_CLIENT_OPTIONS = {
+    'maxPoolSize': int(os.environ.get('MONGO_MAX_POOL_SIZE', '100')),
+    'minPoolSize': int(os.environ.get('MONGO_MIN_POOL_SIZE', '0')),
+    'maxIdleTimeMS': int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '0')) or None,
+    'serverSelectionTimeoutMS': int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '30000')),
+}
+# Startup waits this long for MongoDB, not the whole server selection timeout;
+# collection, index and retention setup is skipped when it isn't reachable
+MONGO_STARTUP_TIMEOUT_SECONDS = float(os.environ.get('MONGO_STARTUP_TIMEOUT_SECONDS', '5'))
+if os.environ.get('MONGO_COMPRESSORS'):
+    MONGO_CLIENT_OPTIONS['compressors'] = os.environ['MONGO_COMPRESSORS']
+pool_stats = PoolStats()
+
+# Request latency and Mongo command timing, exposed at /api/metrics. Requests
+# slower than SLOW_REQUEST_MS are logged with their slowest Mongo command.
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', '0'))
+command_metrics = CommandMetrics()
+request_metrics = RequestMetrics(slow_request_seconds=SLOW_REQUEST_MS / 1000)
+
+# Status check paging: newest first, keyset cursor on (timestamp, id)
+STATUS_PAGE_SIZE = int(os.environ.get('STATUS_PAGE_SIZE', '100'))
+STATUS_PAGE_MAX = int(os.environ.get('STATUS_PAGE_MAX', '1000'))
+STATUS_STREAM_BATCH_SIZE = int(os.environ.get('STATUS_STREAM_BATCH_SIZE', '500'))
+STATUS_SORT = [("timestamp", DESCENDING), ("id", DESCENDING)]
+
+# Serve status lists straight from the projected DB documents with orjson,
+# skipping the pydantic model build and response_model re-validation
+STATUS_FAST_JSON = os.environ.get('STATUS_FAST_JSON', '').lower() in ('1', 'true', 'yes')
+
+# Status summary: histogram bucket widths and the most buckets one request may ask for
+STATUS_SUMMARY_BUCKETS = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1), "day": timedelta(days=1)}
+STATUS_SUMMARY_MAX_BUCKETS = int(os.environ.get('STATUS_SUMMARY_MAX_BUCKETS', '10000'))
+
+# Bulk ingestion: documents per insert_many round trip, and per request
+STATUS_BULK_CHUNK_SIZE = int(os.environ.get('STATUS_BULK_CHUNK_SIZE', '1000'))
+STATUS_BULK_MAX_ITEMS = int(os.environ.get('STATUS_BULK_MAX_ITEMS', '50000'))
+
+# Optional write-behind buffer for POST /api/status: off, durable or immediate
+STATUS_WRITE_BUFFER = os.environ.get('STATUS_WRITE_BUFFER', 'off').lower()
+STATUS_WRITE_BUFFER_MAX_ITEMS = int(os.environ.get('STATUS_WRITE_BUFFER_MAX_ITEMS', '500'))
+STATUS_WRITE_BUFFER_MAX_DELAY_MS = float(os.environ.get('STATUS_WRITE_BUFFER_MAX_DELAY_MS', '20'))
+STATUS_WRITE_BUFFER_MAX_PENDING = int(os.environ.get('STATUS_WRITE_BUFFER_MAX_PENDING', '10000'))
+status_buffer = None
+
+# Read-through cache for the polled GET endpoints, invalidated by status writes.
+# RESPONSE_CACHE_URL=redis://... shares entries between workers; TTL 0 disables.
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL_SECONDS', '5'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+CACHED_ROUTES = {"/api/": "root", "/api/status": "status_checks", "/api/status/summary": "status_checks"}
+CACHED_HEADERS = ("x-next-cursor",)
+response_cache = None
+if RESPONSE_CACHE_TTL_SECONDS > 0:
+    response_cache = ResponseCache.from_url(
+        os.environ.get('RESPONSE_CACHE_URL'), RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_ENTRIES,
+    )
+
+# Conga Data API connection shared by the /api/conga proxy and the sync worker;
+# both are off unless the client credentials are set
+CONGA_API_BASE_URL = os.environ.get('CONGA_API_BASE_URL', 'https://rls-preview.congacloud.eu/api/data')
+CONGA_TOKEN_URL = os.environ.get('CONGA_TOKEN_URL', 'https://login-preview.congacloud.eu/api/v1/auth/connect/token')
+CONGA_CLIENT_ID = os.environ.get('CONGA_CLIENT_ID', '')
+CONGA_CLIENT_SECRET = os.environ.get('CONGA_CLIENT_SECRET', '')
+CONGA_MAX_CONNECTIONS = int(os.environ.get('CONGA_MAX_CONNECTIONS', '100'))
+# Let identical concurrent GETs share one upstream request
+CONGA_COALESCE_GETS = os.environ.get('CONGA_COALESCE_GETS', 'true').lower() in ('1', 'true', 'yes')
+conga_client = None
+
+# /api/conga/{path} cache for idempotent GETs: fresh for the TTL, then served
+# stale for up to CONGA_PROXY_STALE_SECONDS while refreshed in the background
+CONGA_PROXY_CACHE_TTL_SECONDS = float(os.environ.get('CONGA_PROXY_CACHE_TTL_SECONDS', '60'))
+CONGA_PROXY_STALE_SECONDS = float(os.environ.get('CONGA_PROXY_STALE_SECONDS', '300'))
+CONGA_PROXY_CACHE_MAX_ENTRIES = int(os.environ.get('CONGA_PROXY_CACHE_MAX_ENTRIES', '1024'))
+# Comma-separated fnmatch patterns of the upstream paths worth caching
+CONGA_PROXY_CACHE_PATHS = os.environ.get(
+    'CONGA_PROXY_CACHE_PATHS', '/metadata*,*/describe,/swagger*,/v1/objects,/v1/currencies,/version',
+).split(',')
+# Writes run with the backend's credentials, so the proxy is read-only unless
+# upstream paths are allowed here, e.g. CONGA_PROXY_WRITE_PATHS=/v1/objects/Lead/*
+CONGA_PROXY_WRITE_PATHS = os.environ.get('CONGA_PROXY_WRITE_PATHS', '').split(',')
+conga_proxy = None
+
+# Delta sync of Conga objects into conga_<type> collections, e.g.
+# CONGA_SYNC_OBJECTS=Account,Contact,Agreement,Proposal; empty disables it
+CONGA_SYNC_OBJECTS = [name.strip() for name in os.environ.get('CONGA_SYNC_OBJECTS', '').split(',') if name.strip()]
+CONGA_SYNC_INTERVAL_SECONDS = float(os.environ.get('CONGA_SYNC_INTERVAL_SECONDS', '300'))
+CONGA_SYNC_PAGE_SIZE = int(os.environ.get('CONGA_SYNC_PAGE_SIZE', '500'))
+sync_worker = None
+
+# Indexes the status_checks queries rely on; ensured at startup
+STATUS_CHECK_INDEXES = [
+    # Serves the keyset sort and `after` filter without an in-memory sort
+    IndexModel(STATUS_SORT, name="timestamp_id"),
+    IndexModel([("client_name", ASCENDING), ("timestamp", DESCENDING)], name="client_name_timestamp"),
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+]
+
+# Storage for status_checks: a regular collection ("standard") or a MongoDB
+# time-series collection keyed on client_name ("timeseries"). Switching an
+# existing deployment is a one-time migration, see migrate_status_checks.py.
+STATUS_COLLECTION_MODE = os.environ.get('STATUS_COLLECTION_MODE', 'standard').lower()
+STATUS_TIMESERIES_GRANULARITY = os.environ.get('STATUS_TIMESERIES_GRANULARITY', 'seconds')
+# Documents older than this are deleted by MongoDB; 0 keeps them forever
+STATUS_RETENTION_SECONDS = int(os.environ.get('STATUS_RETENTION_SECONDS', '0'))
+STATUS_TTL_INDEX_NAME = "timestamp_ttl"
+
+def status_check_indexes(mode: str = STATUS_COLLECTION_MODE) -> List[IndexModel]:
+    """Indexes for the given storage mode; time-series collections can't have unique indexes."""
+    if mode == "timeseries":
+        return [index for index in STATUS_CHECK_INDEXES if not index.document.get("unique")]
+    return STATUS_CHECK_INDEXES
+
+def status_collection_options(mode: str = STATUS_COLLECTION_MODE) -> dict:
+    """create_collection() options for the given storage mode."""
+    if mode != "timeseries":
+        return {}
+    options = {"timeseries": {
+        "timeField": "timestamp",
+        "metaField": "client_name",
+        "granularity": STATUS_TIMESERIES_GRANULARITY,
+    }}
+    if STATUS_RETENTION_SECONDS:
+        options["expireAfterSeconds"] = STATUS_RETENTION_SECONDS
+    return options
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await startup_db_client()
+    yield
+    await shutdown_db_client()
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -35,34 +187,373 @@ class StatusCheck(BaseModel):
 class StatusCheckCreate(BaseModel):
     client_name: str
 
+class StatusCheckBulkItem(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class StatusCheckBulkResult(BaseModel):
+    inserted: int
+    failed: int
+    items: List[StatusCheckBulkItem]
+
+class StatusHistogramBucket(BaseModel):
+    bucket: datetime
+    count: int
+
+class StatusClientSummary(BaseModel):
+    client_name: str
+    count: int
+    last_seen: datetime
+    histogram: List[StatusHistogramBucket]
+
+class StatusSummary(BaseModel):
+    since: datetime
+    until: datetime
+    bucket: str
+    total: int
+    clients: List[StatusClientSummary]
+
+# Only the response model's fields come off the wire
+STATUS_CHECK_PROJECTION = {"_id": 0, **{field: 1 for field in StatusCheck.model_fields}}
+
+
+def encode_status_cursor(status_check: dict) -> str:
+    """Opaque `after` cursor pointing just past the given document."""
+    raw = json.dumps([status_check["timestamp"].isoformat(), status_check["id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_status_cursor(cursor: str) -> dict:
+    """Turn an `after` cursor into the keyset filter for the next page."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, last_id = json.loads(raw)
+        timestamp = datetime.fromisoformat(timestamp)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    return {"$or": [
+        {"timestamp": {"$lt": timestamp}},
+        {"timestamp": timestamp, "id": {"$lt": last_id}},
+    ]}
+
+def parse_bulk_body(body: bytes, content_type: str) -> list:
+    """Raw items from a JSON array or NDJSON request body."""
+    try:
+        if "ndjson" in content_type:
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Malformed body: {exc}") from exc
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array or NDJSON body")
+    if len(items) > STATUS_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {STATUS_BULK_MAX_ITEMS} items per request")
+    return items
+
+async def insert_status_documents(documents: List[dict], chunk_size: int = STATUS_BULK_CHUNK_SIZE) -> List[Optional[str]]:
+    """Insert documents in unordered chunks; returns an error message (or None) per document.
+
+    A failing document or chunk never stops the remaining ones from being written.
+    """
+    errors = [None] * len(documents)
+    for start in range(0, len(documents), chunk_size):
+        chunk = documents[start:start + chunk_size]
+        try:
+            await db.status_checks.insert_many(chunk, ordered=False)
+        except BulkWriteError as exc:
+            for write_error in exc.details.get("writeErrors", []):
+                errors[start + write_error["index"]] = write_error.get("errmsg", "Write failed")
+        except PyMongoError as exc:
+            logger.exception("Bulk insert of %d status checks failed", len(chunk))
+            errors[start:start + len(chunk)] = [str(exc)] * len(chunk)
+    if response_cache is not None and documents:
+        await response_cache.invalidate("status_checks")
+    return errors
+
+def as_utc_naive(value: datetime) -> datetime:
+    """Stored timestamps are naive UTC; bring query bounds into the same form."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def status_summary_pipeline(since: datetime, until: datetime, bucket: str, client_name: Optional[str] = None) -> list:
+    """Per-client count, last-seen time and histogram, computed server side.
+
+    The leading $match is a timestamp range (plus client_name when given), so it
+    is served by the timestamp_id or client_name_timestamp index.
+    """
+    match = {"timestamp": {"$gte": since, "$lt": until}}
+    if client_name is not None:
+        match["client_name"] = client_name
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {
+                "client_name": "$client_name",
+                "bucket": {"$dateTrunc": {"date": "$timestamp", "unit": bucket}},
+            },
+            "count": {"$sum": 1},
+            "last_seen": {"$max": "$timestamp"},
+        }},
+        {"$sort": {"_id.bucket": 1}},
+        {"$group": {
+            "_id": "$_id.client_name",
+            "count": {"$sum": "$count"},
+            "last_seen": {"$max": "$last_seen"},
+            "histogram": {"$push": {"bucket": "$_id.bucket", "count": "$count"}},
+        }},
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "client_name": "$_id", "count": 1, "last_seen": 1, "histogram": 1}},
+    ]
+
+async def stream_status_checks(cursor):
+    """Yield NDJSON lines straight off the Motor cursor, one batch in memory at a time."""
+    async for status_check in cursor:
+        if STATUS_FAST_JSON:
+            yield orjson.dumps(status_check) + b"\n"
+        else:
+            yield StatusCheck(**status_check).model_dump_json() + "\n"
+
 # Add your routes to the router instead of directly to app
 @api_router.get("/")
 async def root():
     return {"message": "Hello World"}
 
 @api_router.post("/status", response_model=StatusCheck)
-async def create_status_check(input: StatusCheckCreate):
+async def create_status_check(
+    input: StatusCheckCreate,
+    ack: Optional[str] = Query(None, pattern="^(durable|immediate)$"),
+):
     status_dict = input.dict()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
+    if status_buffer is None:
+        _ = await db.status_checks.insert_one(status_obj.dict())
+        if response_cache is not None:
+            await response_cache.invalidate("status_checks")
+        return status_obj
+
+    # Buffered: durable waits for the batch holding this document to be written
+    wait = (ack or STATUS_WRITE_BUFFER) != "immediate"
+    try:
+        await status_buffer.submit(status_obj.dict(), wait=wait)
+    except BufferFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"}) from exc
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
     return status_obj
 
+@api_router.get("/status/summary", response_model=StatusSummary)
+async def get_status_summary(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    bucket: str = Query("hour", pattern="^(minute|hour|day)$"),
+    client_name: Optional[str] = None,
+):
+    until = as_utc_naive(until) if until else datetime.utcnow()
+    since = as_utc_naive(since) if since else until - timedelta(days=1)
+    if since >= until:
+        raise HTTPException(status_code=400, detail="`since` must be before `until`")
+    if (until - since) / STATUS_SUMMARY_BUCKETS[bucket] > STATUS_SUMMARY_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Window spans more than {STATUS_SUMMARY_MAX_BUCKETS} {bucket} buckets")
+
+    pipeline = status_summary_pipeline(since, until, bucket, client_name)
+    clients = await db.status_checks.aggregate(pipeline).to_list(None)
+    return StatusSummary(
+        since=since,
+        until=until,
+        bucket=bucket,
+        total=sum(summary["count"] for summary in clients),
+        clients=clients,
+    )
+
+@api_router.get("/db/pool")
+async def get_db_pool_stats():
+    options = {key: value for key, value in MONGO_CLIENT_OPTIONS.items() if value is not None}
+    return {"options": options, "pools": pool_stats.snapshot()}
+
+@api_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    lines = request_metrics.render() + command_metrics.render() + render_pool_stats(pool_stats.snapshot())
+    if status_buffer is not None:
+        lines += render_buffer_stats(status_buffer.stats())
+    if response_cache is not None:
+        lines += render_cache_stats(response_cache.stats())
+    if conga_proxy is not None:
+        lines += render_proxy_stats(conga_proxy.stats())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    if response_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **response_cache.stats()}
+
+@api_router.get("/status/buffer")
+async def get_status_buffer_stats():
+    if status_buffer is None:
+        return {"enabled": False}
+    return {"enabled": True, "mode": STATUS_WRITE_BUFFER, **status_buffer.stats()}
+
+@api_router.get("/conga-proxy/stats")
+async def get_conga_proxy_stats():
+    if conga_proxy is None:
+        return {"enabled": False}
+    return {"enabled": True, **conga_proxy.stats()}
+
+@api_router.api_route("/conga/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+async def proxy_conga(path: str, request: Request):
+    """Forward to CONGA_API_BASE_URL/{path} with the backend's token; see CongaProxy."""
+    if conga_proxy is None:
+        raise HTTPException(status_code=503, detail="Conga proxy is not configured (CONGA_CLIENT_ID/CONGA_CLIENT_SECRET)")
+    if request.method != "GET" and not conga_proxy.writable("/" + path):
+        raise HTTPException(
+            status_code=405,
+            detail=f"{request.method} /{path} is not in CONGA_PROXY_WRITE_PATHS",
+            headers={"Allow": "GET"},
+        )
+    try:
+        entry, cache_status = await conga_proxy.forward(
+            request.method,
+            "/" + path,
+            request.query_params.multi_items(),
+            await request.body(),
+            dict(request.headers),
+            use_cache="no-cache" not in request.headers.get("cache-control", ""),
+        )
+    except CongaAPIError as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+
+    headers = {"X-Cache": cache_status}
+    if cache_status != "BYPASS":
+        headers["Age"] = str(conga_proxy.age(entry))
+    if entry.etag is not None:
+        headers["ETag"] = entry.etag
+        if etag_matches(entry.etag, request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+    return Response(entry.body, status_code=entry.status, media_type=entry.media_type, headers=headers)
+
+@api_router.get("/sync")
+async def get_sync_status():
+    if sync_worker is None:
+        return {"enabled": False}
+    return {"enabled": True, **sync_worker.stats(), "checkpoints": await sync_worker.checkpoints()}
+
+@api_router.post("/sync", status_code=202)
+async def trigger_sync(object: Optional[str] = None):
+    if sync_worker is None:
+        raise HTTPException(status_code=409, detail="Conga sync is not enabled (CONGA_SYNC_OBJECTS)")
+    if object is not None and object not in sync_worker.object_types:
+        raise HTTPException(status_code=404, detail=f"{object} is not in CONGA_SYNC_OBJECTS")
+    return {"triggered": sync_worker.trigger(object)}
+
+@api_router.post("/status/bulk", response_model=StatusCheckBulkResult)
+async def create_status_checks_bulk(request: Request):
+    items = parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+
+    # Validate everything first, then write only the valid documents
+    results = []
+    documents, positions = [], []
+    for index, item in enumerate(items):
+        try:
+            status_obj = StatusCheck(**StatusCheckCreate.model_validate(item).dict())
+        except ValidationError as exc:
+            results.append(StatusCheckBulkItem(index=index, ok=False, error=str(exc)))
+            continue
+        results.append(StatusCheckBulkItem(index=index, ok=True, id=status_obj.id))
+        documents.append(status_obj.dict())
+        positions.append(index)
+
+    errors = await insert_status_documents(documents)
+    for index, error in zip(positions, errors):
+        if error is not None:
+            results[index].ok = False
+            results[index].error = error
+
+    inserted = sum(1 for result in results if result.ok)
+    return StatusCheckBulkResult(inserted=inserted, failed=len(results) - inserted, items=results)
+
 @api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
+async def get_status_checks(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=STATUS_PAGE_MAX),
+    after: Optional[str] = None,
+    fmt: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+):
+    query = decode_status_cursor(after) if after else {}
+    cursor = db.status_checks.find(query, STATUS_CHECK_PROJECTION).sort(STATUS_SORT)
+
+    if fmt == "ndjson":
+        # Streaming mode is unbounded unless a limit is given
+        if limit:
+            cursor = cursor.limit(limit)
+        cursor = cursor.batch_size(STATUS_STREAM_BATCH_SIZE)
+        return StreamingResponse(stream_status_checks(cursor), media_type="application/x-ndjson")
+
+    # Fetch one extra document to know whether another page exists
+    page_size = limit or STATUS_PAGE_SIZE
+    status_checks = await cursor.limit(page_size + 1).to_list(page_size + 1)
+    headers = {}
+    if len(status_checks) > page_size:
+        status_checks = status_checks[:page_size]
+        headers["X-Next-Cursor"] = encode_status_cursor(status_checks[-1])
+    if STATUS_FAST_JSON:
+        # Trusted DB output already has the response shape
+        return ORJSONResponse(status_checks, headers=headers)
+    response.headers.update(headers)
     return [StatusCheck(**status_check) for status_check in status_checks]
 
 # Include the router in the main app
 app.include_router(api_router)
 
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+@app.middleware("http")
+async def cache_read_responses(request: Request, call_next):
+    """Serve CACHED_ROUTES from the response cache, with ETag / If-None-Match support."""
+    namespace = CACHED_ROUTES.get(request.url.path)
+    if request.method != "GET" or namespace is None or request.query_params.get("format") == "ndjson":
+        return await call_next(request)
+
+    key = request.url.path + "?" + urlencode(sorted(request.query_params.multi_items()))
+    # Read before rendering: a write that lands meanwhile bumps it and orphans what we store
+    generation = await response_cache.generation(namespace) if response_cache is not None else None
+    entry = await response_cache.get(namespace, key, generation) if generation is not None else None
+    if entry is None:
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {name: value for name, value in response.headers.items() if name in CACHED_HEADERS}
+        entry = CachedResponse(body, make_etag(body), response.headers.get("content-type"), headers)
+        if generation is not None:
+            await response_cache.set(namespace, key, entry, generation)
+
+    # no-cache: browsers keep the body but revalidate every poll with If-None-Match
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(entry.etag, request.headers.get("if-none-match")):
+        if response_cache is not None:
+            response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type=entry.media_type, headers={**entry.headers, **headers})
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Outermost, so the timings cover CORS, caching and streamed bodies
+app.add_middleware(MetricsMiddleware, metrics=request_metrics, routes=app.routes)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -70,6 +561,128 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
+async def startup_db_client():
+    global client, db
+    client = AsyncIOMotorClient(mongo_url, event_listeners=[pool_stats, command_metrics], **MONGO_CLIENT_OPTIONS)
+    db = client[os.environ['DB_NAME']]
+    # Warm-up ping so the first request doesn't pay for server selection
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), MONGO_STARTUP_TIMEOUT_SECONDS)
+        reachable = True
+    except (PyMongoError, asyncio.TimeoutError):
+        logger.exception("MongoDB warm-up ping failed")
+        reachable = False
+    if reachable:
+        await ensure_status_collection()
+        await ensure_indexes()
+        await ensure_status_retention()
+    else:
+        logger.warning("MongoDB is unreachable; status_checks collection, index and retention setup skipped")
+    start_status_buffer()
+    start_conga_client()
+    start_sync_worker()
+
+async def ensure_status_collection():
+    try:
+        cursor = await db.list_collections(filter={"name": "status_checks"})
+        existing = await cursor.to_list(None)
+        if not existing:
+            await db.create_collection("status_checks", **status_collection_options())
+        elif (existing[0].get("type") == "timeseries") != (STATUS_COLLECTION_MODE == "timeseries"):
+            logger.warning(
+                "status_checks is a %s collection but STATUS_COLLECTION_MODE=%s; run migrate_status_checks.py",
+                existing[0].get("type"), STATUS_COLLECTION_MODE,
+            )
+    except PyMongoError:
+        logger.exception("Failed to ensure status_checks collection")
+
+async def ensure_indexes():
+    try:
+        await db.status_checks.create_indexes(status_check_indexes())
+    except PyMongoError:
+        logger.exception("Failed to ensure status_checks indexes")
+
+async def ensure_status_retention():
+    """Bring the collection's expiry in line with STATUS_RETENTION_SECONDS."""
+    try:
+        if STATUS_COLLECTION_MODE == "timeseries":
+            # Time-series collections expire through a collection option, not an index
+            await db.command("collMod", "status_checks", expireAfterSeconds=STATUS_RETENTION_SECONDS or "off")
+            return
+
+        indexes = await db.status_checks.index_information()
+        if not STATUS_RETENTION_SECONDS:
+            if STATUS_TTL_INDEX_NAME in indexes:
+                await db.status_checks.drop_index(STATUS_TTL_INDEX_NAME)
+        elif STATUS_TTL_INDEX_NAME in indexes:
+            await db.command("collMod", "status_checks", index={
+                "name": STATUS_TTL_INDEX_NAME,
+                "expireAfterSeconds": STATUS_RETENTION_SECONDS,
+            })
+        else:
+            await db.status_checks.create_index(
+                [("timestamp", ASCENDING)],
+                name=STATUS_TTL_INDEX_NAME,
+                expireAfterSeconds=STATUS_RETENTION_SECONDS,
+            )
+    except PyMongoError:
+        logger.exception("Failed to apply status_checks retention")
+
+def start_status_buffer():
+    global status_buffer
+    if STATUS_WRITE_BUFFER in ("durable", "immediate"):
+        status_buffer = StatusWriteBuffer(
+            insert_status_documents,
+            max_items=STATUS_WRITE_BUFFER_MAX_ITEMS,
+            max_delay_ms=STATUS_WRITE_BUFFER_MAX_DELAY_MS,
+            max_pending=STATUS_WRITE_BUFFER_MAX_PENDING,
+        )
+        status_buffer.start()
+
+def start_conga_client():
+    global conga_client, conga_proxy
+    if not (CONGA_CLIENT_ID and CONGA_CLIENT_SECRET):
+        return
+    conga_client = CongaClient(
+        CONGA_API_BASE_URL, CONGA_TOKEN_URL, CONGA_CLIENT_ID, CONGA_CLIENT_SECRET,
+        max_connections=CONGA_MAX_CONNECTIONS,
+        coalesce=CONGA_COALESCE_GETS,
+    )
+    conga_proxy = CongaProxy(
+        conga_client,
+        ttl=CONGA_PROXY_CACHE_TTL_SECONDS,
+        stale=CONGA_PROXY_STALE_SECONDS,
+        cache_paths=[pattern.strip() for pattern in CONGA_PROXY_CACHE_PATHS if pattern.strip()],
+        max_entries=CONGA_PROXY_CACHE_MAX_ENTRIES,
+        write_paths=[pattern.strip() for pattern in CONGA_PROXY_WRITE_PATHS if pattern.strip()],
+    )
+
+def start_sync_worker():
+    global sync_worker
+    if not CONGA_SYNC_OBJECTS:
+        return
+    if conga_client is None:
+        logger.warning("CONGA_SYNC_OBJECTS is set but CONGA_CLIENT_ID/CONGA_CLIENT_SECRET are not; sync disabled")
+        return
+    sync_worker = CongaSyncWorker(
+        conga_client, db, CONGA_SYNC_OBJECTS,
+        page_size=CONGA_SYNC_PAGE_SIZE,
+        interval=CONGA_SYNC_INTERVAL_SECONDS,
+    )
+    sync_worker.start()
+
 async def shutdown_db_client():
+    global status_buffer, sync_worker, conga_client, conga_proxy
+    if sync_worker is not None:
+        await sync_worker.close()
+        sync_worker = None
+    if conga_proxy is not None:
+        await conga_proxy.close()
+        conga_proxy = None
+    if conga_client is not None:
+        await conga_client.close()
+        conga_client = None
+    if status_buffer is not None:
+        await status_buffer.close()
+        status_buffer = None
     client.close()
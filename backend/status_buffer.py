@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in documents) of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 5, 10, 50, 100, 500, 1000, float("inf"))
+
+
+class BufferFull(Exception):
+    """Raised when the buffer already holds `max_pending` unflushed documents."""
+
+
+class StatusWriteBuffer:
+    """Write-behind queue that coalesces single status inserts into insert_many batches.
+
+    Documents are flushed once `max_items` are pending or `max_delay_ms` has passed
+    since the first of them arrived, whichever comes first. `write` receives a batch
+    and returns one error message (or None) per document.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[dict]], Awaitable[List[Optional[str]]]],
+        max_items: int = 500,
+        max_delay_ms: float = 20,
+        max_pending: int = 10000,
+    ):
+        self.write = write
+        self.max_items = max_items
+        self.max_delay = max_delay_ms / 1000
+        self.max_pending = max_pending
+
+        self._pending = []
+        self._not_empty = asyncio.Event()
+        self._full = asyncio.Event()
+        self._closing = False
+        self._task = None
+
+        self.batches = 0
+        self.documents = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batch_size_max = 0
+        self.batch_size_buckets = [0] * len(BATCH_SIZE_BUCKETS)
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, document: dict, wait: bool = True):
+        """Queue a document; with `wait`, return only once it has been written.
+
+        Raises BufferFull when the backlog limit is reached, and RuntimeError when
+        a durable write fails.
+        """
+        if self._closing:
+            raise RuntimeError("Status write buffer is closed")
+        if len(self._pending) >= self.max_pending:
+            self.rejected += 1
+            raise BufferFull(f"{len(self._pending)} status checks waiting to be written")
+
+        future = asyncio.get_running_loop().create_future() if wait else None
+        self._pending.append((document, future))
+        self._not_empty.set()
+        if len(self._pending) >= self.max_items:
+            self._full.set()
+
+        if future is not None:
+            error = await future
+            if error is not None:
+                raise RuntimeError(error)
+
+    async def close(self):
+        """Stop the flush loop and write out everything still pending."""
+        self._closing = True
+        self._not_empty.set()
+        self._full.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        while self._pending:
+            await self._flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "max_pending": self.max_pending,
+            "batches": self.batches,
+            "documents": self.documents,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "batch_size_max": self.batch_size_max,
+            "batch_size_buckets": {
+                "+Inf" if bound == float("inf") else str(bound): count
+                for bound, count in zip(BATCH_SIZE_BUCKETS, self.batch_size_buckets)
+            },
+            "flush_seconds_total": self.flush_seconds_total,
+            "flush_seconds_max": self.flush_seconds_max,
+        }
+
+    async def _run(self):
+        while True:
+            await self._not_empty.wait()
+            if self._closing:
+                return
+            # Give the batch up to max_delay to fill before flushing it
+            try:
+                await asyncio.wait_for(self._full.wait(), self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+            if self._closing:
+                return
+            await self._flush()
+
+    async def _flush(self):
+        batch = self._pending[:self.max_items]
+        del self._pending[:self.max_items]
+        if not self._pending:
+            self._not_empty.clear()
+        if len(self._pending) < self.max_items:
+            self._full.clear()
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        try:
+            errors = await self.write([document for document, _ in batch])
+        except Exception as exc:
+            logger.exception("Flushing %d buffered status checks failed", len(batch))
+            errors = [str(exc)] * len(batch)
+        elapsed = time.perf_counter() - started
+
+        self.batches += 1
+        self.documents += len(batch)
+        self.batch_size_max = max(self.batch_size_max, len(batch))
+        bucket = next(i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if len(batch) <= bound)
+        self.batch_size_buckets[bucket] += 1
+        self.flush_seconds_total += elapsed
+        self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+
+        for (_, future), error in zip(batch, errors):
+            if error is not None:
+                self.failed += 1
+                if future is None:
+                    logger.error("Buffered status check was not written: %s", error)
+            if future is not None and not future.done():
+                future.set_result(error)
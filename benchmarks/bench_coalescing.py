@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark for GET coalescing in the backend's Conga client
+
+Fires bursts of identical concurrent GETs through the /api/conga proxy code
+(backend/conga_proxy.py) at an in-process mock_conga_api.py with simulated
+latency, once with coalescing off and once with it on, and compares upstream
+requests and client-side latency. The proxy cache is disabled so every
+request would otherwise reach Conga.
+
+    python benchmarks/bench_coalescing.py --burst 10 --rounds 20 --latency-ms 80
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "backend")]
+
+import conga_config  # noqa: E402
+from conga_client import CongaClient  # noqa: E402
+from conga_proxy import CongaProxy  # noqa: E402
+from load_test import percentile  # noqa: E402
+from mock_conga_api import MockSettings, create_app  # noqa: E402
+
+# What a sidepanel asks for when it opens
+BURST_PATHS = ["/v1/objects", "/v1/objects/Account/summary"]
+
+
+async def run_bursts(coalesce: bool, burst: int, rounds: int, latency_ms: float, paths=BURST_PATHS) -> dict:
+    app = create_app(settings=MockSettings(latency_ms=latency_ms))
+    client = CongaClient(
+        "http://mock.local/api/data", "http://mock.local/api/v1/auth/connect/token",
+        conga_config.CLIENT_ID, conga_config.CLIENT_SECRET,
+        coalesce=coalesce, transport=httpx.ASGITransport(app=app),
+    )
+    proxy = CongaProxy(client, ttl=0)
+    await client.token()
+
+    async def timed(path):
+        started = time.perf_counter()
+        entry, _ = await proxy.forward("GET", path, [])
+        return entry.status, (time.perf_counter() - started) * 1000
+
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        results = await asyncio.gather(*(timed(path) for path in paths for _ in range(burst)))
+        errors += sum(status != 200 for status, _ in results)
+        latencies += [ms for _, ms in results]
+    elapsed = time.perf_counter() - started
+    stats = client.stats()
+    await client.close()
+
+    latencies.sort()
+    return {
+        "coalesce": coalesce,
+        "requests": len(latencies),
+        "errors": errors,
+        "upstream_requests": stats["requests"],
+        "coalesced": stats["coalesced"],
+        "coalesced_ratio": stats["coalesced_ratio"],
+        "elapsed_seconds": elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+    }
+
+
+def print_comparison(off: dict, on: dict):
+    print(f"\n{'':22} {'coalescing off':>15} {'coalescing on':>15}")
+    for label, key, fmt in (
+        ("client requests", "requests", "{:d}"),
+        ("upstream requests", "upstream_requests", "{:d}"),
+        ("coalesced", "coalesced", "{:d}"),
+        ("errors", "errors", "{:d}"),
+        ("p50 latency (ms)", "p50_ms", "{:.1f}"),
+        ("p95 latency (ms)", "p95_ms", "{:.1f}"),
+        ("wall time (s)", "elapsed_seconds", "{:.2f}"),
+    ):
+        print(f"{label:22} {fmt.format(off[key]):>15} {fmt.format(on[key]):>15}")
+    saved = 1 - on["upstream_requests"] / off["upstream_requests"] if off["upstream_requests"] else 0.0
+    print(f"\n📉 Upstream traffic reduced by {saved:.0%} "
+          f"({off['upstream_requests']} → {on['upstream_requests']} requests)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare upstream traffic with and without GET coalescing")
+    parser.add_argument('--burst', type=int, default=10, help="identical concurrent requests per path")
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=80, help="simulated Conga latency")
+    parser.add_argument('--json', help="write both results to this JSON file")
+    args = parser.parse_args()
+
+    print(f"🔁 {args.rounds} rounds of {args.burst} x {len(BURST_PATHS)} identical GETs "
+          f"against the mock at {args.latency_ms:g}ms")
+    off = asyncio.run(run_bursts(False, args.burst, args.rounds, args.latency_ms))
+    on = asyncio.run(run_bursts(True, args.burst, args.rounds, args.latency_ms))
+    print_comparison(off, on)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"off": off, "on": on}, f, indent=2)
+        print(f"📄 JSON results: {args.json}")
+    return 0 if off["errors"] == on["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /api/status serialization: default pydantic path vs STATUS_FAST_JSON
+
+The handler runs in-process against a fake collection that hands back
+pre-built documents, so only the request handling and JSON encoding is timed.
+
+    python benchmarks/bench_status_json.py [--sizes 1000 10000 100000] [--seconds 3]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "bench")
+os.environ["STATUS_PAGE_MAX"] = "1000000"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import server  # noqa: E402
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, count):
+        return self
+
+    async def to_list(self, length):
+        return self.documents[:length]
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, *args):
+        return FakeCursor(self.documents)
+
+
+class FakeDatabase:
+    def __init__(self, documents):
+        self.status_checks = FakeCollection(documents)
+
+
+def make_documents(count):
+    start = datetime(2024, 1, 1)
+    return [
+        {"id": str(uuid.uuid4()), "client_name": f"agent-{i % 50}", "timestamp": start + timedelta(milliseconds=i)}
+        for i in range(count)
+    ]
+
+
+def measure(client, size, seconds):
+    """Requests per second and response bytes for GET /api/status?limit=size."""
+    requests_made, payload = 0, 0
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    while time.perf_counter() < deadline or requests_made == 0:
+        response = client.get("/api/status", params={"limit": size})
+        response.raise_for_status()
+        payload = len(response.content)
+        requests_made += 1
+    return requests_made / (time.perf_counter() - started), payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seconds", type=float, default=3.0, help="time budget per size and mode")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Every request must reach the handler, not the response cache
+    server.response_cache = None
+    client = TestClient(server.app)
+
+    print(f"{'items':>8} {'mode':>8} {'req/s':>10} {'items/s':>12} {'MB/s':>8} {'speedup':>8}")
+    print("-" * 60)
+    for size in args.sizes:
+        server.db = FakeDatabase(make_documents(size + 1))
+        baseline = None
+        for mode, fast in (("default", False), ("orjson", True)):
+            server.STATUS_FAST_JSON = fast
+            rate, payload = measure(client, size, args.seconds)
+            baseline = baseline or rate
+            print(
+                f"{size:>8} {mode:>8} {rate:>10.1f} {rate * size:>12.0f} "
+                f"{rate * payload / 1e6:>8.1f} {rate / baseline:>7.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
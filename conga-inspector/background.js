@@ -83,7 +83,9 @@ async function makeApiCall(endpoint, options = {}) {
 
 // Message handler for popup and content scripts
 chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
-  console.log('Background received message:', request);
+  if (request.action !== 'networkEvents') {
+    console.log('Background received message:', request);
+  }
 
   switch (request.action) {
     case 'getToken':
@@ -122,6 +124,10 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
         .catch(error => sendResponse({ success: false, error: error.message }));
       return true; // Will respond asynchronously
 
+    case 'networkEvents':
+      // Captured calls from content scripts, handled by the side panel
+      return false;
+
     case 'getConfig':
       sendResponse({ 
         success: true, 
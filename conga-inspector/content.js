@@ -3,9 +3,15 @@ console.log('Conga Inspector: Content script loaded');
 
 // Configuration
 const INSPECTOR_ID = 'conga-inspector-panel';
+const RECENT_CALLS_SHOWN = 20;
 let inspectorPanel = null;
 let isInjected = false;
 
+// API call counters fed by inject.js batches
+const apiStats = { total: 0, errors: 0 };
+const pendingCalls = new Set();
+const recentCalls = new Map();
+
 // Helper function to convert string to PascalCase
 function toPascalCase(str) {
     if (!str) return '';
@@ -147,6 +153,9 @@ function initializeContentScript() {
     // Inject page enhancement script
     injectPageScript();
     
+    // Receive intercepted API calls from the page
+    monitorNetworkRequests();
+    
     isInjected = true;
 }
 
@@ -190,6 +199,10 @@ function createInspectorPanel() {
                         <span class="info-label">API Calls:</span>
                         <span class="info-value" id="apiCallCount">0</span>
                     </div>
+                    <div class="info-row">
+                        <span class="info-label">Pending / Errors:</span>
+                        <span class="info-value" id="apiCallStatus">0 / 0</span>
+                    </div>
                 </div>
             </div>
             <div class="inspector-section">
@@ -592,27 +605,111 @@ function updatePageInfo() {
 
 // Inject page enhancement script
 function injectPageScript() {
-    const script = document.createElement('script');
-    script.src = chrome.runtime.getURL('inject.js');
-    script.onload = function() {
-        this.remove();
-    };
-    (document.head || document.documentElement).appendChild(script);
+    chrome.storage.local.get(['settings'], (stored) => {
+        const script = document.createElement('script');
+        script.src = chrome.runtime.getURL('inject.js');
+        // inject.js can't read extension storage, so its settings travel on the tag
+        const retention = stored?.settings?.apiCallRetention;
+        if (retention) {
+            script.dataset.apiCallRetention = retention;
+        }
+        script.onload = function() {
+            this.remove();
+        };
+        (document.head || document.documentElement).appendChild(script);
+    });
+    
+    // Apply retention changes from the options page without a reload
+    chrome.storage.onChanged.addListener((changes, area) => {
+        const retention = changes.settings?.newValue?.apiCallRetention;
+        if (area === 'local' && retention && retention !== changes.settings.oldValue?.apiCallRetention) {
+            window.postMessage({
+                type: 'CONGA_INSPECTOR_CONFIG',
+                data: { apiCallRetention: retention }
+            }, '*');
+        }
+    });
 }
 
 // Monitor network requests
 function monitorNetworkRequests() {
-    // This would be enhanced to capture actual network requests
-    // For now, we'll simulate monitoring
-    const monitor = inspectorPanel?.querySelector('#networkMonitor');
-    if (monitor) {
-        // Update API call count
-        const apiCallCount = inspectorPanel.querySelector('#apiCallCount');
-        if (apiCallCount) {
-            let count = parseInt(apiCallCount.textContent) || 0;
-            apiCallCount.textContent = ++count;
+    window.addEventListener('message', (event) => {
+        if (event.source === window && event.data?.type === 'CONGA_API_BATCH') {
+            applyApiEvents(event.data.data.events);
+            forwardApiEvents(event.data.data.events);
+        }
+    });
+}
+
+// Fold one batch of compact events from inject.js into the counters, then
+// touch the DOM once for the whole batch
+function applyApiEvents(events) {
+    for (const [kind, id, ...fields] of events) {
+        if (kind === 'c') {
+            const [method, url] = fields;
+            apiStats.total++;
+            pendingCalls.add(id);
+            recentCalls.set(id, { method: (method || 'GET').toUpperCase(), url: url, status: 'pending' });
+            if (recentCalls.size > RECENT_CALLS_SHOWN) {
+                recentCalls.delete(recentCalls.keys().next().value);
+            }
+            continue;
+        }
+        if (kind === 't') {
+            continue;  // timing update for a call that already completed
+        }
+        
+        pendingCalls.delete(id);
+        const call = recentCalls.get(id);
+        const failed = kind === 'e' || fields[0] >= 400;
+        if (failed) {
+            apiStats.errors++;
+        }
+        if (call) {
+            call.status = kind === 'e' ? 'error' : fields[0];
+            call.failed = failed;
         }
     }
+    
+    renderNetworkMonitor();
+}
+
+// Pass the batch on to the side panel's Network tab; nobody may be listening
+function forwardApiEvents(events) {
+    chrome.runtime.sendMessage({ action: 'networkEvents', events: events }, () => {
+        void chrome.runtime.lastError;
+    });
+}
+
+function renderNetworkMonitor() {
+    if (!inspectorPanel) return;
+    
+    inspectorPanel.querySelector('#apiCallCount').textContent = apiStats.total;
+    inspectorPanel.querySelector('#apiCallStatus').textContent = `${pendingCalls.size} / ${apiStats.errors}`;
+    
+    const monitor = inspectorPanel.querySelector('#networkMonitor');
+    const fragment = document.createDocumentFragment();
+    Array.from(recentCalls.values()).reverse().forEach(call => {
+        const item = document.createElement('div');
+        item.className = 'network-item';
+        
+        const method = document.createElement('span');
+        method.className = `network-method ${call.method}`;
+        method.textContent = call.method;
+        
+        const url = document.createElement('span');
+        url.className = 'network-url';
+        url.textContent = call.url;
+        url.title = call.url;
+        
+        const status = document.createElement('span');
+        status.className = call.failed ? 'network-status error' : 'network-status';
+        status.textContent = call.status;
+        
+        item.append(method, url, status);
+        fragment.appendChild(item);
+    });
+    monitor.replaceChildren(fragment);
 }
 
 // Initialize when DOM is ready
@@ -11,142 +11,359 @@ console.log('Conga Inspector: Injection script loaded');
     const originalXHR = window.XMLHttpRequest.prototype.open;
     const originalXHRSend = window.XMLHttpRequest.prototype.send;
     
+    // How many calls to keep; content.js passes the apiCallRetention setting
+    const DEFAULT_RETENTION = 500;
+    const scriptRetention = parseInt(document.currentScript?.dataset.apiCallRetention, 10);
+    
+    // Fixed-capacity ring buffer of intercepted calls. Once full, each new call
+    // overwrites the oldest one; calls are also indexed by id for O(1) lookup.
+    class CallRingBuffer {
+        constructor(capacity) {
+            this.slots = [];
+            this.byId = new Map();
+            this.head = 0;
+            this.size = 0;
+            this.total = 0;
+            this.overwritten = 0;
+            this.evictedPending = 0;
+            this.resize(capacity);
+        }
+        
+        push(call) {
+            const evicted = this.slots[this.head];
+            if (this.size === this.capacity) {
+                this.byId.delete(evicted.id);
+                this.overwritten++;
+                if (evicted.status === 'pending') {
+                    this.evictedPending++;
+                }
+            } else {
+                this.size++;
+            }
+            this.slots[this.head] = call;
+            this.byId.set(call.id, call);
+            this.head = (this.head + 1) % this.capacity;
+            this.total++;
+        }
+        
+        get(id) {
+            return this.byId.get(id);
+        }
+        
+        // Oldest first
+        toArray() {
+            const start = (this.head - this.size + this.capacity) % this.capacity;
+            const calls = new Array(this.size);
+            for (let i = 0; i < this.size; i++) {
+                calls[i] = this.slots[(start + i) % this.capacity];
+            }
+            return calls;
+        }
+        
+        // Keeps the newest calls that still fit
+        resize(capacity) {
+            const kept = this.capacity ? this.toArray() : [];
+            this.capacity = Math.max(1, capacity || DEFAULT_RETENTION);
+            const dropped = Math.max(0, kept.length - this.capacity);
+            this.slots = new Array(this.capacity);
+            this.byId.clear();
+            this.head = 0;
+            this.size = 0;
+            kept.slice(dropped).forEach(call => {
+                this.slots[this.size++] = call;
+                this.byId.set(call.id, call);
+            });
+            this.head = this.size % this.capacity;
+            this.overwritten += dropped;
+        }
+        
+        clear() {
+            this.slots = new Array(this.capacity);
+            this.byId.clear();
+            this.head = 0;
+            this.size = 0;
+        }
+        
+        stats() {
+            return {
+                capacity: this.capacity,
+                size: this.size,
+                total: this.total,
+                overwritten: this.overwritten,
+                evictedPending: this.evictedPending
+            };
+        }
+    }
+    
     // API call tracking
     let apiCallCount = 0;
-    const apiCalls = [];
+    let nextCallId = 0;
+    const apiCalls = new CallRingBuffer(scriptRetention > 0 ? scriptRetention : DEFAULT_RETENTION);
+    
+    // Call events reach content.js in batches, once per animation frame (or
+    // after BATCH_MAX_DELAY_MS, since frames stop in background tabs), as
+    // compact tuples rather than whole call records:
+    //   ['c', id, method, url, timestamp]                    call started
+    //   ['r', id, status, ttfb, duration, size, mimeType]    response received
+    //   ['t', id, ttfb, duration, size]                      Resource Timing refined the numbers
+    //   ['e', id, message]                                   request failed
+    // Times are milliseconds from the call's start, sizes are bytes (null if unknown)
+    // and mimeType is the response's Content-Type ('' if it had none)
+    const BATCH_MAX_DELAY_MS = 100;
+    const BATCH_MAX_EVENTS = 500;
+    let queuedEvents = [];
+    let flushTimer = null;
+    let flushFrame = null;
+    const channelStats = { events: 0, batches: 0, largestBatch: 0 };
+    
+    function queueEvent(event) {
+        queuedEvents.push(event);
+        if (queuedEvents.length >= BATCH_MAX_EVENTS) {
+            flushEvents();
+        } else if (flushTimer === null) {
+            flushTimer = setTimeout(flushEvents, BATCH_MAX_DELAY_MS);
+            if (typeof requestAnimationFrame === 'function') {
+                flushFrame = requestAnimationFrame(flushEvents);
+            }
+        }
+    }
+    
+    function flushEvents() {
+        clearTimeout(flushTimer);
+        if (flushFrame !== null) {
+            cancelAnimationFrame(flushFrame);
+        }
+        flushTimer = flushFrame = null;
+        if (queuedEvents.length === 0) return;
+        
+        const events = queuedEvents;
+        queuedEvents = [];
+        channelStats.events += events.length;
+        channelStats.batches++;
+        channelStats.largestBatch = Math.max(channelStats.largestBatch, events.length);
+        window.postMessage({
+            type: 'CONGA_API_BATCH',
+            data: { events: events }
+        }, '*');
+    }
+    
+    function isCongaUrl(url) {
+        return url.includes('congacloud.eu') || url.includes('/api/');
+    }
+    
+    function trackCall(callInfo) {
+        apiCallCount++;
+        apiCalls.push(callInfo);
+        awaitResourceTiming(callInfo);
+        queueEvent(['c', callInfo.id, callInfo.method, callInfo.url, callInfo.timestamp]);
+    }
+    
+    // Timing: the interceptors measure time to headers and completion with
+    // performance.now(); the browser's Resource Timing entry for the same
+    // request, when it arrives, replaces those with network-level numbers
+    // (time to first byte, full download) and the encoded body size.
+    const MAX_AWAITING_URLS = 500;
+    const awaitingTiming = new Map();
+    
+    function roundMs(value) {
+        return value == null ? null : Math.round(value * 10) / 10;
+    }
+    
+    function headerSize(value) {
+        const size = parseInt(value, 10);
+        return Number.isFinite(size) ? size : null;
+    }
+    
+    function recordResponse(callInfo, status, ttfb, duration, size, mimeType) {
+        callInfo.status = status;
+        callInfo.mimeType = mimeType || '';
+        if (callInfo.timingSource !== 'resource') {
+            callInfo.timingSource = 'interceptor';
+            callInfo.ttfb = roundMs(ttfb);
+            callInfo.duration = roundMs(duration);
+            callInfo.size = size;
+        }
+        queueEvent(['r', callInfo.id, status, callInfo.ttfb, callInfo.duration, callInfo.size, callInfo.mimeType]);
+    }
+    
+    function awaitResourceTiming(callInfo) {
+        let key;
+        try {
+            key = new URL(callInfo.url, location.href).href;
+        } catch (error) {
+            return;
+        }
+        callInfo.timingKey = key;
+        const waiting = awaitingTiming.get(key) || [];
+        waiting.push(callInfo);
+        awaitingTiming.set(key, waiting.slice(-20));
+        if (awaitingTiming.size > MAX_AWAITING_URLS) {
+            awaitingTiming.delete(awaitingTiming.keys().next().value);
+        }
+    }
+    
+    function stopAwaitingTiming(callInfo) {
+        const waiting = awaitingTiming.get(callInfo.timingKey);
+        const index = waiting ? waiting.indexOf(callInfo) : -1;
+        if (index !== -1) {
+            waiting.splice(index, 1);
+            if (waiting.length === 0) awaitingTiming.delete(callInfo.timingKey);
+        }
+    }
+    
+    function applyResourceTiming(entry) {
+        if (entry.initiatorType !== 'fetch' && entry.initiatorType !== 'xmlhttprequest') return;
+        const waiting = awaitingTiming.get(entry.name);
+        if (!waiting) return;
+        
+        // Oldest call to that URL that had started by the time the request did
+        const callInfo = waiting.find(call => call.startTime <= entry.startTime + 1);
+        if (!callInfo) return;
+        stopAwaitingTiming(callInfo);
+        
+        callInfo.timingSource = 'resource';
+        if (entry.responseStart > 0) {
+            callInfo.ttfb = roundMs(entry.responseStart - callInfo.startTime);
+        }
+        callInfo.duration = roundMs(entry.responseEnd - callInfo.startTime);
+        callInfo.size = entry.encodedBodySize || entry.transferSize || callInfo.size;
+        callInfo.resourceTiming = entry.toJSON();
+        queueEvent(['t', callInfo.id, callInfo.ttfb, callInfo.duration, callInfo.size]);
+    }
+    
+    if (typeof PerformanceObserver === 'function') {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(applyResourceTiming))
+                .observe({ type: 'resource' });
+        } catch (error) {
+            console.warn('Conga Inspector: Resource Timing unavailable', error);
+        }
+    }
     
     // Intercept fetch requests
     window.fetch = function(...args) {
         const [resource, config] = args;
-        const url = typeof resource === 'string' ? resource : resource.url;
+        const url = resource instanceof Request ? resource.url : String(resource);
         
         // Check if it's a Conga API call
-        if (url.includes('congacloud.eu') || url.includes('/api/')) {
-            apiCallCount++;
-            
-            const callInfo = {
-                id: apiCallCount,
-                method: config?.method || 'GET',
-                url: url,
-                timestamp: new Date().toISOString(),
-                status: 'pending'
-            };
-            
-            apiCalls.push(callInfo);
-            
-            // Notify content script
-            window.postMessage({
-                type: 'CONGA_API_CALL',
-                data: callInfo
-            }, '*');
+        if (!isCongaUrl(url)) {
+            return originalFetch.apply(this, args);
         }
         
+        // Each call keeps its own record, so overlapping calls never mix up
+        const callInfo = {
+            id: ++nextCallId,
+            method: config?.method || (resource instanceof Request ? resource.method : 'GET'),
+            url: url,
+            timestamp: new Date().toISOString(),
+            startTime: performance.now(),
+            status: 'pending'
+        };
+        trackCall(callInfo);
+        
         // Call original fetch and handle response
         return originalFetch.apply(this, args)
             .then(response => {
-                if (url.includes('congacloud.eu') || url.includes('/api/')) {
-                    const callInfo = apiCalls.find(call => call.id === apiCallCount);
-                    if (callInfo) {
-                        callInfo.status = response.status;
-                        callInfo.statusText = response.statusText;
-                        
-                        window.postMessage({
-                            type: 'CONGA_API_RESPONSE',
-                            data: callInfo
-                        }, '*');
-                    }
-                }
+                // fetch resolves on headers; the body's end is only known from Resource Timing
+                const ttfb = performance.now() - callInfo.startTime;
+                callInfo.statusText = response.statusText;
+                recordResponse(callInfo, response.status, ttfb, ttfb, headerSize(response.headers.get('content-length')),
+                               response.headers.get('content-type'));
                 
                 return response;
             })
             .catch(error => {
-                if (url.includes('congacloud.eu') || url.includes('/api/')) {
-                    const callInfo = apiCalls.find(call => call.id === apiCallCount);
-                    if (callInfo) {
-                        callInfo.status = 'error';
-                        callInfo.error = error.message;
-                        
-                        window.postMessage({
-                            type: 'CONGA_API_ERROR',
-                            data: callInfo
-                        }, '*');
-                    }
-                }
+                callInfo.status = 'error';
+                callInfo.error = error.message;
+                stopAwaitingTiming(callInfo);
+                queueEvent(['e', callInfo.id, error.message]);
                 
                 throw error;
             });
     };
     
+    function xhrResponseSize(xhr) {
+        const declared = headerSize(xhr.getResponseHeader('content-length'));
+        if (declared !== null) return declared;
+        if (xhr.responseType === '' || xhr.responseType === 'text') return xhr.responseText.length;
+        if (xhr.responseType === 'arraybuffer') return xhr.response?.byteLength ?? null;
+        if (xhr.responseType === 'blob') return xhr.response?.size ?? null;
+        return null;
+    }
+    
     // Intercept XMLHttpRequest
     window.XMLHttpRequest.prototype.open = function(method, url, ...args) {
         this._congaMethod = method;
-        this._congaUrl = url;
+        this._congaUrl = String(url);
         
         return originalXHR.apply(this, [method, url, ...args]);
     };
     
     window.XMLHttpRequest.prototype.send = function(data) {
         const xhr = this;
-        const method = this._congaMethod;
         const url = this._congaUrl;
         
-        if (url && (url.includes('congacloud.eu') || url.includes('/api/'))) {
-            apiCallCount++;
-            
+        if (url && isCongaUrl(url)) {
             const callInfo = {
-                id: apiCallCount,
-                method: method,
+                id: ++nextCallId,
+                method: this._congaMethod,
                 url: url,
                 timestamp: new Date().toISOString(),
+                startTime: performance.now(),
                 status: 'pending',
                 requestData: data
             };
+            trackCall(callInfo);
             
-            apiCalls.push(callInfo);
-            
-            window.postMessage({
-                type: 'CONGA_API_CALL',
-                data: callInfo
-            }, '*');
+            let ttfb = null;
+            xhr.addEventListener('readystatechange', function() {
+                if (xhr.readyState === XMLHttpRequest.HEADERS_RECEIVED && ttfb === null) {
+                    ttfb = performance.now() - callInfo.startTime;
+                }
+            });
             
             // Add event listeners for response
             xhr.addEventListener('load', function() {
-                const callInfo = apiCalls.find(call => call.id === apiCallCount);
-                if (callInfo) {
-                    callInfo.status = xhr.status;
-                    callInfo.statusText = xhr.statusText;
+                const duration = performance.now() - callInfo.startTime;
+                callInfo.statusText = xhr.statusText;
+                if (xhr.responseType === '' || xhr.responseType === 'text') {
                     callInfo.responseText = xhr.responseText;
-                    
-                    window.postMessage({
-                        type: 'CONGA_API_RESPONSE',
-                        data: callInfo
-                    }, '*');
                 }
+                recordResponse(callInfo, xhr.status, ttfb ?? duration, duration, xhrResponseSize(xhr),
+                               xhr.getResponseHeader('content-type'));
             });
             
             xhr.addEventListener('error', function() {
-                const callInfo = apiCalls.find(call => call.id === apiCallCount);
-                if (callInfo) {
-                    callInfo.status = 'error';
-                    callInfo.error = 'Network error';
-                    
-                    window.postMessage({
-                        type: 'CONGA_API_ERROR',
-                        data: callInfo
-                    }, '*');
-                }
+                callInfo.status = 'error';
+                callInfo.error = 'Network error';
+                stopAwaitingTiming(callInfo);
+                queueEvent(['e', callInfo.id, callInfo.error]);
             });
         }
         
         return originalXHRSend.apply(this, [data]);
     };
     
+    // content.js forwards retention changes made on the options page
+    window.addEventListener('message', (event) => {
+        if (event.source === window && event.data?.type === 'CONGA_INSPECTOR_CONFIG') {
+            const retention = parseInt(event.data.data?.apiCallRetention, 10);
+            if (retention > 0) {
+                apiCalls.resize(retention);
+            }
+        }
+    });
+    
     // Expose utility functions to page
     window.congaInspector = {
-        getApiCalls: () => apiCalls,
+        getApiCalls: () => apiCalls.toArray(),
+        getApiCall: (id) => apiCalls.get(id),
         getApiCallCount: () => apiCallCount,
+        getBufferStats: () => apiCalls.stats(),
+        getChannelStats: () => ({ ...channelStats, queued: queuedEvents.length }),
+        setRetention: (capacity) => apiCalls.resize(capacity),
         clearApiCalls: () => {
-            apiCalls.length = 0;
+            apiCalls.clear();
             apiCallCount = 0;
         },
         
@@ -196,7 +413,7 @@ console.log('Conga Inspector: Injection script loaded');
                 objectType: window.congaInspector.extractObjectType(),
                 timestamp: new Date().toISOString(),
                 userAgent: navigator.userAgent,
-                apiCalls: apiCalls.length
+                apiCalls: apiCalls.size
             };
         }
     };
@@ -15,6 +15,7 @@ const DEFAULT_SETTINGS = {
     includeMetadata: true,
     dateFormat: 'short',
     interceptNetworkRequests: true,
+    apiCallRetention: 500,
     cacheApiResponses: false,
     cacheDuration: 5,
     customHeaders: '{}'
@@ -92,6 +93,7 @@ function populateFormFields() {
     
     // Advanced settings
     document.getElementById('interceptNetworkRequests').checked = currentSettings.interceptNetworkRequests;
+    document.getElementById('apiCallRetention').value = currentSettings.apiCallRetention;
     document.getElementById('cacheApiResponses').checked = currentSettings.cacheApiResponses;
     document.getElementById('cacheDuration').value = currentSettings.cacheDuration;
     document.getElementById('customHeaders').value = currentSettings.customHeaders;
@@ -107,7 +109,7 @@ function setupEventListeners() {
     const formElements = [
         'enableLogging', 'autoRefresh', 'showNotifications', 'apiTimeout', 'maxResults',
         'theme', 'fontSize', 'compactMode', 'exportFormat', 'includeMetadata',
-        'dateFormat', 'interceptNetworkRequests', 'cacheApiResponses', 'cacheDuration', 'customHeaders'
+        'dateFormat', 'interceptNetworkRequests', 'apiCallRetention', 'cacheApiResponses', 'cacheDuration', 'customHeaders'
     ];
     
     formElements.forEach(elementId => {
@@ -6,8 +6,43 @@ let currentTab = 'explorer';
 let connectionStatus = 'disconnected';
 let savedQueries = [];
 let networkRequests = [];
+let networkRequestsById = new Map();
+let liveNetworkCalls = new Map();
+let networkSeq = 0;
+let networkSort = { key: 'timestamp', direction: 1 };
+let networkRefreshScheduled = false;
+// Display order for any sort but capture order, kept up to date by moving
+// only the requests that changed (null until the sort needs one)
+let sortedRequests = null;
+let movedRequests = new Set();
+// Per-endpoint counts and sorted durations, updated as events arrive
+let endpointAggregates = new Map();
+let endpointContributions = new WeakMap();
+let changedEndpoints = new Set();
+let endpointTableBody = null;
+const MAX_NETWORK_REQUESTS = 5000;
+
+// Every captured request is also written to IndexedDB, so a capture outlives
+// the panel and HAR export can stream from there rather than from memory
+const NETWORK_DB_NAME = 'conga-inspector';
+const NETWORK_STORE = 'requests';
+const MAX_STORED_REQUESTS = 100000;
+const NETWORK_PERSIST_DELAY = 500;
+const HAR_CHUNK_ENTRIES = 500;
+let networkDb = null;
+let unsavedRequests = new Map();
+let networkPersistTimer = null;
+let networkPersistQueue = Promise.resolve();
 let objects = [];
 
+// Long lists render through VirtualList (virtual-list.js); row heights match sidepanel.css
+const OBJECT_ROW_HEIGHT = 56;
+const DATA_ROW_HEIGHT = 33;
+const NETWORK_ROW_HEIGHT = 32;
+const COLUMN_SAMPLE_SIZE = 200;
+let objectListView = null;
+let networkListView = null;
+
 // Initialize side panel
 async function initializeSidePanel() {
     console.log('Initializing side panel...');
@@ -297,6 +332,27 @@ async function deleteQuery(queryId) {
 
 // Initialize Metadata tab
 async function initializeMetadata() {
+    const objectList = document.getElementById('objectList');
+    objectListView = new VirtualList(objectList, {
+        rowHeight: OBJECT_ROW_HEIGHT,
+        createRow: () => {
+            const row = document.createElement('div');
+            row.className = 'object-item';
+            row.innerHTML = '<div class="object-name"></div><div class="object-type"></div>';
+            return row;
+        },
+        renderRow: (row, obj) => {
+            row.firstChild.textContent = obj.name || obj.label || obj.apiName;
+            row.lastChild.textContent = obj.type || 'Object';
+        }
+    });
+    objectList.addEventListener('click', (event) => {
+        const obj = objectListView.itemFor(event.target);
+        if (obj) {
+            selectObject(obj.name || obj.apiName);
+        }
+    });
+    
     await refreshObjectList();
 }
 
@@ -339,12 +395,7 @@ function updateObjectList() {
         return;
     }
     
-    objectList.innerHTML = filteredObjects.map(obj => `
-        <div class="object-item" onclick="selectObject('${obj.name || obj.apiName}')">
-            <div class="object-name">${obj.name || obj.label || obj.apiName}</div>
-            <div class="object-type">${obj.type || 'Object'}</div>
-        </div>
-    `).join('');
+    objectListView.setItems(filteredObjects);
 }
 
 // Filter objects based on search
@@ -466,31 +517,70 @@ function displayDataResults(data) {
         return;
     }
     
-    // Create table
-    const firstRecord = records[0];
-    const columns = Object.keys(firstRecord);
+    const columns = columnLayout(records);
+    const template = columns.map(column => `${column.width}px`).join(' ');
     
     dataResults.innerHTML = `
-        <div class="data-table-container">
-            <table class="data-table">
-                <thead>
-                    <tr>
-                        ${columns.map(col => `<th>${col}</th>`).join('')}
-                    </tr>
-                </thead>
-                <tbody>
-                    ${records.map(record => `
-                        <tr>
-                            ${columns.map(col => `<td>${record[col] || ''}</td>`).join('')}
-                        </tr>
-                    `).join('')}
-                </tbody>
-            </table>
-        </div>
+        <div class="data-table-container data-grid"></div>
         <div class="data-summary">
             Showing ${records.length} records
         </div>
     `;
+    
+    const view = new VirtualList(dataResults.querySelector('.data-grid'), {
+        rowHeight: DATA_ROW_HEIGHT,
+        createRow: () => {
+            const row = document.createElement('div');
+            row.className = 'data-grid-row';
+            row.style.gridTemplateColumns = template;
+            columns.forEach(() => row.appendChild(document.createElement('span')));
+            return row;
+        },
+        renderRow: (row, record) => {
+            columns.forEach((column, i) => {
+                const text = cellText(record[column.key]);
+                row.children[i].textContent = text;
+                row.children[i].title = text;
+            });
+        }
+    });
+    view.setHeader(`
+        <div class="data-grid-row data-grid-head" style="grid-template-columns: ${template}">
+            ${columns.map(column => `<span title="${escapeHtml(column.key)}">${escapeHtml(column.key)}</span>`).join('')}
+        </div>
+    `);
+    view.setWidth(columns.reduce((total, column) => total + column.width, 0));
+    view.setItems(records);
+}
+
+// Evenly spaced records, so columns reflect the whole result and not its first rows
+function sampleRecords(records, size) {
+    if (records.length <= size) return records;
+    const step = records.length / size;
+    return Array.from({ length: size }, (_, i) => records[Math.floor(i * step)]);
+}
+
+// Columns in first-seen order across the sample, sized to the longer of the
+// header and the 90th percentile value length
+function columnLayout(records) {
+    const lengths = new Map();
+    sampleRecords(records, COLUMN_SAMPLE_SIZE).forEach(record => {
+        Object.keys(record || {}).forEach(key => {
+            if (!lengths.has(key)) lengths.set(key, []);
+            lengths.get(key).push(cellText(record[key]).length);
+        });
+    });
+    
+    return Array.from(lengths, ([key, values]) => {
+        values.sort((a, b) => a - b);
+        const chars = Math.max(key.length, percentile(values, 90));
+        return { key, width: Math.min(Math.max(chars * 7 + 24, 60), 240) };
+    });
+}
+
+function cellText(value) {
+    if (value == null) return '';
+    return typeof value === 'object' ? JSON.stringify(value) : String(value);
 }
 
 // Export data as CSV
@@ -507,79 +597,656 @@ async function exportData() {
 
 // Initialize Network Monitor tab
 async function initializeNetworkMonitor() {
-    // Listen for network requests from content script
-    if (typeof chrome !== 'undefined' && chrome.tabs) {
-        // This would be implemented to capture network requests
+    try {
+        networkDb = await openNetworkDb();
+        await loadStoredRequests();
+    } catch (error) {
+        console.warn('Network capture will not be persisted:', error);
+        networkDb = null;
+    }
+    
+    // Content scripts forward the calls inject.js captures, in batches
+    chrome.runtime.onMessage.addListener((message, sender) => {
+        if (message.action === 'networkEvents') {
+            applyNetworkEvents(message.events, sender.tab?.id, sender.tab?.url || sender.url);
+        }
+    });
+    
+    const networkList = document.getElementById('networkList');
+    networkListView = new VirtualList(networkList, {
+        rowHeight: NETWORK_ROW_HEIGHT,
+        createRow: () => {
+            const row = document.createElement('div');
+            row.className = 'network-item';
+            ['method', 'url', 'status', 'duration', 'size', 'time'].forEach(column => {
+                const cell = document.createElement('span');
+                cell.className = `col-${column}`;
+                row.appendChild(cell);
+            });
+            return row;
+        },
+        renderRow: (row, req) => {
+            const [method, url, status, duration, size, time] = row.children;
+            method.className = `col-method method-${req.method.toLowerCase()}`;
+            method.textContent = req.method;
+            url.textContent = url.title = req.url;
+            status.className = `col-status status-${req.status}`;
+            status.textContent = req.status;
+            duration.textContent = formatDuration(req.duration);
+            size.textContent = formatBytes(req.size);
+            time.textContent = new Date(req.timestamp).toLocaleTimeString();
+        }
+    });
+    networkList.addEventListener('click', (event) => {
+        const column = event.target.closest('[data-sort]');
+        if (column) {
+            sortNetworkBy(column.dataset.sort);
+            return;
+        }
+        const request = networkListView.itemFor(event.target);
+        if (request) {
+            selectNetworkRequest(request.id);
+        }
+    });
+    
+    refreshNetworkList();
+}
+
+function requestOrPromise(request) {
+    return new Promise((resolve, reject) => {
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+// Rows are keyed by the store's own generator rather than the panel's ids,
+// so several panels (or a reopened one) append to the capture instead of
+// overwriting each other. Version 1 keyed rows by panel id; that capture is
+// dropped on upgrade.
+function openNetworkDb() {
+    const request = indexedDB.open(NETWORK_DB_NAME, 2);
+    request.onupgradeneeded = () => {
+        const db = request.result;
+        if (db.objectStoreNames.contains(NETWORK_STORE)) {
+            db.deleteObjectStore(NETWORK_STORE);
+        }
+        db.createObjectStore(NETWORK_STORE, { keyPath: 'key', autoIncrement: true });
+    };
+    return requestOrPromise(request);
+}
+
+// Show the tail of the stored capture, numbered for this panel after it
+async function loadStoredRequests() {
+    const store = networkDb.transaction(NETWORK_STORE).objectStore(NETWORK_STORE);
+    const stored = [];
+    await new Promise((resolve, reject) => {
+        const cursor = store.openCursor(null, 'prev');
+        cursor.onsuccess = () => {
+            const result = cursor.result;
+            if (!result || stored.length >= MAX_NETWORK_REQUESTS) {
+                resolve();
+                return;
+            }
+            stored.push(result.value);
+            result.continue();
+        };
+        cursor.onerror = () => reject(cursor.error);
+    });
+    
+    stored.reverse().forEach(request => {
+        // Calls still pending when the panel closed will never complete
+        if (request.status === 'pending') request.status = 'error';
+        request.id = ++networkSeq;
+        networkRequests.push(request);
+        networkRequestsById.set(request.id, request);
+        countRequest(request);
+    });
+}
+
+function markRequestUnsaved(request) {
+    if (!networkDb) return;
+    unsavedRequests.set(request.id, request);
+    if (!networkPersistTimer) {
+        networkPersistTimer = setTimeout(persistNetworkRequests, NETWORK_PERSIST_DELAY);
+    }
+}
+
+// One write transaction for everything captured since the last one. Writes
+// run one after another: a request's key is only known once its add
+// succeeds, and a later update must put to that key rather than add again.
+function persistNetworkRequests() {
+    clearTimeout(networkPersistTimer);
+    networkPersistTimer = null;
+    networkPersistQueue = networkPersistQueue.then(writeUnsavedRequests);
+    return networkPersistQueue;
+}
+
+function writeUnsavedRequests() {
+    if (!networkDb || unsavedRequests.size === 0) return Promise.resolve();
+    
+    const requests = Array.from(unsavedRequests.values());
+    unsavedRequests = new Map();
+    const transaction = networkDb.transaction(NETWORK_STORE, 'readwrite');
+    const store = transaction.objectStore(NETWORK_STORE);
+    let lastAdd = null;
+    requests.forEach(request => {
+        if (request.key !== undefined) {
+            store.put(request);
+            return;
+        }
+        const add = store.add(request);
+        add.onsuccess = () => { request.key = add.result; };
+        lastAdd = add;
+    });
+    // Keys only grow, so the newest one bounds the rows worth keeping
+    if (lastAdd) {
+        lastAdd.addEventListener('success', () => {
+            if (lastAdd.result > MAX_STORED_REQUESTS) {
+                store.delete(IDBKeyRange.upperBound(lastAdd.result - MAX_STORED_REQUESTS));
+            }
+        });
+    }
+    return new Promise(resolve => {
+        transaction.oncomplete = () => resolve();
+        transaction.onerror = () => {
+            console.warn('Failed to persist network requests:', transaction.error);
+            resolve();
+        };
+    });
+}
+
+// Fold compact events (see inject.js) into networkRequests. Call ids restart
+// with every page load, so requests get this panel's sequence number as id.
+// liveNetworkCalls maps tab and call id to requests that may still get
+// events: a response ('r') and Resource Timing ('t') can arrive in either
+// order, so a call is done once it has both, or has failed.
+function applyNetworkEvents(events, tabId, pageUrl) {
+    for (const [kind, callId, ...fields] of events) {
+        const key = `${tabId}:${callId}`;
+        if (kind === 'c') {
+            const [method, url, timestamp] = fields;
+            const request = {
+                id: ++networkSeq,
+                method: (method || 'GET').toUpperCase(),
+                url: absoluteUrl(url, pageUrl),
+                timestamp,
+                status: 'pending',
+                ttfb: null,
+                duration: null,
+                size: null,
+                liveKey: key
+            };
+            networkRequests.push(request);
+            networkRequestsById.set(request.id, request);
+            liveNetworkCalls.delete(key);
+            liveNetworkCalls.set(key, request);
+            countRequest(request);
+            markRequestMoved(request, true);
+            if (networkRequests.length > MAX_NETWORK_REQUESTS) {
+                const evicted = networkRequests.shift();
+                networkRequestsById.delete(evicted.id);
+                if (liveNetworkCalls.get(evicted.liveKey) === evicted) {
+                    liveNetworkCalls.delete(evicted.liveKey);
+                }
+                uncountRequest(evicted);
+                markRequestMoved(evicted, true);
+            }
+            markRequestUnsaved(request);
+            continue;
+        }
+        
+        const request = liveNetworkCalls.get(key);
+        if (!request) continue;
+        if (kind === 'r') {
+            [request.status, request.ttfb, request.duration, request.size, request.mimeType] = fields;
+        } else if (kind === 't') {
+            [request.ttfb, request.duration, request.size] = fields;
+            request.timingSource = 'resource';
+        } else if (kind === 'e') {
+            request.status = 'error';
+            request.error = fields[0];
+        }
+        if (request.status === 'error' || (request.status !== 'pending' && request.timingSource === 'resource')) {
+            liveNetworkCalls.delete(key);
+        }
+        recountRequest(request);
+        markRequestMoved(request, false);
+        markRequestUnsaved(request);
+    }
+    
+    scheduleNetworkRefresh();
+}
+
+function absoluteUrl(url, pageUrl) {
+    try {
+        return new URL(url, pageUrl).href;
+    } catch (error) {
+        return url;
+    }
+}
+
+// Redraw at most once per frame, however many batches arrive
+function scheduleNetworkRefresh() {
+    if (networkRefreshScheduled) return;
+    networkRefreshScheduled = true;
+    requestAnimationFrame(() => {
+        networkRefreshScheduled = false;
         refreshNetworkList();
+    });
+}
+
+function sortNetworkBy(key) {
+    networkSort = {
+        key,
+        direction: networkSort.key === key ? -networkSort.direction : (key === 'url' || key === 'method' ? 1 : -1)
+    };
+    sortedRequests = null;
+    movedRequests.clear();
+    refreshNetworkList();
+}
+
+// Unknown values sort last either way and ties keep capture order. Statuses
+// mix numbers with 'pending'/'error', so values of different types are
+// ordered by type: sortedIndex needs a consistent order.
+function compareRequests(a, b) {
+    const { key, direction } = networkSort;
+    const left = a[key], right = b[key];
+    if (left == null || right == null) {
+        if ((left == null) !== (right == null)) return (left == null) - (right == null);
+    } else if (typeof left !== typeof right) {
+        return (typeof left < typeof right ? -1 : 1) * direction;
+    } else if (left !== right) {
+        return (left < right ? -1 : 1) * direction;
+    }
+    return (a.id - b.id) * (key === 'timestamp' ? direction : 1);
+}
+
+// First position in a sorted array where value could be inserted
+function sortedIndex(array, value, compare) {
+    let low = 0, high = array.length;
+    while (low < high) {
+        const middle = (low + high) >>> 1;
+        if (compare(array[middle], value) < 0) low = middle + 1;
+        else high = middle;
+    }
+    return low;
+}
+
+// A request that arrived, left, or changed may need a new place in
+// sortedRequests; updates never move it when sorting by time
+function markRequestMoved(request, created) {
+    if (sortedRequests && (created || networkSort.key !== 'timestamp')) {
+        movedRequests.add(request);
     }
 }
 
+// Requests in display order. Capture order is networkRequests itself; other
+// orders are sorted once and then patched with the requests that moved.
+function sortedNetworkRequests() {
+    if (networkSort.key === 'timestamp' && networkSort.direction === 1) {
+        return networkRequests;
+    }
+    if (!sortedRequests) {
+        sortedRequests = networkRequests.slice().sort(compareRequests);
+        movedRequests.clear();
+        return sortedRequests;
+    }
+    
+    movedRequests.forEach(request => {
+        const index = sortedRequests.indexOf(request);
+        if (index !== -1) sortedRequests.splice(index, 1);
+        if (networkRequestsById.get(request.id) === request) {
+            sortedRequests.splice(sortedIndex(sortedRequests, request, compareRequests), 0, request);
+        }
+    });
+    movedRequests.clear();
+    return sortedRequests;
+}
+
+function networkHeader() {
+    const columns = [
+        ['method', 'Method'], ['url', 'URL'], ['status', 'Status'],
+        ['duration', 'Duration'], ['size', 'Size'], ['timestamp', 'Time']
+    ];
+    return `
+        <div class="network-header">
+            ${columns.map(([key, label]) => `
+                <span class="col-${key === 'timestamp' ? 'time' : key}" data-sort="${key}">${label}${
+                    networkSort.key === key ? (networkSort.direction === 1 ? ' ▲' : ' ▼') : ''
+                }</span>
+            `).join('')}
+        </div>
+    `;
+}
+
 // Refresh network list
 function refreshNetworkList() {
     const networkList = document.getElementById('networkList');
+    if (!networkListView) return;
     
     if (networkRequests.length === 0) {
         networkList.innerHTML = `
-            <div class="network-header">
-                <span class="col-method">Method</span>
-                <span class="col-url">URL</span>
-                <span class="col-status">Status</span>
-                <span class="col-time">Time</span>
-            </div>
+            ${networkHeader()}
             <div class="network-empty">No network requests captured</div>
         `;
+        refreshEndpointStats();
         return;
     }
     
-    networkList.innerHTML = `
-        <div class="network-header">
-            <span class="col-method">Method</span>
-            <span class="col-url">URL</span>
-            <span class="col-status">Status</span>
-            <span class="col-time">Time</span>
-        </div>
-        ${networkRequests.map(req => `
-            <div class="network-item" onclick="selectNetworkRequest('${req.id}')">
-                <span class="col-method method-${req.method.toLowerCase()}">${req.method}</span>
-                <span class="col-url">${req.url}</span>
-                <span class="col-status status-${req.status}">${req.status}</span>
-                <span class="col-time">${new Date(req.timestamp).toLocaleTimeString()}</span>
+    // Follow new requests only when the user hasn't scrolled up to look at older ones
+    const atEnd = networkList.scrollTop + networkList.clientHeight >= networkList.scrollHeight - NETWORK_ROW_HEIGHT;
+    networkListView.setHeader(networkHeader());
+    networkListView.setItems(sortedNetworkRequests());
+    if (atEnd && document.getElementById('autoScroll').checked && networkSort.key === 'timestamp' && networkSort.direction === 1) {
+        networkListView.scrollToEnd();
+    }
+    refreshEndpointStats();
+}
+
+// Collapse record ids so calls to the same endpoint aggregate together
+function endpointOf(url) {
+    let path;
+    try {
+        path = new URL(url, 'https://placeholder.invalid').pathname;
+    } catch (error) {
+        path = url.split('?')[0];
+    }
+    return path.split('/').map(segment =>
+        /^\d+$/.test(segment) || /^[0-9a-f-]{16,}$/i.test(segment) || /^[A-Za-z]{2,4}\d{6,}$/.test(segment)
+            ? '{id}' : segment
+    ).join('/');
+}
+
+// Nearest-rank percentile of an already sorted list
+function percentile(sortedValues, pct) {
+    if (sortedValues.length === 0) return null;
+    const rank = Math.max(Math.ceil(pct / 100 * sortedValues.length) - 1, 0);
+    return sortedValues[Math.min(rank, sortedValues.length - 1)];
+}
+
+// Add a request to its endpoint's aggregate, remembering what it added so
+// the numbers can be taken back out when the request changes or is evicted
+function countRequest(request) {
+    const key = `${request.method} ${endpointOf(request.url)}`;
+    let stats = endpointAggregates.get(key);
+    if (!stats) {
+        stats = { endpoint: key, count: 0, errors: 0, durations: [], bytes: 0, row: null };
+        endpointAggregates.set(key, stats);
+    }
+    const contribution = {
+        stats,
+        failed: request.status === 'error' || request.status >= 400,
+        duration: request.duration,
+        size: request.size || 0
+    };
+    stats.count++;
+    if (contribution.failed) stats.errors++;
+    if (contribution.duration != null) {
+        stats.durations.splice(sortedIndex(stats.durations, contribution.duration, (a, b) => a - b), 0, contribution.duration);
+    }
+    stats.bytes += contribution.size;
+    endpointContributions.set(request, contribution);
+    changedEndpoints.add(stats);
+}
+
+function uncountRequest(request) {
+    const contribution = endpointContributions.get(request);
+    if (!contribution) return;
+    endpointContributions.delete(request);
+    const { stats } = contribution;
+    stats.count--;
+    if (contribution.failed) stats.errors--;
+    if (contribution.duration != null) {
+        stats.durations.splice(sortedIndex(stats.durations, contribution.duration, (a, b) => a - b), 1);
+    }
+    stats.bytes -= contribution.size;
+    changedEndpoints.add(stats);
+}
+
+// Requests evicted from the capture while still in flight stay uncounted
+function recountRequest(request) {
+    if (!endpointContributions.has(request)) return;
+    uncountRequest(request);
+    countRequest(request);
+}
+
+// Endpoint rows are ordered by p95, slowest first
+function endpointRank(row) {
+    return row ? Number(row.dataset.p95) : null;
+}
+
+// Update only the rows of endpoints whose numbers changed since the last frame
+function refreshEndpointStats() {
+    const container = document.getElementById('endpointStats');
+    if (!endpointTableBody || !endpointTableBody.isConnected) {
+        if (endpointAggregates.size === 0) {
+            container.innerHTML = '<div class="empty-state">No requests captured</div>';
+            changedEndpoints.clear();
+            return;
+        }
+        container.innerHTML = `
+            <div class="data-table-container">
+                <table class="data-table">
+                    <thead>
+                        <tr><th>Endpoint</th><th>Count</th><th>p50</th><th>p95</th><th>Bytes</th></tr>
+                    </thead>
+                    <tbody></tbody>
+                </table>
             </div>
-        `).join('')}
-    `;
+        `;
+        endpointTableBody = container.querySelector('tbody');
+        endpointAggregates.forEach(stats => {
+            stats.row = null;
+            changedEndpoints.add(stats);
+        });
+    }
+    
+    changedEndpoints.forEach(stats => {
+        if (stats.count === 0) {
+            if (stats.row) stats.row.remove();
+            stats.row = null;
+            if (endpointAggregates.get(stats.endpoint) === stats) endpointAggregates.delete(stats.endpoint);
+            return;
+        }
+        if (!stats.row) {
+            stats.row = document.createElement('tr');
+            for (let cell = 0; cell < 5; cell++) {
+                stats.row.appendChild(document.createElement('td'));
+            }
+        }
+        
+        const p95 = percentile(stats.durations, 95);
+        const [endpoint, count, p50Cell, p95Cell, bytes] = stats.row.children;
+        endpoint.textContent = endpoint.title = stats.endpoint;
+        count.textContent = `${stats.count}${stats.errors ? ` (${stats.errors} failed)` : ''}`;
+        p50Cell.textContent = formatDuration(percentile(stats.durations, 50));
+        p95Cell.textContent = formatDuration(p95);
+        bytes.textContent = formatBytes(stats.bytes);
+        
+        // Move the row only when its p95 no longer fits between its neighbours
+        stats.row.dataset.p95 = p95 ?? -1;
+        const rank = endpointRank(stats.row);
+        const previous = endpointRank(stats.row.previousElementSibling);
+        const next = endpointRank(stats.row.nextElementSibling);
+        if (stats.row.parentNode === endpointTableBody && (previous === null || previous >= rank) && (next === null || next <= rank)) {
+            return;
+        }
+        stats.row.remove();
+        const before = Array.from(endpointTableBody.children).find(row => endpointRank(row) < rank);
+        endpointTableBody.insertBefore(stats.row, before || null);
+    });
+    changedEndpoints.clear();
+    
+    if (endpointAggregates.size === 0) {
+        endpointTableBody = null;
+        container.innerHTML = '<div class="empty-state">No requests captured</div>';
+    }
+}
+
+function formatDuration(ms) {
+    if (ms == null) return '–';
+    return ms < 1000 ? `${Math.round(ms)} ms` : `${(ms / 1000).toFixed(2)} s`;
+}
+
+function formatBytes(bytes) {
+    if (bytes == null) return '–';
+    if (bytes < 1024) return `${bytes} B`;
+    if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`;
+    return `${(bytes / 1024 / 1024).toFixed(1)} MB`;
+}
+
+function escapeHtml(value) {
+    return String(value).replace(/[&<>"']/g, char => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[char]);
 }
 
 // Clear network list
 function clearNetworkList() {
     networkRequests = [];
+    networkRequestsById.clear();
+    liveNetworkCalls.clear();
+    unsavedRequests.clear();
+    sortedRequests = null;
+    movedRequests.clear();
+    endpointAggregates = new Map();
+    endpointContributions = new WeakMap();
+    changedEndpoints.clear();
+    endpointTableBody = null;
+    if (networkDb) {
+        networkDb.transaction(NETWORK_STORE, 'readwrite').objectStore(NETWORK_STORE).clear();
+    }
     refreshNetworkList();
 }
 
-// Export network log
-function exportNetworkLog() {
-    // This would implement HAR export functionality
-    alert('Network export functionality coming soon!');
+// Calls in capture order, from IndexedDB when available. The callback runs
+// inside the cursor's transaction, so it must not await.
+async function forEachCapturedRequest(callback) {
+    if (!networkDb) {
+        networkRequests.forEach(callback);
+        return;
+    }
+    
+    await persistNetworkRequests();
+    const store = networkDb.transaction(NETWORK_STORE).objectStore(NETWORK_STORE);
+    await new Promise((resolve, reject) => {
+        const cursor = store.openCursor();
+        cursor.onsuccess = () => {
+            if (!cursor.result) {
+                resolve();
+                return;
+            }
+            callback(cursor.result.value);
+            cursor.result.continue();
+        };
+        cursor.onerror = () => reject(cursor.error);
+    });
+}
+
+// HAR 1.2 entry; headers and bodies are not captured, so sizes are -1 there
+function harEntry(request) {
+    const wait = request.ttfb ?? request.duration ?? 0;
+    const total = request.duration ?? wait;
+    let queryString = [];
+    try {
+        queryString = Array.from(new URL(request.url).searchParams, ([name, value]) => ({ name, value }));
+    } catch (error) {
+        // Relative URL from before the page origin was recorded
+    }
+    
+    const entry = {
+        startedDateTime: new Date(request.timestamp).toISOString(),
+        time: total,
+        request: {
+            method: request.method,
+            url: request.url,
+            httpVersion: 'HTTP/1.1',
+            cookies: [],
+            headers: [],
+            queryString,
+            headersSize: -1,
+            bodySize: -1
+        },
+        response: {
+            status: typeof request.status === 'number' ? request.status : 0,
+            statusText: request.error || '',
+            httpVersion: 'HTTP/1.1',
+            cookies: [],
+            headers: [],
+            content: { size: request.size ?? 0, mimeType: request.mimeType || '' },
+            redirectURL: '',
+            headersSize: -1,
+            bodySize: request.size ?? -1
+        },
+        cache: {},
+        timings: { send: 0, wait, receive: Math.max(total - wait, 0) }
+    };
+    if (request.error) entry._error = request.error;
+    return entry;
+}
+
+// Export network log as HAR. Entries are serialized one at a time into Blob
+// chunks, so the file never exists as a single string.
+async function exportNetworkLog() {
+    const manifest = chrome.runtime.getManifest();
+    const parts = [JSON.stringify({
+        log: {
+            version: '1.2',
+            creator: { name: 'Conga Inspector', version: manifest.version },
+            pages: [],
+            entries: []
+        }
+    }).slice(0, -3)];
+    
+    let chunk = [];
+    let count = 0;
+    await forEachCapturedRequest(request => {
+        chunk.push((count++ ? ',' : '') + JSON.stringify(harEntry(request)));
+        if (chunk.length >= HAR_CHUNK_ENTRIES) {
+            parts.push(new Blob(chunk));
+            chunk = [];
+        }
+    });
+    parts.push(new Blob(chunk), ']}}');
+    
+    if (count === 0) {
+        alert('No network requests captured');
+        return;
+    }
+    
+    const url = URL.createObjectURL(new Blob(parts, { type: 'application/json' }));
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = `conga-network-${new Date().toISOString().replace(/[:.]/g, '-')}.har`;
+    link.click();
+    setTimeout(() => URL.revokeObjectURL(url), 1000);
 }
 
 // Select network request for details
 function selectNetworkRequest(requestId) {
-    const request = networkRequests.find(req => req.id === requestId);
+    const request = networkRequestsById.get(requestId);
     if (!request) return;
     
     const requestDetails = document.getElementById('requestDetails');
+    // Every field comes from events the page posted, so all of it is escaped
     requestDetails.innerHTML = `
         <div class="request-summary">
-            <h4>${request.method} ${request.url}</h4>
+            <h4>${escapeHtml(request.method)} ${escapeHtml(request.url)}</h4>
+            <div class="request-meta">
+                <span>Status: ${escapeHtml(request.status)}</span>
+                <span>Time: ${escapeHtml(new Date(request.timestamp).toLocaleString())}</span>
+            </div>
             <div class="request-meta">
-                <span>Status: ${request.status}</span>
-                <span>Time: ${new Date(request.timestamp).toLocaleString()}</span>
+                <span>TTFB: ${escapeHtml(formatDuration(request.ttfb))}</span>
+                <span>Duration: ${escapeHtml(formatDuration(request.duration))}</span>
+                <span>Size: ${escapeHtml(formatBytes(request.size))}</span>
             </div>
         </div>
         <div class="request-data">
             <h5>Request</h5>
-            <pre>${JSON.stringify(request.requestData || {}, null, 2)}</pre>
+            <pre>${escapeHtml(JSON.stringify(request.requestData || {}, null, 2))}</pre>
             <h5>Response</h5>
-            <pre>${JSON.stringify(request.responseData || {}, null, 2)}</pre>
+            <pre>${escapeHtml(JSON.stringify(request.responseData || request.error || {}, null, 2))}</pre>
         </div>
     `;
 }
@@ -587,8 +1254,6 @@ function selectNetworkRequest(requestId) {
 // Make functions globally available
 window.loadQuery = loadQuery;
 window.deleteQuery = deleteQuery;
-window.selectObject = selectObject;
-window.selectNetworkRequest = selectNetworkRequest;
 
 // Initialize when DOM is ready
 if (document.readyState === 'loading') {
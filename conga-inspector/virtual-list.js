@@ -0,0 +1,106 @@
+// Conga Inspector Virtual List
+// Renders only the rows inside a scroll container's viewport, plus a few on
+// either side, and reuses those row nodes as the container scrolls. Rows are
+// absolutely positioned at a fixed height, so a list of thousands of records
+// costs about a screenful of DOM.
+
+// Used while the container is hidden (inactive tab) and has no height yet
+const FALLBACK_VIEWPORT_HEIGHT = 600;
+
+class VirtualList {
+    constructor(container, { rowHeight, createRow, renderRow, overscan = 8 }) {
+        this.container = container;
+        this.rowHeight = rowHeight;
+        this.createRow = createRow;
+        this.renderRow = renderRow;
+        this.overscan = overscan;
+        this.items = [];
+        this.rows = [];
+        this.frame = null;
+
+        this.header = document.createElement('div');
+        this.header.className = 'virtual-header';
+        this.body = document.createElement('div');
+        this.body.className = 'virtual-body';
+
+        container.classList.add('virtual-scroll');
+        container.addEventListener('scroll', () => this.scheduleRender(), { passive: true });
+        if (typeof ResizeObserver !== 'undefined') {
+            new ResizeObserver(() => this.scheduleRender()).observe(container);
+        }
+    }
+
+    // Loading and error messages replace the container's contents; put the list back
+    mount() {
+        if (this.body.parentNode !== this.container) {
+            this.container.replaceChildren(this.header, this.body);
+        }
+    }
+
+    setHeader(html) {
+        this.mount();
+        this.header.innerHTML = html;
+    }
+
+    setWidth(width) {
+        this.header.style.minWidth = this.body.style.minWidth = width ? `${width}px` : '';
+    }
+
+    setItems(items) {
+        this.mount();
+        this.items = items;
+        this.body.style.height = `${items.length * this.rowHeight}px`;
+        this.rows.forEach(row => { row.index = -1; });
+        this.render();
+    }
+
+    scrollToEnd() {
+        this.container.scrollTop = this.container.scrollHeight;
+        this.render();
+    }
+
+    // The item shown by the row containing `element`, for delegated events
+    itemFor(element) {
+        const node = element.closest('.virtual-row');
+        return node && node.parentNode === this.body ? this.items[Number(node.dataset.index)] : undefined;
+    }
+
+    scheduleRender() {
+        if (this.frame) return;
+        this.frame = requestAnimationFrame(() => {
+            this.frame = null;
+            this.render();
+        });
+    }
+
+    render() {
+        const viewport = this.container.clientHeight || FALLBACK_VIEWPORT_HEIGHT;
+        const scrolled = this.container.scrollTop - this.body.offsetTop;
+        const top = Math.max(Math.min(scrolled, this.items.length * this.rowHeight - viewport), 0);
+        const first = Math.max(Math.floor(top / this.rowHeight) - this.overscan, 0);
+        const last = Math.min(Math.ceil((top + viewport) / this.rowHeight) + this.overscan, this.items.length);
+        const count = Math.max(last - first, 0);
+
+        while (this.rows.length < count) {
+            const node = this.createRow();
+            node.classList.add('virtual-row');
+            node.style.height = `${this.rowHeight}px`;
+            this.body.appendChild(node);
+            this.rows.push({ node, index: -1 });
+        }
+        while (this.rows.length > count) {
+            this.rows.pop().node.remove();
+        }
+
+        // Item i always lands in slot i % count, so rows that stay in view
+        // while scrolling keep their node and are not redrawn
+        for (let index = first; index < last; index++) {
+            const row = this.rows[index % count];
+            if (row.index === index) continue;
+            row.index = index;
+            row.node.dataset.index = index;
+            row.node.style.transform = `translateY(${index * this.rowHeight}px)`;
+            this.renderRow(row.node, this.items[index], index);
+        }
+    }
+}
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Client-credentials token provider shared by the Conga test scripts
+
+Tokens are cached on disk together with their expiry, so back-to-back script
+runs reuse one token instead of each posting to the login endpoint. Like
+getAccessToken in background.js, a token is refreshed once it is within
+REFRESH_BUFFER_SECONDS of expiring.
+
+Refreshes are coalesced: threads in one process share an in-flight refresh
+through a lock, and parallel processes take an exclusive lock on the cache
+file and re-read it, so whoever refreshes first serves everyone else.
+
+    token = get_token()
+
+Set CONGA_TOKEN_CACHE to another file, or to "off" to keep tokens in memory only.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+import conga_config
+
+try:
+    import fcntl
+except ImportError:  # Windows: tokens are still cached, only not locked across processes
+    fcntl = None
+
+REFRESH_BUFFER_SECONDS = 60
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'conga-inspector' / 'tokens.json'
+
+
+class TokenError(Exception):
+    """The token endpoint did not hand out a token."""
+
+
+def cache_path_from_env() -> Optional[Path]:
+    value = os.environ.get('CONGA_TOKEN_CACHE', '')
+    if value.lower() == 'off':
+        return None
+    return Path(value) if value else DEFAULT_CACHE_PATH
+
+
+class TokenProvider:
+    """Hands out a valid access token, requesting a new one only when needed."""
+
+    def __init__(
+        self,
+        token_url: str = conga_config.TOKEN_URL,
+        client_id: str = conga_config.CLIENT_ID,
+        client_secret: str = conga_config.CLIENT_SECRET,
+        scope: Optional[str] = None,
+        cache_path: Optional[Path] = None,
+        refresh_buffer: float = REFRESH_BUFFER_SECONDS,
+        timeout: float = 30,
+        session: Optional[requests.Session] = None,
+    ):
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.refresh_buffer = refresh_buffer
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.cache_key = hashlib.sha256(f"{token_url}|{client_id}|{scope or ''}".encode()).hexdigest()[:16]
+        self.requests_made = 0
+        self._token = None
+        self._lock = threading.Lock()
+
+    def get_token(self, force_refresh: bool = False) -> str:
+        return self.get_token_data(force_refresh)['access_token']
+
+    async def get_token_async(self, force_refresh: bool = False) -> str:
+        return await asyncio.to_thread(self.get_token, force_refresh)
+
+    def get_token_data(self, force_refresh: bool = False) -> dict:
+        """The token response plus an absolute `expires_at`, refreshed if it is about to expire."""
+        token = self._token
+        if not force_refresh and self._fresh(token):
+            return token
+
+        stale = token
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self._token is not stale and self._fresh(self._token):
+                return self._token
+            with self._locked_cache() as entries:
+                cached = entries.get(self.cache_key)
+                if self._fresh(cached) and not (force_refresh and cached == stale):
+                    self._token = cached
+                    return cached
+                self._token = self._request_token()
+                entries[self.cache_key] = self._token
+                self._write_cache(entries)
+            return self._token
+
+    def invalidate(self):
+        """Forget the current token, e.g. after the API rejects it with a 401."""
+        with self._lock, self._locked_cache() as entries:
+            if entries.pop(self.cache_key, None) is not None:
+                self._write_cache(entries)
+            self._token = None
+
+    def _fresh(self, token: Optional[dict]) -> bool:
+        return bool(token) and token.get('expires_at', 0) - self.refresh_buffer > time.time()
+
+    def _request_token(self) -> dict:
+        data = {
+            'grant_type': 'client_credentials',
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+        }
+        if self.scope:
+            data['scope'] = self.scope
+        headers = {
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'User-Agent': conga_config.USER_AGENT,
+        }
+        requested_at = time.time()
+        try:
+            response = self.session.post(self.token_url, data=data, headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException as exc:
+            raise TokenError(f"Token request failed: {exc}") from exc
+        self.requests_made += 1
+        if response.status_code != 200:
+            raise TokenError(f"Token request failed: {response.status_code} - {response.text}")
+        try:
+            token = response.json()
+        except ValueError as exc:
+            raise TokenError(f"Token response is not JSON: {response.text[:200]}") from exc
+        if not token.get('access_token'):
+            raise TokenError(f"Token response has no access_token: {response.text[:200]}")
+        token['expires_at'] = requested_at + float(token.get('expires_in') or 0)
+        return token
+
+    @contextmanager
+    def _locked_cache(self):
+        """Yield the cache file's entries while holding an exclusive lock on it."""
+        if self.cache_path is None:
+            yield {}
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path.with_suffix('.lock'), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield self._read_cache()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_cache(self) -> dict:
+        try:
+            with open(self.cache_path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _write_cache(self, entries: dict):
+        if self.cache_path is None:
+            return
+        # Write then rename so readers without the lock never see a partial file
+        temp_path = self.cache_path.with_suffix('.tmp')
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entries, f)
+        os.replace(temp_path, self.cache_path)
+
+
+_default_provider = None
+_default_provider_lock = threading.Lock()
+
+
+def default_provider() -> TokenProvider:
+    """Process-wide provider for the configured client, cached at CONGA_TOKEN_CACHE."""
+    global _default_provider
+    with _default_provider_lock:
+        if _default_provider is None:
+            _default_provider = TokenProvider(cache_path=cache_path_from_env())
+        return _default_provider
+
+
+def get_token(force_refresh: bool = False) -> Optional[str]:
+    """Access token for the configured client, or None (with the reason printed) on failure."""
+    try:
+        return default_provider().get_token(force_refresh)
+    except TokenError as exc:
+        print(f"❌ {exc}")
+        return None
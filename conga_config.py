@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Conga connection settings shared by the Python tools
+
+Mirrors CONFIG in conga-inspector/background.js. Every value can be overridden
+from the environment, e.g. to point the scripts at another tenant or at a
+local mock_conga_api.py (CONGA_TOKEN_URL and CONGA_API_BASE_URL).
+"""
+
+import os
+
+CLIENT_ID = os.environ.get('CONGA_CLIENT_ID', '6ebb98c7-dd82-4780-b1ac-c0dc3f7ed43e')
+CLIENT_SECRET = os.environ.get('CONGA_CLIENT_SECRET', 'RK5h@?8gM_-6PEF@4-hzd73W')
+TOKEN_URL = os.environ.get('CONGA_TOKEN_URL', 'https://login-preview.congacloud.eu/api/v1/auth/connect/token')
+API_BASE_URL = os.environ.get('CONGA_API_BASE_URL', 'https://rls-preview.congacloud.eu/api/data')
+PLATFORM_DOMAIN = os.environ.get('CONGA_PLATFORM_DOMAIN', API_BASE_URL.split('/api/', 1)[0])
+
+USER_AGENT = 'Conga-Inspector-Test/1.0'
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Bulk export of Conga object records to NDJSON, CSV or Parquet
+
+Pages through /v1/objects/{Type} with several page requests in flight and
+writes pages in order as they arrive, so memory stays bounded by the number
+of pages in flight (plus one Parquet part file's rows). Progress is
+checkpointed next to the output, and --resume carries on from the last
+checkpoint after an interruption.
+
+    python conga_export.py Account accounts.ndjson
+    python conga_export.py Contact contacts.csv --fields Id,Name,CreatedDate --concurrency 8
+    python conga_export.py Opportunity opportunities.parquet --resume
+
+Parquet output is a directory of part files (part-00000.parquet, ...), which
+pandas.read_parquet and pyarrow read as one dataset; a part is only
+checkpointed once it is complete.
+"""
+
+import asyncio
+import csv
+import json
+import os
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+
+import conga_config
+from conga_auth import TokenError, default_provider
+from conga_probe import Probe, ProbeEngine, ProbeResult
+from swagger_sweep import records_of
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for --format parquet
+    pa = pq = None
+
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_CONCURRENCY = 4
+PARQUET_ROWS_PER_PART = 50_000
+RETRIES = 3
+
+app = typer.Typer(add_completion=False)
+
+
+class Format(str, Enum):
+    ndjson = 'ndjson'
+    csv = 'csv'
+    parquet = 'parquet'
+
+
+class ExportError(Exception):
+    pass
+
+
+def project(record: dict, fields: Optional[List[str]]) -> dict:
+    if not fields:
+        return record
+    return {field: record.get(field) for field in fields}
+
+
+class NdjsonWriter:
+    """One JSON document per line; resumable at any page boundary."""
+
+    def __init__(self, path: Path, fields: Optional[List[str]], state: Optional[dict] = None):
+        self.path = path
+        self.fields = fields
+        self.file = open(path, 'r+b' if state else 'wb')
+        if state:
+            # Drop anything written after the last checkpoint
+            self.file.truncate(state['bytes'])
+            self.file.seek(state['bytes'])
+
+    def write(self, records: List[dict]):
+        self.file.write(b''.join(
+            json.dumps(project(record, self.fields), ensure_ascii=False, default=str).encode() + b'\n'
+            for record in records
+        ))
+
+    def checkpoint(self) -> Optional[dict]:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return {'bytes': self.file.tell()}
+
+    def close(self):
+        self.file.close()
+
+
+def first_page_columns(records: List[dict]) -> List[str]:
+    """Every key of the first page, in the order they first appear."""
+    return list(dict.fromkeys(key for record in records for key in record))
+
+
+class CsvWriter(NdjsonWriter):
+    """CSV with a fixed header: the projected fields, or the first page's columns.
+
+    Keys that only appear in later pages are left out; name them with fields
+    to keep them.
+    """
+
+    def __init__(self, path: Path, fields: Optional[List[str]], state: Optional[dict] = None):
+        super().__init__(path, fields, state)
+        self.columns = state['columns'] if state else fields
+
+    def write(self, records: List[dict]):
+        if not records:
+            return
+        lines = _CsvLines()
+        if self.columns is None:
+            self.columns = first_page_columns(records)
+        writer = csv.DictWriter(lines, fieldnames=self.columns, extrasaction='ignore')
+        if self.file.tell() == 0:
+            writer.writeheader()
+        writer.writerows(records)
+        self.file.write(''.join(lines.chunks).encode())
+
+    def checkpoint(self) -> Optional[dict]:
+        return {**super().checkpoint(), 'columns': self.columns}
+
+
+class _CsvLines:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, chunk: str):
+        self.chunks.append(chunk)
+
+
+class ParquetWriter:
+    """Directory of Parquet part files; only whole parts are checkpointed.
+
+    Every part shares one schema, so the directory reads back as a single
+    dataset: the projected fields, or the first page's columns (like the CSV
+    header), typed from the first page with all-null columns as strings.
+    """
+
+    def __init__(self, path: Path, fields: Optional[List[str]], state: Optional[dict] = None,
+                 rows_per_part: int = PARQUET_ROWS_PER_PART):
+        if pa is None:
+            raise ExportError("Parquet output needs pyarrow: pip install pyarrow")
+        self.path = path
+        self.fields = fields
+        self.rows_per_part = rows_per_part
+        self.parts = state['parts'] if state else 0
+        self.rows = []
+        self.flushed = False
+        path.mkdir(parents=True, exist_ok=True)
+        # Parts past the checkpoint are from an interrupted run
+        for stale in path.glob('part-*.parquet'):
+            if int(stale.stem.split('-')[1]) >= self.parts:
+                stale.unlink()
+        self.schema = pq.read_schema(path / 'part-00000.parquet') if self.parts else None
+
+    def write(self, records: List[dict]):
+        if not records:
+            return
+        if self.schema is None:
+            self.schema = self._infer_schema([project(record, self.fields) for record in records])
+        columns = self.schema.names
+        self.rows.extend({column: record.get(column) for column in columns} for record in records)
+        if len(self.rows) >= self.rows_per_part:
+            self._flush()
+
+    def checkpoint(self) -> Optional[dict]:
+        if not self.flushed:
+            return None
+        self.flushed = False
+        return {'parts': self.parts}
+
+    def close(self):
+        if self.rows:
+            self._flush()
+
+    def _infer_schema(self, rows: List[dict]) -> 'pa.Schema':
+        columns = self.fields or first_page_columns(rows)
+        inferred = pa.Table.from_pylist([{column: row.get(column) for column in columns} for row in rows]).schema
+        return pa.schema(
+            pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field for field in inferred
+        )
+
+    def _flush(self):
+        # Later values for a column typed as string (e.g. first seen all-null) are stringified
+        text_columns = [field.name for field in self.schema if pa.types.is_string(field.type)]
+        for row in self.rows:
+            for column in text_columns:
+                value = row[column]
+                if isinstance(value, (dict, list)):
+                    row[column] = json.dumps(value, default=str)
+                elif value is not None and not isinstance(value, str):
+                    row[column] = str(value)
+        table = pa.Table.from_pylist(self.rows, schema=self.schema)
+        part_path = self.path / f'part-{self.parts:05d}.parquet'
+        pq.write_table(table, part_path.with_suffix('.tmp'))
+        os.replace(part_path.with_suffix('.tmp'), part_path)
+        self.parts += 1
+        self.rows = []
+        self.flushed = True
+
+
+WRITERS = {Format.ndjson: NdjsonWriter, Format.csv: CsvWriter, Format.parquet: ParquetWriter}
+
+
+class Checkpoint:
+    """Export progress, rewritten atomically after every durable page."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> Optional[dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, state: dict):
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+
+
+class PageFetcher:
+    """Fetches one page of an object type, retrying transient failures."""
+
+    def __init__(self, engine: ProbeEngine, base_url: str, object_type: str, page_size: int,
+                 auth: bool = True, retries: int = RETRIES):
+        self.engine = engine
+        self.url = f"{base_url.rstrip('/')}/v1/objects/{object_type}"
+        self.page_size = page_size
+        self.auth = auth
+        self.retries = retries
+        self.requests = 0
+
+    async def fetch(self, offset: int) -> dict:
+        url = f"{self.url}?limit={self.page_size}&offset={offset}"
+        for attempt in range(self.retries + 1):
+            result = await self.engine.probe(Probe(url, headers=await self._headers()))
+            self.requests += 1
+            if result.ok:
+                body = result.json()
+                if body is None:
+                    raise ExportError(f"Page at offset {offset} is not JSON")
+                return body
+            if result.status == 401 and self.auth and attempt == 0:
+                default_provider().invalidate()
+                continue
+            if not self._retryable(result) or attempt == self.retries:
+                raise ExportError(f"Page at offset {offset} failed: {result.error or result.status}")
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def _headers(self) -> Dict[str, str]:
+        if not self.auth:
+            return {}
+        try:
+            token = await default_provider().get_token_async()
+        except TokenError as exc:
+            raise ExportError(str(exc)) from exc
+        return {'Authorization': f'Bearer {token}'}
+
+    @staticmethod
+    def _retryable(result: ProbeResult) -> bool:
+        return result.status is None or result.status == 429 or result.status >= 500
+
+
+async def export_records(
+    object_type: str,
+    output: Path,
+    fmt: Format,
+    fields: Optional[List[str]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    limit: Optional[int] = None,
+    resume: bool = False,
+    base_url: str = conga_config.API_BASE_URL,
+    auth: bool = True,
+    progress=None,
+    rows_per_part: int = PARQUET_ROWS_PER_PART,
+    **engine_options,
+) -> dict:
+    """Export and return {'records', 'pages', 'requests', 'resumed_from'}."""
+    checkpoint = Checkpoint(output.with_name(output.name + '.checkpoint'))
+    settings = {'object_type': object_type, 'format': fmt.value, 'fields': fields, 'page_size': page_size}
+    state = checkpoint.load() if resume else None
+    if state and state['settings'] != settings:
+        raise ExportError(f"{checkpoint.path} is for a different export: {state['settings']}")
+
+    offset = state['next_offset'] if state else 0
+    written = state['records'] if state else 0
+    resumed_from = offset
+    writer_state = state['writer'] if state else None
+    if fmt is Format.parquet:
+        writer = ParquetWriter(output, fields, writer_state, rows_per_part)
+    else:
+        writer = WRITERS[fmt](output, fields, writer_state)
+    pages = 0
+
+    async with ProbeEngine(headers={'User-Agent': conga_config.USER_AGENT}, concurrency=concurrency,
+                           **engine_options) as engine:
+        fetcher = PageFetcher(engine, base_url, object_type, page_size, auth=auth)
+        first = await fetcher.fetch(offset)
+        total = first.get('RecordCount') if isinstance(first, dict) else None
+        end = min(total, limit) if total is not None and limit is not None else (total if total is not None else limit)
+
+        # Pages are fetched `concurrency` ahead of the writer and written strictly in order
+        in_flight = {}
+        next_fetch = offset + page_size
+        body, done = first, False
+        try:
+            while not done:
+                while len(in_flight) < concurrency and total is not None and next_fetch < end:
+                    in_flight[next_fetch] = asyncio.create_task(fetcher.fetch(next_fetch))
+                    next_fetch += page_size
+
+                records = records_of(body)
+                if end is not None:
+                    records = records[:max(end - offset, 0)]
+                writer.write(records)
+                written += len(records)
+                pages += 1
+                offset += page_size
+                if progress:
+                    progress(written, end)
+
+                writer_state = writer.checkpoint()
+                if writer_state is not None:
+                    checkpoint.save({'settings': settings, 'next_offset': offset, 'records': written,
+                                     'writer': writer_state})
+
+                # A short page ends the export even when the total is unknown or overstated
+                done = (end is not None and offset >= end) or len(records_of(body)) < page_size
+                if not done:
+                    task = in_flight.pop(offset, None)
+                    body = await task if task else await fetcher.fetch(offset)
+        finally:
+            for task in in_flight.values():
+                task.cancel()
+            await asyncio.gather(*in_flight.values(), return_exceptions=True)
+
+        writer.close()
+    checkpoint.clear()
+    return {'records': written, 'pages': pages, 'requests': fetcher.requests, 'resumed_from': resumed_from}
+
+
+@app.command()
+def export(
+    object_type: str = typer.Argument(..., help="Conga object type, e.g. Account"),
+    output: Path = typer.Argument(..., help="output file (a directory for parquet)"),
+    fmt: Optional[Format] = typer.Option(None, '--format', help="default: from the output suffix"),
+    fields: Optional[str] = typer.Option(None, help="comma-separated fields to keep, in column order"),
+    page_size: int = typer.Option(DEFAULT_PAGE_SIZE, help="records per page request"),
+    concurrency: int = typer.Option(DEFAULT_CONCURRENCY, help="page requests in flight"),
+    limit: Optional[int] = typer.Option(None, help="stop after this many records"),
+    resume: bool = typer.Option(False, help="continue from the checkpoint of an interrupted export"),
+    base_url: str = typer.Option(conga_config.API_BASE_URL, help="API base URL (or a local mock_conga_api.py)"),
+    no_auth: bool = typer.Option(False, '--no-auth', help="skip the token (mock --no-auth)"),
+):
+    """Export every record of OBJECT_TYPE to NDJSON, CSV or Parquet."""
+    if fmt is None:
+        suffix = output.suffix.lstrip('.').lower()
+        fmt = {'json': Format.ndjson, 'jsonl': Format.ndjson}.get(suffix) or Format.__members__.get(suffix)
+        if fmt is None:
+            raise typer.BadParameter("can't tell the format from the output name; pass --format")
+    field_list = [f.strip() for f in fields.split(',') if f.strip()] if fields else None
+
+    def progress(written, total):
+        print(f"   {written}{f' / {total}' if total is not None else ''} records", end='\r')
+
+    print(f"📦 Exporting {object_type} to {output} ({fmt.value})")
+    started = time.perf_counter()
+    try:
+        stats = asyncio.run(export_records(
+            object_type, output, fmt, field_list, page_size, concurrency, limit, resume,
+            base_url, auth=not no_auth, progress=progress,
+        ))
+    except ExportError as exc:
+        print(f"\n❌ {exc}")
+        if not isinstance(exc.__cause__, TokenError):
+            print("   Run again with --resume to continue from the last checkpoint")
+        raise typer.Exit(1)
+    elapsed = time.perf_counter() - started
+    resumed = f", resumed at offset {stats['resumed_from']}" if stats['resumed_from'] else ''
+    print(f"\n✅ {stats['records']} records in {stats['pages']} pages, {elapsed:.2f}s "
+          f"({stats['records'] / elapsed:.0f} records/s, {stats['requests']} requests{resumed})")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Concurrent HTTP probe engine shared by the Conga test scripts
+
+Probes run over one pooled keep-alive client, so each host pays for its TLS
+handshake once instead of once per request. A concurrency cap, an optional
+per-host request rate and an overall deadline keep a sweep bounded: a full run
+takes roughly as long as its slowest single call.
+
+    results = run_probes([Probe(url) for url in urls], headers=headers, deadline=30)
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_TIMEOUT = 10.0
+
+
+@dataclass
+class Probe:
+    url: str
+    method: str = "GET"
+    label: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Optional[bytes] = None
+
+
+@dataclass
+class ProbeResult:
+    probe: Probe
+    status: Optional[int] = None
+    elapsed: float = 0.0
+    size: int = 0
+    text: str = ""
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and self.status < 400
+
+    def json(self):
+        """Parsed body, or None when it isn't JSON."""
+        try:
+            return json.loads(self.text)
+        except ValueError:
+            return None
+
+
+def describe_status(status: int) -> str:
+    """The icon-and-note wording the probe scripts print for an HTTP status."""
+    if status < 400:
+        return f"✅ {status}"
+    if status == 401:
+        return f"🔐 {status} (Auth required)"
+    if status == 403:
+        return f"🚫 {status} (Forbidden)"
+    if status == 404:
+        return f"❌ {status} (Not found)"
+    return f"⚠️  {status}"
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least 1/rate seconds apart."""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = {}
+
+    async def wait(self, host: str):
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class ProbeEngine:
+    """Runs probes concurrently over a shared httpx.AsyncClient.
+
+    Use as an async context manager so the connection pool is reused across
+    every `run` call and closed at the end.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host_rate: Optional[float] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.headers = headers or {}
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.rate_limiter = HostRateLimiter(per_host_rate)
+        self.transport = transport
+        self.client = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+
+    async def probe(self, probe: Probe) -> ProbeResult:
+        # Wait for the host's slot before taking a concurrency slot, so probes
+        # held back by the rate limit don't keep other hosts waiting
+        try:
+            host = urlsplit(probe.url).netloc
+        except ValueError as exc:
+            return ProbeResult(probe, error=f"Invalid URL: {exc}")
+        await self.rate_limiter.wait(host)
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(
+                    probe.method, probe.url, headers=probe.headers, content=probe.body,
+                )
+            except (httpx.HTTPError, httpx.InvalidURL) as exc:
+                return ProbeResult(probe, elapsed=time.perf_counter() - started, error=str(exc) or type(exc).__name__)
+            return ProbeResult(
+                probe,
+                status=response.status_code,
+                elapsed=time.perf_counter() - started,
+                size=len(response.content),
+                text=response.text,
+            )
+
+    async def run(self, probes: List[Probe], deadline: Optional[float] = None) -> List[ProbeResult]:
+        """Results in the same order as `probes`; anything unfinished at the deadline is an error."""
+        tasks = [asyncio.create_task(self.probe(probe)) for probe in probes]
+        if not tasks:
+            return []
+        await asyncio.wait(tasks, timeout=deadline)
+
+        results, unfinished = [], []
+        for probe, task in zip(probes, tasks):
+            if task.done():
+                results.append(task.result())
+            else:
+                task.cancel()
+                unfinished.append(task)
+                results.append(ProbeResult(probe, elapsed=deadline, error=f"Deadline of {deadline}s exceeded"))
+        await asyncio.gather(*unfinished, return_exceptions=True)
+        return results
+
+
+def run_probes(probes: List[Probe], deadline: Optional[float] = None, **engine_options) -> List[ProbeResult]:
+    """Blocking helper for scripts: run every probe on a fresh engine."""
+    async def run():
+        async with ProbeEngine(**engine_options) as engine:
+            return await engine.run(probes, deadline=deadline)
+
+    return asyncio.run(run())
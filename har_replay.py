@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Replays a Conga Inspector HAR capture against the local mock (or any Data API)
+
+Loads a HAR 1.2 file exported from the sidepanel's Network tab, keeps the Data
+API calls, maps their URLs onto --base-url and sends them again, either all at
+once under a concurrency cap or at the recorded pace (--speed). Each endpoint's
+replayed p50/p95 is reported next to the recorded timings. With --baseline
+(a previous --json report) the run fails when an endpoint's p95 grew by more
+than --max-regression percent.
+
+Request bodies are not captured by the inspector, so only GETs are replayed
+unless --methods says otherwise.
+
+    python mock_conga_api.py --no-auth --latency-ms 20 &
+    python har_replay.py capture.har --base-url http://127.0.0.1:8081/api/data --no-auth --json baseline.json
+    python har_replay.py capture.har --base-url http://127.0.0.1:8081/api/data --no-auth --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import conga_config
+from conga_auth import get_token
+from conga_probe import Probe, ProbeEngine, ProbeResult
+from load_test import percentile
+
+DEFAULT_API_PREFIX = '/api/data'
+
+# Same id patterns the sidepanel's endpoint summary collapses
+ID_SEGMENT = re.compile(r'^(\d+|[0-9a-f-]{16,}|[A-Za-z]{2,4}\d{6,})$', re.IGNORECASE)
+
+
+class HarRequest(NamedTuple):
+    offset: float  # seconds after the first captured request
+    method: str
+    path: str  # relative to the API prefix, query string included
+    endpoint: str
+    status: int  # 0 when the captured call failed without a response
+    time_ms: float
+
+
+def endpoint_of(method: str, path: str) -> str:
+    segments = path.split('?', 1)[0].split('/')
+    return f"{method} " + '/'.join('{id}' if ID_SEGMENT.match(s) else s for s in segments)
+
+
+def parse_started(value: str) -> float:
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def load_har(path: str, api_prefix: str = DEFAULT_API_PREFIX, methods=('GET',)) -> List[HarRequest]:
+    """Data API requests from a HAR file, in the order they were started."""
+    with open(path) as f:
+        entries = json.load(f)['log']['entries']
+
+    captured = []
+    for entry in entries:
+        request = entry['request']
+        method = request['method'].upper()
+        url = urlsplit(request['url'])
+        if method not in methods or api_prefix not in url.path:
+            continue
+        relative = url.path.split(api_prefix, 1)[1] + (f"?{url.query}" if url.query else '')
+        captured.append((parse_started(entry['startedDateTime']), method, relative, entry))
+    captured.sort(key=lambda item: item[0])
+
+    first = captured[0][0] if captured else 0.0
+    return [
+        HarRequest(started - first, method, relative, endpoint_of(method, relative),
+                   entry['response']['status'], float(entry['time']))
+        for started, method, relative, entry in captured
+    ]
+
+
+async def replay(
+    requests: List[HarRequest],
+    base_url: str,
+    speed: float = 0,
+    headers: Optional[Dict[str, str]] = None,
+    **engine_options,
+) -> List[ProbeResult]:
+    """Send every request; with speed > 0 each starts at its recorded offset / speed."""
+    probes = [
+        Probe(base_url.rstrip('/') + request.path, method=request.method, label=request.endpoint)
+        for request in requests
+    ]
+    async with ProbeEngine(headers=headers, **engine_options) as engine:
+        if speed <= 0:
+            return await engine.run(probes)
+
+        started = time.perf_counter()
+
+        async def scheduled(request, probe):
+            delay = request.offset / speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return await engine.probe(probe)
+
+        return list(await asyncio.gather(*(scheduled(r, p) for r, p in zip(requests, probes))))
+
+
+def failed(request: HarRequest, result: ProbeResult) -> bool:
+    """A replay failure for a call that succeeded when it was captured."""
+    return not result.ok and 0 < request.status < 400
+
+
+def compare(requests: List[HarRequest], results: List[ProbeResult], baseline: Optional[dict] = None,
+            max_regression: float = 25.0) -> dict:
+    """Per-endpoint recorded vs replayed latency, status mismatches and p95 regressions."""
+    groups = defaultdict(list)
+    for request, result in zip(requests, results):
+        groups[request.endpoint].append((request, result))
+
+    baseline_endpoints = (baseline or {}).get('endpoints', {})
+    endpoints = {}
+    for endpoint, pairs in groups.items():
+        recorded = sorted(request.time_ms for request, _ in pairs)
+        replayed = sorted(result.elapsed * 1000 for _, result in pairs)
+        stats = {
+            'requests': len(pairs),
+            'errors': sum(failed(request, result) for request, result in pairs),
+            'status_mismatches': sum((result.status or 0) != request.status for request, result in pairs),
+            'recorded_p50_ms': percentile(recorded, 50),
+            'recorded_p95_ms': percentile(recorded, 95),
+            'p50_ms': percentile(replayed, 50),
+            'p95_ms': percentile(replayed, 95),
+        }
+        previous = baseline_endpoints.get(endpoint)
+        if previous and previous['p95_ms'] > 0:
+            change = (stats['p95_ms'] / previous['p95_ms'] - 1) * 100
+            stats['baseline_p95_ms'] = previous['p95_ms']
+            stats['p95_change_pct'] = change
+            stats['regressed'] = change > max_regression
+        endpoints[endpoint] = stats
+
+    return {
+        'requests': len(results),
+        'errors': sum(stats['errors'] for stats in endpoints.values()),
+        'status_mismatches': sum(stats['status_mismatches'] for stats in endpoints.values()),
+        'regressions': sorted(name for name, stats in endpoints.items() if stats.get('regressed')),
+        'max_regression_pct': max_regression,
+        'endpoints': endpoints,
+    }
+
+
+def print_report(report: dict):
+    print(f"{'endpoint':<44} {'reqs':>6} {'errors':>6} {'rec p95':>8} {'p50':>8} {'p95':>8} {'vs base':>8}")
+    print("-" * 94)
+    for name, stats in sorted(report['endpoints'].items(), key=lambda item: -item[1]['p95_ms']):
+        change = f"{stats['p95_change_pct']:+.0f}%" if 'p95_change_pct' in stats else '–'
+        flag = ' ⚠️' if stats.get('regressed') else ''
+        print(
+            f"{name[:44]:<44} {stats['requests']:>6} {stats['errors']:>6} {stats['recorded_p95_ms']:>8.1f} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {change:>8}{flag}"
+        )
+    print("   (latencies in ms)")
+    if report['status_mismatches']:
+        print(f"⚠️  {report['status_mismatches']} responses differ in status from the capture")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Conga Inspector HAR capture")
+    parser.add_argument('har', help="HAR file exported from the sidepanel Network tab")
+    parser.add_argument('--base-url', help="Data API to replay against (default: CONGA_API_BASE_URL)")
+    parser.add_argument('--api-prefix', default=DEFAULT_API_PREFIX, help="path the captured URLs are relative to")
+    parser.add_argument('--methods', default='GET', help="comma-separated methods to replay")
+    parser.add_argument('--speed', type=float, default=0,
+                        help="replay at the recorded pace times this factor (0: as fast as possible)")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--no-auth', action='store_true', help="skip the token (mock --no-auth)")
+    parser.add_argument('--baseline', help="earlier --json report to compare p95 latency with")
+    parser.add_argument('--max-regression', type=float, default=25.0, help="allowed p95 increase in percent")
+    parser.add_argument('--json', help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    methods = tuple(method.strip().upper() for method in args.methods.split(',') if method.strip())
+    requests = load_har(args.har, args.api_prefix, methods)
+    if not requests:
+        print(f"❌ No {'/'.join(methods)} requests under {args.api_prefix} in {args.har}")
+        return 1
+
+    headers = {'User-Agent': conga_config.USER_AGENT}
+    if not args.no_auth:
+        token = get_token()
+        if not token:
+            print("❌ Failed to get access token")
+            return 1
+        headers['Authorization'] = f'Bearer {token}'
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    base_url = args.base_url or conga_config.API_BASE_URL
+    pace = f"at {args.speed:g}x the recorded pace" if args.speed > 0 else f"with {args.concurrency} in flight"
+    print(f"🔁 Replaying {len(requests)} requests from {args.har} against {base_url} {pace}")
+    results = asyncio.run(replay(
+        requests, base_url, speed=args.speed, headers=headers,
+        concurrency=args.concurrency, timeout=args.timeout,
+    ))
+    report = compare(requests, results, baseline, args.max_regression)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 JSON report: {args.json}")
+    if report['regressions']:
+        print(f"❌ p95 regressed more than {args.max_regression:g}% on: {', '.join(report['regressions'])}")
+        return 1
+    return 0 if report['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
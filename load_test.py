@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Load generator for the Conga Data API (or the local mock) and the FastAPI backend
+
+Replays a scenario list against a target and reports throughput, errors and
+p50/p95/p99 latency, overall, per scenario and per second:
+
+    open loop   --rps N          requests start on a fixed schedule whether or
+                                 not earlier ones finished; latency is measured
+                                 from the scheduled start, so queueing counts
+    closed loop --concurrency N  N workers each send their next request as soon
+                                 as the previous one completes
+
+The conga target replays TEST_SCENARIOS from test_final_extension.py; the
+backend target exercises backend/server.py.
+
+    python load_test.py --target conga --mode open --rps 50 --duration 30 --html report.html
+    python load_test.py --target backend --base-url http://localhost:8001 --mode closed --concurrency 20
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import math
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+import conga_config
+from conga_auth import get_token
+from conga_probe import Probe, ProbeEngine
+from test_final_extension import TEST_SCENARIOS
+
+BACKEND_SCENARIOS = [
+    {
+        'name': 'API root',
+        'endpoint': '/api/',
+        'method': 'GET',
+        'description': 'Backend hello endpoint'
+    },
+    {
+        'name': 'List status checks',
+        'endpoint': '/api/status?limit=100',
+        'method': 'GET',
+        'description': 'First page of status checks'
+    },
+    {
+        'name': 'Status summary',
+        'endpoint': '/api/status/summary',
+        'method': 'GET',
+        'description': 'Aggregated status check counts'
+    },
+    {
+        'name': 'Create status check',
+        'endpoint': '/api/status',
+        'method': 'POST',
+        'body': {'client_name': 'load-test'},
+        'description': 'Single status check write'
+    },
+]
+
+DEFAULT_BACKEND_URL = 'http://localhost:8001'
+
+
+class Sample(NamedTuple):
+    offset: float  # scheduled start, seconds since the run began
+    latency: Optional[float]  # None when the request was never sent
+    scenario: str
+    status: Optional[int]
+    error: Optional[str]
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or self.status is None or self.status >= 400
+
+    @property
+    def rejected(self) -> bool:
+        return self.latency is None
+
+
+def latencies_of(samples: List[Sample]) -> List[float]:
+    # Rejected requests have no latency; counting them as 0 would improve the
+    # percentiles the more the generator is overloaded
+    return sorted(s.latency for s in samples if not s.rejected)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(samples: List[Sample], duration: float) -> dict:
+    latencies = latencies_of(samples)
+    errors = sum(s.failed for s in samples)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'rejected': sum(s.rejected for s in samples),
+        'error_rate': errors / len(samples) if samples else 0.0,
+        'throughput_rps': len(samples) / duration if duration else 0.0,
+        'latency_ms': {
+            'mean': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            'p50': percentile(latencies, 50) * 1000,
+            'p95': percentile(latencies, 95) * 1000,
+            'p99': percentile(latencies, 99) * 1000,
+            'max': latencies[-1] * 1000 if latencies else 0.0,
+        },
+        'status_codes': dict(Counter(str(s.status) if s.status else 'error' for s in samples)),
+    }
+
+
+def timeline(samples: List[Sample], bucket_seconds: float = 1.0) -> List[dict]:
+    """Requests, errors and latency percentiles per time bucket, by scheduled start."""
+    buckets = defaultdict(list)
+    for sample in samples:
+        buckets[int(sample.offset // bucket_seconds)].append(sample)
+    rows = []
+    for index in range(max(buckets) + 1 if buckets else 0):
+        bucket = buckets.get(index, [])
+        latencies = latencies_of(bucket)
+        rows.append({
+            'second': round(index * bucket_seconds, 3),
+            'requests': len(bucket),
+            'errors': sum(s.failed for s in bucket),
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+        })
+    return rows
+
+
+class LoadRunner:
+    def __init__(self, engine: ProbeEngine, scenarios: List[dict], base_url: str):
+        self.engine = engine
+        self.probes = [
+            Probe(
+                base_url.rstrip('/') + scenario['endpoint'],
+                method=scenario.get('method', 'GET'),
+                label=scenario['name'],
+                headers={'Content-Type': 'application/json'} if 'body' in scenario else {},
+                body=json.dumps(scenario['body']).encode() if 'body' in scenario else None,
+            )
+            for scenario in scenarios
+        ]
+        self.samples: List[Sample] = []
+        self._next = 0
+        self._started = 0.0
+
+    def next_probe(self) -> Probe:
+        # Round-robin, so every scenario gets the same share of the load
+        probe = self.probes[self._next % len(self.probes)]
+        self._next += 1
+        return probe
+
+    async def send(self, probe: Probe, scheduled: float):
+        result = await self.engine.probe(probe)
+        self.samples.append(Sample(
+            scheduled - self._started, time.perf_counter() - scheduled, probe.label, result.status, result.error,
+        ))
+
+    async def open_loop(self, rps: float, duration: float, max_in_flight: int):
+        self._started = time.perf_counter()
+        interval = 1.0 / rps
+        in_flight = set()
+        for i in range(int(duration * rps)):
+            scheduled = self._started + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            probe = self.next_probe()
+            if len(in_flight) >= max_in_flight:
+                # The generator itself is saturated; count it rather than silently slowing the schedule
+                self.samples.append(Sample(scheduled - self._started, None, probe.label, None, 'max in-flight reached'))
+                continue
+            task = asyncio.create_task(self.send(probe, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        await asyncio.gather(*in_flight)
+
+    async def closed_loop(self, concurrency: int, duration: float):
+        self._started = time.perf_counter()
+        deadline = self._started + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self.send(self.next_probe(), time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run_load(
+    scenarios: List[dict],
+    base_url: str,
+    mode: str = 'closed',
+    rps: float = 10,
+    concurrency: int = 10,
+    duration: float = 10,
+    warmup: float = 0,
+    max_in_flight: int = 1000,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 10,
+    **engine_options,
+) -> dict:
+    """Drive the target and return the report (see write_html for its rendering)."""
+    engine_concurrency = max_in_flight if mode == 'open' else concurrency
+    async with ProbeEngine(headers=headers, concurrency=engine_concurrency, timeout=timeout, **engine_options) as engine:
+        runner = LoadRunner(engine, scenarios, base_url)
+        started = time.perf_counter()
+        if mode == 'open':
+            await runner.open_loop(rps, duration + warmup, max_in_flight)
+        else:
+            await runner.closed_loop(concurrency, duration + warmup)
+        wall_time = time.perf_counter() - started
+
+    samples = [s for s in runner.samples if s.offset >= warmup]
+    measured = max(wall_time - warmup, 1e-9)
+    by_scenario = defaultdict(list)
+    for sample in samples:
+        by_scenario[sample.scenario].append(sample)
+    return {
+        'config': {
+            'base_url': base_url,
+            'mode': mode,
+            'rps': rps if mode == 'open' else None,
+            'concurrency': concurrency if mode == 'closed' else None,
+            'duration_s': duration,
+            'warmup_s': warmup,
+        },
+        'overall': summarize(samples, measured),
+        'scenarios': {name: summarize(group, measured) for name, group in by_scenario.items()},
+        'timeline': timeline([s._replace(offset=s.offset - warmup) for s in samples]),
+    }
+
+
+def print_report(report: dict):
+    print(f"{'scenario':<28} {'reqs':>7} {'errors':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    print("-" * 92)
+    rows = list(report['scenarios'].items()) + [('TOTAL', report['overall'])]
+    for name, stats in rows:
+        latency = stats['latency_ms']
+        print(
+            f"{name[:28]:<28} {stats['requests']:>7} {stats['errors']:>7} {stats['throughput_rps']:>8.1f} "
+            f"{latency['p50']:>8.1f} {latency['p95']:>8.1f} {latency['p99']:>8.1f} {latency['max']:>8.1f}"
+        )
+    print("   (latencies in ms)")
+    if report['overall']['rejected']:
+        print(f"⚠️  {report['overall']['rejected']} requests were not sent: max in-flight reached "
+              "(counted as errors, left out of the latencies)")
+
+
+def svg_chart(rows: List[dict], keys: List[str], width: int = 720, height: int = 200) -> str:
+    """Inline SVG line chart of the timeline, one polyline per key."""
+    if not rows:
+        return '<p>No samples.</p>'
+    colors = ['#2563eb', '#f59e0b', '#dc2626', '#16a34a']
+    top = max(max(row[key] for row in rows) for key in keys) or 1
+    step = width / max(len(rows) - 1, 1)
+    parts = [f'<svg width="{width}" height="{height + 20}" xmlns="http://www.w3.org/2000/svg">']
+    for color, key in zip(colors, keys):
+        points = ' '.join(f"{i * step:.1f},{height - row[key] / top * height:.1f}" for i, row in enumerate(rows))
+        parts.append(f'<polyline fill="none" stroke="{color}" stroke-width="2" points="{points}"/>')
+    legend = ' '.join(f'<tspan fill="{color}">■ {key}</tspan>' for color, key in zip(colors, keys))
+    parts.append(f'<text x="0" y="{height + 16}" font-size="12">{legend} (max {top:.1f})</text></svg>')
+    return ''.join(parts)
+
+
+def write_html(report: dict, path: str):
+    rows = list(report['scenarios'].items()) + [('TOTAL', report['overall'])]
+    table = ''.join(
+        f"<tr><td>{html.escape(name)}</td><td>{s['requests']}</td><td>{s['errors']}</td>"
+        f"<td>{s['throughput_rps']:.1f}</td><td>{s['latency_ms']['p50']:.1f}</td><td>{s['latency_ms']['p95']:.1f}</td>"
+        f"<td>{s['latency_ms']['p99']:.1f}</td><td>{s['latency_ms']['max']:.1f}</td></tr>"
+        for name, s in rows
+    )
+    config = ', '.join(f"{key}={value}" for key, value in report['config'].items() if value is not None)
+    document = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Load test report</title>
+<style>body{{font-family:sans-serif;margin:24px}}table{{border-collapse:collapse}}
+td,th{{border:1px solid #ddd;padding:4px 10px;text-align:right}}td:first-child{{text-align:left}}</style></head>
+<body><h1>Load test report</h1><p>{html.escape(config)}</p>
+<table><tr><th>scenario</th><th>requests</th><th>errors</th><th>rps</th><th>p50 ms</th><th>p95 ms</th><th>p99 ms</th><th>max ms</th></tr>
+{table}</table>
+<h2>Throughput per second</h2>{svg_chart(report['timeline'], ['requests', 'errors'])}
+<h2>Latency per second (ms)</h2>{svg_chart(report['timeline'], ['p50_ms', 'p95_ms', 'p99_ms'])}
+</body></html>
+"""
+    with open(path, 'w') as f:
+        f.write(document)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Conga API or the backend")
+    parser.add_argument('--target', choices=['conga', 'backend'], default='conga')
+    parser.add_argument('--base-url', help=f"default: CONGA_API_BASE_URL or {DEFAULT_BACKEND_URL} for the backend")
+    parser.add_argument('--mode', choices=['open', 'closed'], default='closed')
+    parser.add_argument('--rps', type=float, default=10, help="open loop: request starts per second")
+    parser.add_argument('--concurrency', type=int, default=10, help="closed loop: number of workers")
+    parser.add_argument('--duration', type=float, default=10, help="measured seconds")
+    parser.add_argument('--warmup', type=float, default=0, help="seconds of load before measuring")
+    parser.add_argument('--max-in-flight', type=int, default=1000, help="open loop: cap on outstanding requests")
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--no-auth', action='store_true', help="conga target: skip the token (mock --no-auth)")
+    parser.add_argument('--json', help="write the report to this JSON file")
+    parser.add_argument('--html', help="write the report to this HTML file")
+    args = parser.parse_args()
+
+    headers = {'User-Agent': conga_config.USER_AGENT}
+    if args.target == 'conga':
+        scenarios, base_url = TEST_SCENARIOS, args.base_url or conga_config.API_BASE_URL
+        if not args.no_auth:
+            token = get_token()
+            if not token:
+                print("❌ Failed to get access token")
+                return 1
+            headers['Authorization'] = f'Bearer {token}'
+    else:
+        scenarios, base_url = BACKEND_SCENARIOS, args.base_url or DEFAULT_BACKEND_URL
+
+    load = f"{args.rps:g} req/s" if args.mode == 'open' else f"{args.concurrency} workers"
+    print(f"🔥 {args.mode.capitalize()}-loop load on {base_url}: {load} for {args.duration:g}s (+{args.warmup:g}s warmup)")
+    report = asyncio.run(run_load(
+        scenarios, base_url, mode=args.mode, rps=args.rps, concurrency=args.concurrency,
+        duration=args.duration, warmup=args.warmup, max_in_flight=args.max_in_flight,
+        headers=headers, timeout=args.timeout,
+    ))
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 JSON report: {args.json}")
+    if args.html:
+        write_html(report, args.html)
+        print(f"📄 HTML report: {args.html}")
+    return 0 if report['overall']['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
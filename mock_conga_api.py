@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Conga login and Data APIs
+
+Gives the Python test scripts a deterministic, offline target:
+
+    POST /api/v1/auth/connect/token          client-credentials tokens
+    GET  /api/data/swagger/v1/swagger.json   the replayed spec (and a /swagger page)
+    GET  /api/data/v1/objects                object types
+    GET  /api/data/v1/objects/{Type}         paged records (limit/offset, modifiedSince, orderBy)
+    GET  /api/data/v1/objects/{Type}/summary record count and fields
+    GET  /api/data/v1/objects/{Type}/{id}    one record
+    PATCH /api/data/v1/objects/{Type}/{id}   change fields and bump ModifiedDate
+
+Any other GET operation in the spec is answered with synthetic records, and a
+path parameter is only accepted when it names a record of its parent
+collection, like the real API. Records are computed from their position rather
+than stored, so --records can be in the millions. --latency-ms/--jitter-ms
+slow every API response and --error-rate fails a share of them.
+
+    python mock_conga_api.py [--port 8081] [--records 100000] [--latency-ms 20] [--error-rate 0.01]
+    export CONGA_TOKEN_URL=http://127.0.0.1:8081/api/v1/auth/connect/token
+    export CONGA_API_BASE_URL=http://127.0.0.1:8081/api/data
+    python test_final_extension.py
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi import Body, FastAPI, Form, Request
+from fastapi.responses import HTMLResponse, JSONResponse
+
+import conga_config
+
+BASE_PATH = "/api/data"
+TOKEN_PATH = "/api/v1/auth/connect/token"
+RECORDS_PER_COLLECTION = 3
+DEFAULT_TYPES = ("Account", "Contact", "Opportunity", "Lead", "Case")
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 2000
+
+
+def path_param(name: str) -> dict:
+    return {"name": name, "in": "path", "required": True, "type": "string"}
+
+
+PAGING_PARAMS = [
+    {"name": "limit", "in": "query", "type": "integer"},
+    {"name": "offset", "in": "query", "type": "integer"},
+]
+
+# Used when no --spec is given: the shape of the Conga Data API the scripts probe
+SAMPLE_SPEC = {
+    "swagger": "2.0",
+    "info": {"title": "Conga Data API (mock)", "version": "v1"},
+    "basePath": BASE_PATH,
+    "paths": {
+        "/health": {"get": {"operationId": "getHealth"}},
+        "/version": {"get": {"operationId": "getVersion"}},
+        "/metadata": {"get": {"operationId": "listMetadata"}},
+        "/v1/currencies": {"get": {"operationId": "listCurrencies"}},
+        "/v1/objects": {"get": {"operationId": "listObjectTypes"}},
+        "/v1/objects/{Type}": {
+            "get": {"operationId": "listRecords", "parameters": [path_param("Type")] + PAGING_PARAMS},
+        },
+        "/v1/objects/{Type}/summary": {
+            "get": {"operationId": "getObjectSummary", "parameters": [path_param("Type")]},
+        },
+        "/v1/objects/{Type}/{id}": {
+            "get": {"operationId": "getRecord", "parameters": [path_param("Type"), path_param("id")]},
+        },
+    },
+}
+
+FIELDS = [
+    {"Name": "Id", "Type": "string"},
+    {"Name": "Name", "Type": "string"},
+    {"Name": "Status", "Type": "picklist"},
+    {"Name": "Amount", "Type": "decimal"},
+    {"Name": "CreatedDate", "Type": "datetime"},
+    {"Name": "ModifiedDate", "Type": "datetime"},
+]
+STATUSES = ("Draft", "Active", "Pending", "Closed")
+EPOCH = datetime(2024, 1, 1)
+RECORD_SPACING = timedelta(seconds=7)
+MODIFIED_AFTER = timedelta(hours=1)
+
+
+@dataclass
+class MockSettings:
+    records: int = 1000
+    types: tuple = DEFAULT_TYPES
+    latency_ms: float = 0
+    jitter_ms: float = 0
+    error_rate: float = 0
+    error_status: int = 503
+    token_ttl: int = 3600
+    require_auth: bool = True
+    seed: int = 0
+
+
+class Route:
+    def __init__(self, template: str):
+        self.template = template
+        self.segments = template.strip("/").split("/")
+        self.param_names = [s[1:-1] for s in self.segments if s.startswith("{") and s.endswith("}")]
+        pattern = "/".join("([^/]+)" if s.startswith("{") else re.escape(s) for s in self.segments)
+        self.regex = re.compile(f"^/{pattern}$")
+
+    @property
+    def specificity(self):
+        # Literal segments win over parameters: /objects/count before /objects/{objectName}
+        return tuple(0 if s.startswith("{") else 1 for s in self.segments)
+
+
+def make_records(concrete_path: str) -> List[dict]:
+    """The records a replayed collection path returns; stable across calls and processes."""
+    collection = concrete_path.rstrip("/").rsplit("/", 1)[-1].rstrip("s").capitalize() or "Item"
+    return [
+        {"Id": f"{concrete_path.strip('/').replace('/', '-')}-{i}", "Name": f"{collection}{i}"}
+        for i in range(1, RECORDS_PER_COLLECTION + 1)
+    ]
+
+
+def record_id(object_type: str, position: int) -> str:
+    return f"{object_type[:3].upper()}{position:09d}"
+
+
+def record_position(object_type: str, record: str, records: int) -> Optional[int]:
+    match = re.fullmatch(r"[A-Z]{1,3}(\d{9})", record)
+    if match is None or record_id(object_type, int(match.group(1))) != record:
+        return None
+    position = int(match.group(1))
+    return position if 1 <= position <= records else None
+
+
+def format_date(value: datetime) -> str:
+    return f"{value:%Y-%m-%dT%H:%M:%S}.{value.microsecond // 1000:03d}Z"
+
+
+def parse_date(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def make_record(object_type: str, position: int) -> dict:
+    """Record number `position` of a type, derived from the position alone.
+
+    ModifiedDate grows with the position, so a modifiedSince filter is a bisect.
+    """
+    created = EPOCH + RECORD_SPACING * position
+    return {
+        "Id": record_id(object_type, position),
+        "Name": f"{object_type} {position}",
+        "Status": STATUSES[position % len(STATUSES)],
+        "Amount": round((position * 7919) % 100000 / 100, 2),
+        "CreatedDate": format_date(created),
+        "ModifiedDate": format_date(created + MODIFIED_AFTER),
+    }
+
+
+def first_modified_position(since: datetime) -> int:
+    """The first position whose generated ModifiedDate is at or after `since`."""
+    return max(math.ceil((since - EPOCH - MODIFIED_AFTER) / RECORD_SPACING), 1)
+
+
+def create_app(spec: Optional[dict] = None, settings: Optional[MockSettings] = None) -> FastAPI:
+    spec = spec or SAMPLE_SPEC
+    settings = settings or MockSettings()
+    types = {name.lower(): name for name in settings.types}
+    chaos = random.Random(settings.seed)
+    routes = sorted(
+        (Route(path) for path, item in spec.get("paths", {}).items() if "get" in item),
+        key=lambda route: route.specificity,
+        reverse=True,
+    )
+    templates = {route.template for route in routes}
+    # Records changed through PATCH, by type and position; everything else is generated
+    edits = {name: {} for name in settings.types}
+    app = FastAPI(title="Mock Conga API")
+    app.state.settings = settings
+
+    @app.post(TOKEN_PATH)
+    async def token(
+        grant_type: str = Form(...),
+        client_id: str = Form(...),
+        client_secret: str = Form(...),
+        scope: Optional[str] = Form(None),
+    ):
+        if grant_type != "client_credentials":
+            return JSONResponse({"error": "unsupported_grant_type"}, status_code=400)
+        if (client_id, client_secret) != (conga_config.CLIENT_ID, conga_config.CLIENT_SECRET):
+            return JSONResponse({"error": "invalid_client"}, status_code=401)
+        # The expiry is part of the token, so tokens cached by a client stay valid across mock restarts
+        expires_at = int(time.time()) + settings.token_ttl
+        return {
+            "access_token": f"mock.{expires_at}.{secrets.token_urlsafe(48)}",
+            "token_type": "Bearer",
+            "expires_in": settings.token_ttl,
+        }
+
+    @app.middleware("http")
+    async def simulate_network(request: Request, call_next):
+        if not request.url.path.startswith(BASE_PATH):
+            return await call_next(request)
+        delay = settings.latency_ms + chaos.uniform(0, settings.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if settings.require_auth and not valid_token(request.headers.get("authorization", "")):
+            return JSONResponse({"error": "invalid_token"}, status_code=401)
+        if settings.error_rate and chaos.random() < settings.error_rate:
+            return JSONResponse({"error": "Injected failure"}, status_code=settings.error_status)
+        return await call_next(request)
+
+    @app.get(f"{BASE_PATH}/swagger/v1/swagger.json")
+    async def swagger():
+        return spec
+
+    @app.get(f"{BASE_PATH}/swagger", response_class=HTMLResponse)
+    async def swagger_ui():
+        return '<html><body><a href="swagger/v1/swagger.json">swagger.json</a></body></html>'
+
+    @app.get(f"{BASE_PATH}/v1/objects")
+    async def object_types():
+        return [{"Name": name, "RecordCount": settings.records} for name in settings.types]
+
+    def current_record(object_type: str, position: int) -> dict:
+        return edits[object_type].get(position) or make_record(object_type, position)
+
+    def modified_since(object_type: str, since: datetime, offset: int, limit: int):
+        """A page of records modified at or after `since`, oldest first, and the total count.
+
+        Generated records come first, in position order, then edited records by
+        ModifiedDate; edits are stamped with the current time, which is later
+        than any generated ModifiedDate.
+        """
+        first = first_modified_position(since)
+        moved = sorted(p for p in edits[object_type] if p >= first)
+        generated = max(settings.records - first + 1, 0) - len(moved)
+        edited = sorted(
+            (r for r in edits[object_type].values() if parse_date(r["ModifiedDate"]) >= since),
+            key=lambda r: (r["ModifiedDate"], r["Id"]),
+        )
+        page = []
+        for index in range(offset, min(offset + limit, generated + len(edited))):
+            if index >= generated:
+                page.append(edited[index - generated])
+                continue
+            position = first + index
+            for skipped in moved:
+                if skipped > position:
+                    break
+                position += 1
+            page.append(make_record(object_type, position))
+        return page, generated + len(edited)
+
+    @app.get(BASE_PATH + "/v1/objects/{object_type}")
+    async def list_records(
+        object_type: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        offset: int = 0,
+        modifiedSince: Optional[str] = None,
+        orderBy: Optional[str] = None,
+    ):
+        object_type = types.get(object_type.lower())
+        if object_type is None:
+            return JSONResponse({"error": "Unknown object type"}, status_code=404)
+        if limit < 1 or offset < 0:
+            return JSONResponse({"error": "limit must be positive and offset non-negative"}, status_code=400)
+        # The only sort the mock knows is the one a modifiedSince filter already returns
+        if orderBy and " ".join(orderBy.replace(",", " , ").split()).upper() != "MODIFIEDDATE ASC , ID ASC":
+            return JSONResponse({"error": "orderBy supports only 'ModifiedDate ASC, Id ASC'"}, status_code=400)
+        limit = min(limit, MAX_PAGE_SIZE)
+        if modifiedSince or orderBy:
+            try:
+                since = parse_date(modifiedSince) if modifiedSince else EPOCH
+            except ValueError:
+                return JSONResponse({"error": "modifiedSince must be an ISO 8601 date"}, status_code=400)
+            data, total = modified_since(object_type, since, offset, limit)
+        else:
+            end = min(offset + limit, settings.records)
+            data = [current_record(object_type, position) for position in range(offset + 1, end + 1)]
+            total = settings.records
+        return {"Data": data, "RecordCount": total, "Limit": limit, "Offset": offset}
+
+    @app.get(BASE_PATH + "/v1/objects/{object_type}/summary")
+    async def summary(object_type: str):
+        object_type = types.get(object_type.lower())
+        if object_type is None:
+            return JSONResponse({"error": "Unknown object type"}, status_code=404)
+        return {"ObjectName": object_type, "RecordCount": settings.records, "Fields": FIELDS}
+
+    @app.get(BASE_PATH + "/v1/objects/{object_type}/{record}")
+    async def get_record(object_type: str, record: str):
+        object_type = types.get(object_type.lower())
+        position = record_position(object_type, record, settings.records) if object_type else None
+        if position is None:
+            return JSONResponse({"error": "Record not found"}, status_code=404)
+        return current_record(object_type, position)
+
+    @app.patch(BASE_PATH + "/v1/objects/{object_type}/{record}")
+    async def update_record(object_type: str, record: str, changes: dict = Body(...)):
+        object_type = types.get(object_type.lower())
+        position = record_position(object_type, record, settings.records) if object_type else None
+        if position is None:
+            return JSONResponse({"error": "Record not found"}, status_code=404)
+        changes = {key: value for key, value in changes.items() if key not in ("Id", "CreatedDate", "ModifiedDate")}
+        updated = {**current_record(object_type, position), **changes, "ModifiedDate": format_date(datetime.utcnow())}
+        edits[object_type][position] = updated
+        return updated
+
+    @app.get(BASE_PATH + "/{path:path}")
+    async def replay(path: str):
+        concrete = "/" + path.strip("/")
+        for route in routes:
+            match = route.regex.match(concrete)
+            if match:
+                break
+        else:
+            return JSONResponse({"error": f"No operation for GET {concrete}"}, status_code=404)
+
+        # Each parameter must name a record from the collection right above it
+        values = dict(zip(route.param_names, match.groups()))
+        for i, segment in enumerate(route.segments):
+            if not segment.startswith("{"):
+                continue
+            parent_template = "/" + "/".join(route.segments[:i])
+            if parent_template not in templates:
+                continue
+            parent = "/" + "/".join(concrete.strip("/").split("/")[:i])
+            value = values[segment[1:-1]]
+            if not any(value in (record["Id"], record["Name"]) for record in make_records(parent)):
+                return JSONResponse({"error": f"{segment[1:-1]} '{value}' not found"}, status_code=404)
+
+        if route.param_names and route.segments[-1].startswith("{"):
+            return {"operation": route.template, **values, "Id": values[route.param_names[-1]]}
+        return make_records(concrete)
+
+    return app
+
+
+def valid_token(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(" ")
+    parts = token.split(".")
+    if scheme.lower() != "bearer" or len(parts) != 3 or parts[0] != "mock" or not parts[1].isdigit():
+        return False
+    return int(parts[1]) > time.time()
+
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Conga login and Data API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--spec", help="swagger.json to replay (default: built-in sample spec)")
+    parser.add_argument("--records", type=int, default=1000, help="records per object type")
+    parser.add_argument("--types", nargs="+", default=list(DEFAULT_TYPES), help="object types to serve")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every API response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="extra random delay, up to this much")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of API responses that fail (0-1)")
+    parser.add_argument("--error-status", type=int, default=503, help="status code of injected failures")
+    parser.add_argument("--token-ttl", type=int, default=3600, help="token lifetime in seconds")
+    parser.add_argument("--no-auth", action="store_true", help="serve API calls without a bearer token")
+    parser.add_argument("--seed", type=int, default=0, help="seed for jitter and error injection")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    spec = None
+    if args.spec:
+        with open(args.spec) as f:
+            spec = json.load(f)
+    settings = MockSettings(
+        records=args.records,
+        types=tuple(args.types),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        token_ttl=args.token_ttl,
+        require_auth=not args.no_auth,
+        seed=args.seed,
+    )
+    root = f"http://{args.host}:{args.port}"
+    print(f"🧪 Mock Conga API on {root}")
+    print(f"   export CONGA_TOKEN_URL={root}{TOKEN_PATH}")
+    print(f"   export CONGA_API_BASE_URL={root}{BASE_PATH}")
+    uvicorn.run(create_app(spec, settings), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Local cache of the Conga Swagger/OpenAPI spec with a pre-parsed path index
+
+The spec is revalidated with If-None-Match / If-Modified-Since, so an unchanged
+spec costs one 304 and no download. What gets stored is not the JSON but a
+pickled SpecIndex of paths, methods and parameters; answering "does this path
+and method exist" or "which paths live under /objects" is a dict lookup or a
+bisect over sorted paths, with no JSON parse.
+
+    index = SwaggerCache(headers={'Authorization': f'Bearer {token}'}).load()
+    index.has('/objects', 'GET')
+    index.under('/objects/')
+
+CONGA_SWAGGER_CACHE sets the cache directory and CONGA_SWAGGER_MAX_AGE how
+many seconds a cached spec is trusted before it is revalidated.
+"""
+
+import bisect
+import json
+import os
+import pickle
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import requests
+
+import conga_config
+
+SPEC_URL = f"{conga_config.API_BASE_URL}/swagger/v1/swagger.json"
+DEFAULT_CACHE_DIR = Path(os.environ.get('CONGA_SWAGGER_CACHE', Path.home() / '.cache' / 'conga-inspector' / 'swagger'))
+DEFAULT_MAX_AGE = float(os.environ.get('CONGA_SWAGGER_MAX_AGE', '300'))
+
+# Bump when SpecIndex changes shape so old pickles are rebuilt instead of loaded
+INDEX_FORMAT = 1
+
+HTTP_METHODS = ('GET', 'PUT', 'POST', 'DELETE', 'OPTIONS', 'HEAD', 'PATCH', 'TRACE')
+
+
+class Parameter(NamedTuple):
+    name: str
+    location: str  # path, query, header, body, formData or cookie
+    required: bool
+    type: Optional[str]
+
+
+class Operation(NamedTuple):
+    path: str
+    method: str
+    operation_id: Optional[str]
+    summary: Optional[str]
+    parameters: Tuple[Parameter, ...]
+
+    @property
+    def path_parameters(self) -> Tuple[Parameter, ...]:
+        return tuple(p for p in self.parameters if p.location == 'path')
+
+
+@dataclass
+class SpecIndex:
+    """Compact, picklable view of a spec: operations by path and method, paths kept sorted."""
+
+    info: Dict[str, Optional[str]] = field(default_factory=dict)
+    paths: Dict[str, Dict[str, Operation]] = field(default_factory=dict)
+    sorted_paths: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_spec(cls, spec: dict) -> 'SpecIndex':
+        def resolve(item):
+            # Only local refs (#/parameters/x, #/components/parameters/x) appear in practice
+            ref = item.get('$ref') if isinstance(item, dict) else None
+            if not ref or not ref.startswith('#/'):
+                return item
+            target = spec
+            for part in ref[2:].split('/'):
+                target = target.get(part, {})
+            return target
+
+        def parameter(item):
+            item = resolve(item)
+            kind = item.get('type') or resolve(item.get('schema') or {}).get('type')
+            location = item.get('in', 'query')
+            return Parameter(item.get('name', ''), location, bool(item.get('required', location == 'path')), kind)
+
+        paths = {}
+        for path, path_item in (spec.get('paths') or {}).items():
+            shared = [parameter(p) for p in path_item.get('parameters', [])]
+            operations = {}
+            for method, operation in path_item.items():
+                method = method.upper()
+                if method not in HTTP_METHODS or not isinstance(operation, dict):
+                    continue
+                own = [parameter(p) for p in operation.get('parameters', [])]
+                # Operation-level parameters override path-level ones with the same name and location
+                overridden = {(p.name, p.location) for p in own}
+                merged = tuple([p for p in shared if (p.name, p.location) not in overridden] + own)
+                operations[method] = Operation(path, method, operation.get('operationId'), operation.get('summary'), merged)
+            paths[path] = operations
+
+        info = spec.get('info') or {}
+        return cls(
+            info={
+                'title': info.get('title'),
+                'version': info.get('version'),
+                'basePath': spec.get('basePath'),
+                'host': spec.get('host'),
+            },
+            paths=paths,
+            sorted_paths=sorted(paths),
+        )
+
+    def has(self, path: str, method: str = 'GET') -> bool:
+        return method.upper() in self.paths.get(path, ())
+
+    def methods(self, path: str) -> List[str]:
+        return list(self.paths.get(path, ()))
+
+    def operation(self, path: str, method: str = 'GET') -> Optional[Operation]:
+        return self.paths.get(path, {}).get(method.upper())
+
+    def under(self, prefix: str) -> List[str]:
+        """Every path starting with `prefix`, in sorted order."""
+        start = bisect.bisect_left(self.sorted_paths, prefix)
+        end = bisect.bisect_left(self.sorted_paths, prefix + '\uffff', start)
+        return self.sorted_paths[start:end]
+
+    def operations(self, method: Optional[str] = None) -> Iterator[Operation]:
+        for path in self.sorted_paths:
+            for operation in self.paths[path].values():
+                if method is None or operation.method == method.upper():
+                    yield operation
+
+    def __len__(self):
+        return len(self.paths)
+
+
+class SwaggerCache:
+    """Fetches the spec at most once per change and keeps its SpecIndex on disk."""
+
+    def __init__(
+        self,
+        url: str = SPEC_URL,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        headers: Optional[Dict[str, str]] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        timeout: float = 10,
+        session: Optional[requests.Session] = None,
+    ):
+        self.url = url
+        self.cache_dir = Path(cache_dir)
+        self.headers = headers or {}
+        self.max_age = max_age
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        stem = ''.join(c if c.isalnum() else '_' for c in url.split('://', 1)[-1])
+        self.index_path = self.cache_dir / f"{stem}.pickle"
+        # How the last load was served: 'memory', 'fresh', 'not-modified', 'downloaded' or 'stale'
+        self.last_source = None
+        self._index = None
+        self._meta = None
+
+    def load(self, offline: bool = False) -> SpecIndex:
+        """The spec index, revalidating with the server only once max_age has passed.
+
+        With `offline` the cached index is returned as is. If the server can't be
+        reached a cached index is still returned; requests.RequestException is
+        raised only when there is nothing cached.
+        """
+        if self._index is not None and (offline or self._age() < self.max_age):
+            self.last_source = 'memory'
+            return self._index
+        if self._meta is None:
+            self._read()
+        if self._index is not None and (offline or self._age() < self.max_age):
+            self.last_source = 'fresh'
+            return self._index
+        if offline:
+            raise FileNotFoundError(f"No cached spec for {self.url} in {self.cache_dir}")
+
+        headers = dict(self.headers)
+        if self._index is not None:
+            if self._meta.get('etag'):
+                headers['If-None-Match'] = self._meta['etag']
+            if self._meta.get('last_modified'):
+                headers['If-Modified-Since'] = self._meta['last_modified']
+
+        try:
+            response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+            if response.status_code != 304:
+                response.raise_for_status()
+        except requests.exceptions.RequestException:
+            if self._index is None:
+                raise
+            self.last_source = 'stale'
+            return self._index
+
+        if response.status_code == 304:
+            self.last_source = 'not-modified'
+            self._meta['fetched_at'] = time.time()
+        else:
+            self.last_source = 'downloaded'
+            self._index = SpecIndex.from_spec(json.loads(response.content))
+            self._meta = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+            }
+        self._write()
+        return self._index
+
+    def _age(self) -> float:
+        return time.time() - self._meta.get('fetched_at', 0)
+
+    def _read(self):
+        self._meta = {}
+        try:
+            with open(self.index_path, 'rb') as f:
+                stored = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return
+        if isinstance(stored, dict) and stored.get('format') == INDEX_FORMAT and stored.get('url') == self.url:
+            self._meta, self._index = stored['meta'], stored['index']
+
+    def _write(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        stored = {'format': INDEX_FORMAT, 'url': self.url, 'meta': self._meta, 'index': self._index}
+        temp_path = self.index_path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            pickle.dump(stored, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.index_path)
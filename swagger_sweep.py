@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Swagger-driven GET sweep over the Conga Data API
+
+Every GET operation in a SpecIndex is called once. Operations run in waves by
+number of path parameters: parameterless collections first, then the paths
+below them, with each {param} filled from (in order) explicit sample values,
+a record returned by the collection right above it, or a placeholder. A wave
+runs concurrently on one ProbeEngine; a request budget and an overall deadline
+bound the whole sweep.
+
+    index = SwaggerCache(url, headers=headers).load()
+    results = asyncio.run(sweep(index, base_url, headers=headers, budget=200))
+    print_report(results)
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from conga_probe import Probe, ProbeEngine, ProbeResult, describe_status
+from swagger_cache import Operation, SpecIndex
+
+# Keys tried when picking a path parameter value out of a collection record
+RECORD_KEYS = ('Id', 'id', 'Name', 'name', 'Key', 'key')
+PLACEHOLDERS = {'integer': '1', 'number': '1', 'boolean': 'true'}
+
+
+@dataclass
+class SweepResult:
+    operation: Operation
+    path: str = ''
+    filled_from: str = ''  # sample, discovered, placeholder or empty when nothing was filled
+    result: Optional[ProbeResult] = None
+    skipped: Optional[str] = None
+
+
+def records_of(body) -> list:
+    """The record list of a collection response, bare or wrapped in a paging envelope."""
+    if isinstance(body, list):
+        return body
+    if isinstance(body, dict):
+        for key in ('Data', 'data', 'items', 'value', 'records'):
+            if isinstance(body.get(key), list):
+                return body[key]
+    return []
+
+
+def pick_value(body, name: str) -> Optional[str]:
+    for record in records_of(body):
+        if not isinstance(record, dict):
+            continue
+        keys = [name, name[:1].upper() + name[1:]]
+        # objectName -> Name, accountId -> Id
+        keys += [suffix for suffix in ('Name', 'Id', 'Key') if name.endswith(suffix) and name != suffix]
+        for key in keys + list(RECORD_KEYS):
+            if record.get(key) not in (None, ''):
+                return str(record[key])
+    return None
+
+
+def fill_path(operation: Operation, samples: Dict[str, str], bodies: Dict[str, object]):
+    """Concrete path for an operation and where its parameter values came from."""
+    types = {p.name: p.type for p in operation.path_parameters}
+    concrete, sources = [], set()
+    for segment in operation.path.strip('/').split('/'):
+        if not (segment.startswith('{') and segment.endswith('}')):
+            concrete.append(segment)
+            continue
+        name = segment[1:-1]
+        if name in samples:
+            value, source = str(samples[name]), 'sample'
+        else:
+            value = pick_value(bodies.get('/' + '/'.join(concrete)), name)
+            source = 'discovered'
+            if value is None:
+                value, source = PLACEHOLDERS.get(types.get(name), 'example'), 'placeholder'
+        concrete.append(value)
+        sources.add(source)
+    # Report the weakest source used
+    source = next((s for s in ('placeholder', 'discovered', 'sample') if s in sources), '')
+    return '/' + '/'.join(concrete), source
+
+
+async def sweep(
+    index: SpecIndex,
+    base_url: str,
+    headers: Optional[Dict[str, str]] = None,
+    samples: Optional[Dict[str, str]] = None,
+    budget: Optional[int] = None,
+    concurrency: int = 16,
+    deadline: Optional[float] = None,
+    **engine_options,
+) -> List[SweepResult]:
+    """Call every GET operation once; results follow the spec's sorted path order."""
+    samples = samples or {}
+    operations = list(index.operations('GET'))
+    waves = sorted({len(op.path_parameters) for op in operations})
+    results = {op: SweepResult(op) for op in operations}
+    bodies = {}
+    remaining = budget if budget is not None else len(operations)
+    stop_at = time.monotonic() + deadline if deadline else None
+
+    async with ProbeEngine(headers=headers, concurrency=concurrency, **engine_options) as engine:
+        for depth in waves:
+            batch = []
+            for op in (op for op in operations if len(op.path_parameters) == depth):
+                sweep_result = results[op]
+                sweep_result.path, sweep_result.filled_from = fill_path(op, samples, bodies)
+                if remaining <= 0:
+                    sweep_result.skipped = 'request budget spent'
+                elif stop_at is not None and time.monotonic() >= stop_at:
+                    sweep_result.skipped = 'deadline reached'
+                else:
+                    remaining -= 1
+                    batch.append(sweep_result)
+            if not batch:
+                continue
+
+            wave_deadline = max(stop_at - time.monotonic(), 0) if stop_at is not None else None
+            probes = [Probe(base_url.rstrip('/') + r.path, label=r.operation.path) for r in batch]
+            for sweep_result, probe_result in zip(batch, await engine.run(probes, deadline=wave_deadline)):
+                sweep_result.result = probe_result
+                if probe_result.ok:
+                    bodies[sweep_result.path] = probe_result.json()
+
+    return [results[op] for op in operations]
+
+
+def print_report(results: List[SweepResult], elapsed: Optional[float] = None):
+    print(f"{'status':<23} {'ms':>8} {'bytes':>9}  operation")
+    print("-" * 80)
+    for r in results:
+        note = f"  [{r.filled_from}: {r.path}]" if r.filled_from else ''
+        if r.skipped:
+            print(f"{'⏭️  skipped':<23} {'':>8} {'':>9}  GET {r.operation.path} ({r.skipped})")
+        elif r.result.error:
+            print(f"{'💥 ERROR':<23} {r.result.elapsed * 1000:>8.1f} {'':>9}  GET {r.operation.path}{note} ({r.result.error[:50]})")
+        else:
+            status = describe_status(r.result.status)
+            print(f"{status:<23} {r.result.elapsed * 1000:>8.1f} {r.result.size:>9}  GET {r.operation.path}{note}")
+
+    called = [r.result for r in results if r.result is not None]
+    ok = [r for r in called if r.ok]
+    print("-" * 80)
+    print(f"   Operations: {len(results)}, called: {len(called)}, OK: {len(ok)}, skipped: {len(results) - len(called)}")
+    if called:
+        latencies = sorted(r.elapsed for r in called)
+        print(
+            f"   Latency: median {latencies[len(latencies) // 2] * 1000:.1f}ms, "
+            f"max {latencies[-1] * 1000:.1f}ms, payload {sum(r.size for r in called)} bytes"
+        )
+    if elapsed:
+        print(f"   Sweep time: {elapsed:.2f}s ({len(called) / elapsed:.1f} req/s)")
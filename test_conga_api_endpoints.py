@@ -3,41 +3,20 @@
 Test various Conga API endpoints to find working ones
 """
 
-import requests
 import json
+import time
 
-# Get token first
-def get_token():
-    token_url = "https://login-preview.congacloud.eu/api/v1/auth/connect/token"
-    client_id = "6ebb98c7-dd82-4780-b1ac-c0dc3f7ed43e"
-    client_secret = "RK5h@?8gM_-6PEF@4-hzd73W"
-    
-    token_data = {
-        'grant_type': 'client_credentials',
-        'client_id': client_id,
-        'client_secret': client_secret,
-    }
-    
-    headers = {
-        'Content-Type': 'application/x-www-form-urlencoded',
-        'User-Agent': 'Conga-Inspector-Test/1.0'
-    }
-    
-    response = requests.post(token_url, data=token_data, headers=headers, timeout=30)
-    
-    if response.status_code == 200:
-        return response.json().get('access_token')
-    else:
-        print(f"Token request failed: {response.status_code} - {response.text}")
-        return None
+import conga_config
+from conga_auth import get_token
+from conga_probe import Probe, describe_status, run_probes
 
 def test_endpoints(token):
     """Test various API endpoints"""
     base_urls = [
-        "https://rls-preview.congacloud.eu",
-        "https://rls-preview.congacloud.eu/api",
-        "https://rls-preview.congacloud.eu/api/data",
-        "https://rls-preview.congacloud.eu/api/v1",
+        conga_config.PLATFORM_DOMAIN,
+        f"{conga_config.PLATFORM_DOMAIN}/api",
+        conga_config.API_BASE_URL,
+        f"{conga_config.PLATFORM_DOMAIN}/api/v1",
     ]
     
     endpoints = [
@@ -68,32 +47,32 @@ def test_endpoints(token):
     print("Testing API endpoints...")
     print("=" * 80)
     
+    # Every base URL/endpoint pair is probed concurrently over one pooled client
+    probes = [Probe(f"{base_url}{endpoint}", label=base_url) for base_url in base_urls for endpoint in endpoints]
+    started = time.perf_counter()
+    results = run_probes(probes, headers=headers, timeout=10, deadline=30)
+    sweep_time = time.perf_counter() - started
+    
     working_endpoints = []
     
     for base_url in base_urls:
         print(f"\nTesting base URL: {base_url}")
         print("-" * 50)
         
-        for endpoint in endpoints:
-            url = f"{base_url}{endpoint}"
-            try:
-                response = requests.get(url, headers=headers, timeout=10)
-                status = response.status_code
-                
-                if status < 400:
-                    print(f"✅ {status} - {url}")
-                    working_endpoints.append((url, status, response.text[:200]))
-                elif status == 401:
-                    print(f"🔐 {status} - {url} (Auth required)")
-                elif status == 403:
-                    print(f"🚫 {status} - {url} (Forbidden)")
-                elif status == 404:
-                    print(f"❌ {status} - {url} (Not found)")
-                else:
-                    print(f"⚠️  {status} - {url}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"💥 ERROR - {url} ({str(e)[:50]})")
+        for result in results:
+            if result.probe.label != base_url:
+                continue
+            url = result.probe.url
+            if result.error:
+                print(f"💥 ERROR - {url} ({result.error[:50]})")
+                continue
+            
+            print(f"{describe_status(result.status)} - {url} [{result.elapsed * 1000:.0f}ms]")
+            if result.ok:
+                working_endpoints.append((url, result.status, result.text[:200]))
+    
+    slowest = max(result.elapsed for result in results)
+    print(f"\n⏱️  Swept {len(results)} URLs in {sweep_time:.2f}s (slowest single call: {slowest:.2f}s)")
     
     print("\n" + "=" * 80)
     print("WORKING ENDPOINTS:")
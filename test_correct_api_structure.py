@@ -6,33 +6,12 @@ Test the correct API structure based on swagger documentation
 import requests
 import json
 
-def get_token():
-    """Get access token without scope parameter"""
-    token_url = "https://login-preview.congacloud.eu/api/v1/auth/connect/token"
-    client_id = "6ebb98c7-dd82-4780-b1ac-c0dc3f7ed43e"
-    client_secret = "RK5h@?8gM_-6PEF@4-hzd73W"
-    
-    token_data = {
-        'grant_type': 'client_credentials',
-        'client_id': client_id,
-        'client_secret': client_secret,
-    }
-    
-    headers = {
-        'Content-Type': 'application/x-www-form-urlencoded',
-        'User-Agent': 'Conga-Inspector-Test/1.0'
-    }
-    
-    response = requests.post(token_url, data=token_data, headers=headers, timeout=30)
-    
-    if response.status_code == 200:
-        return response.json().get('access_token')
-    else:
-        return None
+import conga_config
+from conga_auth import get_token
 
 def test_correct_api_endpoints(token):
     """Test API endpoints with correct structure"""
-    base_url = "https://rls-preview.congacloud.eu/api/data"
+    base_url = conga_config.API_BASE_URL
     
     headers = {
         'Authorization': f'Bearer {token}',
@@ -125,7 +104,7 @@ def main():
     print(f"   {'✅' if success else '❌'} API endpoints: {'Working' if success else 'Not working'}")
     
     if success:
-        print(f"   ✅ Correct API base URL: https://rls-preview.congacloud.eu/api/data")
+        print(f"   ✅ Correct API base URL: {conga_config.API_BASE_URL}")
         print(f"   ⚠️  Current extension config has '/v1' which should be removed")
     
     return 0 if success else 1
@@ -3,38 +3,50 @@
 Final test of the Conga Inspector extension with corrected configuration
 """
 
-import requests
 import json
 
-def get_token():
-    """Get access token without scope parameter"""
-    token_url = "https://login-preview.congacloud.eu/api/v1/auth/connect/token"
-    client_id = "6ebb98c7-dd82-4780-b1ac-c0dc3f7ed43e"
-    client_secret = "RK5h@?8gM_-6PEF@4-hzd73W"
-    
-    token_data = {
-        'grant_type': 'client_credentials',
-        'client_id': client_id,
-        'client_secret': client_secret,
-        # No scope parameter (Fix #1)
-    }
-    
-    headers = {
-        'Content-Type': 'application/x-www-form-urlencoded',
-        'User-Agent': 'Conga-Inspector-Test/1.0'
+import conga_config
+from conga_auth import get_token
+from conga_probe import Probe, run_probes
+
+# Typical extension API calls; load_test.py replays these too
+TEST_SCENARIOS = [
+    {
+        'name': 'Get API Configuration',
+        'endpoint': '/swagger/v1/swagger.json',
+        'method': 'GET',
+        'description': 'Extension loads API configuration'
+    },
+    {
+        'name': 'List Available Objects',
+        'endpoint': '/v1/currencies',
+        'method': 'GET', 
+        'description': 'Extension discovers available objects'
+    },
+    {
+        'name': 'Query Account Data',
+        'endpoint': '/v1/objects/Account?limit=5',
+        'method': 'GET',
+        'description': 'User queries Account data'
+    },
+    {
+        'name': 'Query Contact Data',
+        'endpoint': '/v1/objects/Contact?limit=5',
+        'method': 'GET',
+        'description': 'User queries Contact data'
+    },
+    {
+        'name': 'Get Account Summary',
+        'endpoint': '/v1/objects/Account/summary',
+        'method': 'GET',
+        'description': 'User views Account metadata'
     }
-    
-    response = requests.post(token_url, data=token_data, headers=headers, timeout=30)
-    
-    if response.status_code == 200:
-        return response.json().get('access_token')
-    else:
-        return None
+]
 
 def simulate_extension_api_calls(token):
     """Simulate the API calls that the extension would make"""
     # This is the corrected base URL (Fix #2)
-    base_url = "https://rls-preview.congacloud.eu/api/data"
+    base_url = conga_config.API_BASE_URL
     
     headers = {
         'Authorization': f'Bearer {token}',
@@ -42,78 +54,41 @@ def simulate_extension_api_calls(token):
         'User-Agent': 'Conga-Inspector-Extension/1.0'
     }
     
-    # Simulate typical extension API calls
-    test_scenarios = [
-        {
-            'name': 'Get API Configuration',
-            'endpoint': '/swagger/v1/swagger.json',
-            'method': 'GET',
-            'description': 'Extension loads API configuration'
-        },
-        {
-            'name': 'List Available Objects',
-            'endpoint': '/v1/currencies',
-            'method': 'GET', 
-            'description': 'Extension discovers available objects'
-        },
-        {
-            'name': 'Query Account Data',
-            'endpoint': '/v1/objects/Account?limit=5',
-            'method': 'GET',
-            'description': 'User queries Account data'
-        },
-        {
-            'name': 'Query Contact Data',
-            'endpoint': '/v1/objects/Contact?limit=5',
-            'method': 'GET',
-            'description': 'User queries Contact data'
-        },
-        {
-            'name': 'Get Account Summary',
-            'endpoint': '/v1/objects/Account/summary',
-            'method': 'GET',
-            'description': 'User views Account metadata'
-        }
-    ]
     
     print(f"🔧 Simulating Extension API Calls")
     print(f"Base URL: {base_url}")
     print("=" * 80)
     
+    probes = [Probe(f"{base_url}{scenario['endpoint']}", method=scenario['method'], label=scenario['name'])
+              for scenario in TEST_SCENARIOS]
+    probe_results = run_probes(probes, headers=headers, timeout=10, deadline=30)
+    
     results = []
     
-    for scenario in test_scenarios:
-        url = f"{base_url}{scenario['endpoint']}"
+    for scenario, result in zip(TEST_SCENARIOS, probe_results):
+        print(f"\n📋 {scenario['name']}")
+        print(f"   URL: {result.probe.url}")
+        print(f"   Description: {scenario['description']}")
         
-        try:
-            print(f"\n📋 {scenario['name']}")
-            print(f"   URL: {url}")
-            print(f"   Description: {scenario['description']}")
+        if result.error:
+            print(f"   💥 Error: {result.error[:50]}")
+            results.append({'scenario': scenario['name'], 'status': 'error', 'error': result.error})
+        elif result.ok:
+            print(f"   ✅ Success ({result.status}) in {result.elapsed * 1000:.0f}ms")
             
-            response = requests.get(url, headers=headers, timeout=10)
-            status = response.status_code
+            data = result.json()
+            if isinstance(data, dict) and 'Data' in data:
+                record_count = len(data['Data']) if isinstance(data['Data'], list) else 1
+                print(f"   📊 Records: {record_count}")
+            elif isinstance(data, dict) and 'RecordCount' in data:
+                print(f"   📊 Records: {data['RecordCount']}")
+            elif data is None:
+                print(f"   📄 Response: HTML/Text content")
             
-            if status < 400:
-                print(f"   ✅ Success ({status})")
-                
-                try:
-                    data = response.json()
-                    if 'Data' in data:
-                        record_count = len(data['Data']) if isinstance(data['Data'], list) else 1
-                        print(f"   📊 Records: {record_count}")
-                    elif 'RecordCount' in data:
-                        print(f"   📊 Records: {data['RecordCount']}")
-                except:
-                    print(f"   📄 Response: HTML/Text content")
-                
-                results.append({'scenario': scenario['name'], 'status': 'success', 'code': status})
-            else:
-                print(f"   ❌ Failed ({status})")
-                results.append({'scenario': scenario['name'], 'status': 'failed', 'code': status})
-                
-        except requests.exceptions.RequestException as e:
-            print(f"   💥 Error: {str(e)[:50]}")
-            results.append({'scenario': scenario['name'], 'status': 'error', 'error': str(e)})
+            results.append({'scenario': scenario['name'], 'status': 'success', 'code': result.status})
+        else:
+            print(f"   ❌ Failed ({result.status})")
+            results.append({'scenario': scenario['name'], 'status': 'failed', 'code': result.status})
     
     return results
 
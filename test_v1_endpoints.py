@@ -3,43 +3,30 @@
 Test the specific v1 API endpoints that the extension is configured to use
 """
 
-import requests
 import json
+import time
+
+import conga_config
+from conga_auth import TokenError, default_provider
+from conga_probe import Probe, describe_status, run_probes
 
 def get_token():
     """Get access token without scope parameter"""
-    token_url = "https://login-preview.congacloud.eu/api/v1/auth/connect/token"
-    client_id = "6ebb98c7-dd82-4780-b1ac-c0dc3f7ed43e"
-    client_secret = "RK5h@?8gM_-6PEF@4-hzd73W"
-    
-    token_data = {
-        'grant_type': 'client_credentials',
-        'client_id': client_id,
-        'client_secret': client_secret,
-        # No scope parameter - this was the fix
-    }
-    
-    headers = {
-        'Content-Type': 'application/x-www-form-urlencoded',
-        'User-Agent': 'Conga-Inspector-Test/1.0'
-    }
-    
     print("🔐 Testing authentication without scope parameter...")
-    response = requests.post(token_url, data=token_data, headers=headers, timeout=30)
-    
-    if response.status_code == 200:
-        print("✅ Authentication successful!")
-        token_data = response.json()
-        print(f"   Token type: {token_data.get('token_type')}")
-        print(f"   Expires in: {token_data.get('expires_in')} seconds")
-        return token_data.get('access_token')
-    else:
-        print(f"❌ Authentication failed: {response.status_code} - {response.text}")
+    try:
+        token_data = default_provider().get_token_data()
+    except TokenError as e:
+        print(f"❌ Authentication failed: {e}")
         return None
 
+    print("✅ Authentication successful!")
+    print(f"   Token type: {token_data.get('token_type')}")
+    print(f"   Expires in: {token_data['expires_at'] - time.time():.0f} seconds")
+    return token_data.get('access_token')
+
 def test_v1_endpoints(token):
     """Test the v1 API endpoints"""
-    base_url = "https://rls-preview.congacloud.eu/api/data/v1"
+    base_url = f"{conga_config.API_BASE_URL}/v1"
     
     headers = {
         'Authorization': f'Bearer {token}',
@@ -62,34 +49,23 @@ def test_v1_endpoints(token):
     print(f"\n🌐 Testing v1 API endpoints at: {base_url}")
     print("=" * 80)
     
+    probes = [Probe(f"{base_url}{endpoint}", method=method, label=description)
+              for endpoint, method, description in test_endpoints]
+    results = run_probes(probes, headers=headers, timeout=10, deadline=30)
+    
     working_endpoints = []
     
-    for endpoint, method, description in test_endpoints:
-        url = f"{base_url}{endpoint}"
-        try:
-            print(f"Testing: {method} {url}")
-            
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            else:
-                response = requests.request(method, url, headers=headers, timeout=10)
-            
-            status = response.status_code
-            
-            if status < 400:
-                print(f"✅ {status} - {description}")
-                working_endpoints.append((url, status, response.text[:200]))
-            elif status == 401:
-                print(f"🔐 {status} - {description} (Auth required)")
-            elif status == 403:
-                print(f"🚫 {status} - {description} (Forbidden)")
-            elif status == 404:
-                print(f"❌ {status} - {description} (Not found)")
-            else:
-                print(f"⚠️  {status} - {description}")
-                
-        except requests.exceptions.RequestException as e:
-            print(f"💥 ERROR - {url} ({str(e)[:50]})")
+    for result in results:
+        url, description = result.probe.url, result.probe.label
+        print(f"Testing: {result.probe.method} {url}")
+        
+        if result.error:
+            print(f"💥 ERROR - {url} ({result.error[:50]})")
+            continue
+        
+        print(f"{describe_status(result.status)} - {description} [{result.elapsed * 1000:.0f}ms]")
+        if result.ok:
+            working_endpoints.append((url, result.status, result.text[:200]))
     
     print("\n" + "=" * 80)
     print("WORKING V1 ENDPOINTS:")
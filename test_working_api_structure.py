@@ -1,89 +1,63 @@
 #!/usr/bin/env python3
 """
 Test to find the correct API structure for Conga
+
+    python test_working_api_structure.py                  # spec summary and key paths
+    python test_working_api_structure.py --sweep          # every GET operation in the spec
+    python test_working_api_structure.py --sweep --no-auth --base-url http://localhost:8081/api/data
 """
 
-import requests
+import argparse
+import asyncio
 import json
+import time
 
-def get_token():
-    """Get access token without scope parameter"""
-    token_url = "https://login-preview.congacloud.eu/api/v1/auth/connect/token"
-    client_id = "6ebb98c7-dd82-4780-b1ac-c0dc3f7ed43e"
-    client_secret = "RK5h@?8gM_-6PEF@4-hzd73W"
-    
-    token_data = {
-        'grant_type': 'client_credentials',
-        'client_id': client_id,
-        'client_secret': client_secret,
-    }
-    
-    headers = {
-        'Content-Type': 'application/x-www-form-urlencoded',
-        'User-Agent': 'Conga-Inspector-Test/1.0'
-    }
-    
-    response = requests.post(token_url, data=token_data, headers=headers, timeout=30)
-    
-    if response.status_code == 200:
-        return response.json().get('access_token')
-    else:
-        return None
+import requests
+
+import conga_config
+from conga_auth import get_token
+from swagger_cache import SwaggerCache
+from swagger_sweep import print_report, sweep
 
 def test_swagger_endpoint(token):
-    """Test the working swagger endpoint to understand API structure"""
-    url = "https://rls-preview.congacloud.eu/api/data/swagger/v1/swagger.json"
-    
+    """Load the swagger spec index (revalidated against the cache) to understand API structure"""
     headers = {
         'Authorization': f'Bearer {token}',
         'Content-Type': 'application/json',
         'User-Agent': 'Conga-Inspector-Test/1.0'
     }
+    swagger = SwaggerCache(headers=headers)
     
-    print(f"🔍 Testing swagger endpoint: {url}")
+    print(f"🔍 Testing swagger endpoint: {swagger.url}")
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            print("✅ Swagger endpoint accessible")
-            
-            try:
-                swagger_data = response.json()
-                print(f"   API Title: {swagger_data.get('info', {}).get('title', 'N/A')}")
-                print(f"   API Version: {swagger_data.get('info', {}).get('version', 'N/A')}")
-                print(f"   Base Path: {swagger_data.get('basePath', 'N/A')}")
-                print(f"   Host: {swagger_data.get('host', 'N/A')}")
-                
-                # Check available paths
-                paths = swagger_data.get('paths', {})
-                print(f"   Available paths ({len(paths)}):")
-                for path in list(paths.keys())[:10]:  # Show first 10 paths
-                    methods = list(paths[path].keys())
-                    print(f"     {path} [{', '.join(methods)}]")
-                
-                if len(paths) > 10:
-                    print(f"     ... and {len(paths) - 10} more paths")
-                
-                return swagger_data
-                
-            except json.JSONDecodeError:
-                print("❌ Swagger response is not valid JSON")
-                return None
-        else:
-            print(f"❌ Swagger endpoint failed: {response.status_code}")
-            return None
-            
-    except requests.exceptions.RequestException as e:
+        index = swagger.load()
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"❌ Error accessing swagger: {e}")
         return None
+    
+    print(f"✅ Swagger spec available ({swagger.last_source})")
+    print(f"   API Title: {index.info.get('title') or 'N/A'}")
+    print(f"   API Version: {index.info.get('version') or 'N/A'}")
+    print(f"   Base Path: {index.info.get('basePath') or 'N/A'}")
+    print(f"   Host: {index.info.get('host') or 'N/A'}")
+    
+    # Check available paths
+    print(f"   Available paths ({len(index)}):")
+    for path in index.sorted_paths[:10]:  # Show first 10 paths
+        print(f"     {path} [{', '.join(index.methods(path))}]")
+    
+    if len(index) > 10:
+        print(f"     ... and {len(index) - 10} more paths")
+    
+    return index
 
-def test_api_paths_from_swagger(token, swagger_data):
+def test_api_paths_from_swagger(token, index):
     """Test actual API paths found in swagger"""
-    if not swagger_data or 'paths' not in swagger_data:
+    if not index:
         return
     
-    base_url = "https://rls-preview.congacloud.eu/api/data"
+    base_url = conga_config.API_BASE_URL
     
     headers = {
         'Authorization': f'Bearer {token}',
@@ -91,8 +65,6 @@ def test_api_paths_from_swagger(token, swagger_data):
         'User-Agent': 'Conga-Inspector-Test/1.0'
     }
     
-    paths = swagger_data.get('paths', {})
-    
     print(f"\n🌐 Testing actual API paths from swagger documentation:")
     print("=" * 80)
     
@@ -108,7 +80,7 @@ def test_api_paths_from_swagger(token, swagger_data):
     ]
     
     for path, method in test_paths:
-        if path in paths and method.lower() in paths[path]:
+        if index.has(path, method):
             url = f"{base_url}{path}"
             try:
                 print(f"Testing: {method} {url}")
@@ -133,7 +105,79 @@ def test_api_paths_from_swagger(token, swagger_data):
     
     return working_endpoints
 
+def run_sweep(args):
+    """Call every GET operation in the spec, concurrently and within the request budget"""
+    headers = {
+        'Content-Type': 'application/json',
+        'User-Agent': 'Conga-Inspector-Test/1.0'
+    }
+    if not args.no_auth:
+        token = get_token()
+        if not token:
+            print("❌ Failed to get access token")
+            return 1
+        headers['Authorization'] = f'Bearer {token}'
+    
+    base_url = args.base_url.rstrip('/')
+    swagger = SwaggerCache(f"{base_url}/swagger/v1/swagger.json", headers=headers)
+    try:
+        index = swagger.load(offline=args.offline)
+    except (requests.exceptions.RequestException, OSError, ValueError) as e:
+        print(f"❌ Could not load swagger spec: {e}")
+        return 1
+    
+    samples = {}
+    if args.samples:
+        with open(args.samples) as f:
+            samples = json.load(f)
+    
+    operations = len(list(index.operations('GET')))
+    print(f"🌐 Sweeping {operations} GET operations on {base_url} (spec: {swagger.last_source})")
+    print(f"   Budget: {args.budget or 'unlimited'} requests, concurrency: {args.concurrency}, deadline: {args.deadline or 'none'}")
+    print("=" * 80)
+    
+    started = time.perf_counter()
+    results = asyncio.run(sweep(
+        index, base_url, headers=headers, samples=samples,
+        budget=args.budget, concurrency=args.concurrency, deadline=args.deadline,
+    ))
+    print_report(results, time.perf_counter() - started)
+    
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump([
+                {
+                    'operation': r.operation.path,
+                    'path': r.path,
+                    'filled_from': r.filled_from or None,
+                    'status': r.result.status if r.result else None,
+                    'elapsed_ms': round(r.result.elapsed * 1000, 1) if r.result else None,
+                    'bytes': r.result.size if r.result else None,
+                    'error': r.result.error if r.result else None,
+                    'skipped': r.skipped,
+                }
+                for r in results
+            ], f, indent=2)
+        print(f"   Report written to {args.report}")
+    
+    return 0 if all(r.result and r.result.ok for r in results) else 1
+
 def main():
+    parser = argparse.ArgumentParser(description="Analyze the Conga API structure")
+    parser.add_argument('--sweep', action='store_true', help="call every GET operation in the swagger spec")
+    parser.add_argument('--base-url', default=conga_config.API_BASE_URL, help="API base URL (e.g. a local mock_conga_api.py)")
+    parser.add_argument('--budget', type=int, help="maximum number of API requests")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--deadline', type=float, help="overall time limit in seconds")
+    parser.add_argument('--samples', help="JSON file mapping path parameter names to values")
+    parser.add_argument('--offline', action='store_true', help="use the cached spec without revalidating")
+    parser.add_argument('--no-auth', action='store_true', help="skip the token request (mock server)")
+    parser.add_argument('--report', help="write per-operation results to this JSON file")
+    args = parser.parse_args()
+    
+    if args.sweep:
+        return run_sweep(args)
+    
     print("🔍 Analyzing Conga API Structure")
     print("=" * 60)
     
@@ -146,16 +190,16 @@ def main():
     print("✅ Authentication successful")
     
     # Test swagger endpoint to understand API structure
-    swagger_data = test_swagger_endpoint(token)
+    index = test_swagger_endpoint(token)
     
-    if swagger_data:
+    if index:
         # Test actual API paths
-        working_endpoints = test_api_paths_from_swagger(token, swagger_data)
+        working_endpoints = test_api_paths_from_swagger(token, index)
         
         print(f"\n📊 Summary:")
         print(f"   Authentication: ✅ Working (without scope)")
         print(f"   Swagger endpoint: ✅ Working")
-        print(f"   API base URL: https://rls-preview.congacloud.eu/api/data")
+        print(f"   API base URL: {conga_config.API_BASE_URL}")
         print(f"   Working endpoints: {len(working_endpoints) if working_endpoints else 0}")
         
         # Check if the current background.js configuration is correct
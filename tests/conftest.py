@@ -0,0 +1,30 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+sys.path.insert(0, str(ROOT_DIR))
+
+# server.py reads these at import time
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "conga_inspector_test")
+
+
+@pytest.fixture
+def mongo_url():
+    """MONGO_URL of a reachable server with a clean test database; skips otherwise."""
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    client = MongoClient(os.environ["MONGO_URL"], serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip("MongoDB is not reachable at MONGO_URL")
+    client.drop_database(os.environ["DB_NAME"])
+    yield os.environ["MONGO_URL"]
+    client.drop_database(os.environ["DB_NAME"])
+    client.close()
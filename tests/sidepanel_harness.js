@@ -0,0 +1,254 @@
+// Runs the Conga Inspector side panel scripts under node for test_sidepanel.py.
+//
+// Reads a scenario (the body of an async function) from stdin and prints what
+// it returns as JSON. The scenario calls panel() to load virtual-list.js and
+// sidepanel.js into a fresh context with a minimal DOM, chrome.runtime and an
+// in-memory IndexedDB shared by every panel, like tabs sharing one profile.
+// panel.run(code) evaluates code inside that panel; flush() runs the pending
+// animation frames of all panels.
+
+const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+
+const EXTENSION_DIR = path.join(__dirname, '..', 'conga-inspector');
+const SOURCES = ['virtual-list.js', 'sidepanel.js'].map(name => ({
+    name,
+    code: fs.readFileSync(path.join(EXTENSION_DIR, name), 'utf8')
+}));
+
+class FakeElement {
+    constructor(tagName) {
+        this.tagName = tagName.toUpperCase();
+        this.children = [];
+        this.parentNode = null;
+        this.style = {};
+        this.dataset = {};
+        this.listeners = {};
+        this.classNames = new Set();
+        this.classList = { add: name => this.classNames.add(name) };
+        this.textContent = '';
+        this.html = '';
+        this.scrollTop = 0;
+        this.clientHeight = 300;
+        this.offsetTop = 0;
+        this.isRoot = false;
+    }
+
+    get className() { return Array.from(this.classNames).join(' '); }
+    set className(value) { this.classNames = new Set(String(value).split(' ').filter(Boolean)); }
+
+    get innerHTML() { return this.html; }
+    set innerHTML(value) {
+        this.replaceChildren();
+        this.html = value;
+    }
+
+    get isConnected() {
+        let node = this;
+        while (node.parentNode) node = node.parentNode;
+        return node.isRoot;
+    }
+
+    get scrollHeight() { return this.children.length * 1000; }
+    get previousElementSibling() { return this.sibling(-1); }
+    get nextElementSibling() { return this.sibling(1); }
+
+    sibling(step) {
+        const siblings = this.parentNode ? this.parentNode.children : [];
+        return siblings[siblings.indexOf(this) + step] || null;
+    }
+
+    appendChild(child) {
+        return this.insertBefore(child, null);
+    }
+
+    insertBefore(child, reference) {
+        child.remove();
+        child.parentNode = this;
+        const index = reference ? this.children.indexOf(reference) : -1;
+        if (index === -1) this.children.push(child);
+        else this.children.splice(index, 0, child);
+        return child;
+    }
+
+    replaceChildren(...children) {
+        this.children.forEach(child => { child.parentNode = null; });
+        this.children = [];
+        this.html = '';
+        children.forEach(child => this.appendChild(child));
+    }
+
+    remove() {
+        if (this.parentNode) {
+            this.parentNode.children = this.parentNode.children.filter(child => child !== this);
+            this.parentNode = null;
+        }
+    }
+
+    // Only what sidepanel.js queries after writing its own markup
+    querySelector(selector) {
+        if (selector !== 'tbody') return null;
+        const body = new FakeElement('tbody');
+        this.replaceChildren(body);
+        return body;
+    }
+
+    closest(selector) {
+        for (let node = this; node; node = node.parentNode) {
+            if (node.classNames.has(selector.replace(/^\./, ''))) return node;
+        }
+        return null;
+    }
+
+    addEventListener(type, listener) {
+        this.listeners[type] = listener;
+    }
+}
+
+// One object store, keyPath 'key' with autoIncrement, as openNetworkDb creates
+const storedRows = new Map();
+let keyGenerator = 0;
+
+function fakeRequest(transaction, operation) {
+    const request = { listeners: [] };
+    request.addEventListener = (type, listener) => request.listeners.push(listener);
+    transaction.pending++;
+    setImmediate(() => {
+        request.result = operation();
+        if (request.onsuccess) request.onsuccess();
+        request.listeners.forEach(listener => listener());
+        if (--transaction.pending === 0) {
+            setImmediate(() => transaction.oncomplete && transaction.oncomplete());
+        }
+    });
+    return request;
+}
+
+function cursorRequest(transaction, direction) {
+    const keys = Array.from(storedRows.keys()).sort((a, b) => a - b);
+    if (direction === 'prev') keys.reverse();
+    const request = {};
+    let position = 0;
+    const step = () => setImmediate(() => {
+        const key = keys[position];
+        request.result = key === undefined ? null : {
+            value: structuredClone(storedRows.get(key)),
+            continue: () => { position++; step(); }
+        };
+        request.onsuccess();
+    });
+    step();
+    return request;
+}
+
+const fakeDb = {
+    objectStoreNames: { contains: () => true },
+    deleteObjectStore() {},
+    createObjectStore() {},
+    transaction() {
+        const transaction = { pending: 0 };
+        setImmediate(() => {
+            if (transaction.pending === 0 && transaction.oncomplete) transaction.oncomplete();
+        });
+        transaction.objectStore = () => ({
+            add: value => fakeRequest(transaction, () => {
+                const key = ++keyGenerator;
+                storedRows.set(key, { ...structuredClone(value), key });
+                return key;
+            }),
+            put: value => fakeRequest(transaction, () => {
+                storedRows.set(value.key, structuredClone(value));
+                return value.key;
+            }),
+            delete: range => fakeRequest(transaction, () => {
+                Array.from(storedRows.keys()).filter(key => key <= range.upper).forEach(key => storedRows.delete(key));
+            }),
+            clear: () => fakeRequest(transaction, () => storedRows.clear()),
+            openCursor: (range, direction) => cursorRequest(transaction, direction)
+        });
+        return transaction;
+    }
+};
+
+const fakeIndexedDb = {
+    open() {
+        const request = {};
+        setImmediate(() => {
+            request.result = fakeDb;
+            if (request.onupgradeneeded) request.onupgradeneeded();
+            request.onsuccess();
+        });
+        return request;
+    }
+};
+
+let frames = [];
+
+function flush() {
+    while (frames.length) {
+        const pending = frames;
+        frames = [];
+        pending.forEach(callback => callback());
+    }
+}
+
+function panel() {
+    const elements = {};
+    const document = {
+        readyState: 'loading',
+        addEventListener() {},
+        querySelector: () => new FakeElement('div'),
+        querySelectorAll: () => [],
+        createElement: tagName => new FakeElement(tagName),
+        getElementById: id => {
+            if (!elements[id]) {
+                elements[id] = new FakeElement('div');
+                elements[id].isRoot = true;
+            }
+            return elements[id];
+        }
+    };
+    const listeners = [];
+    const context = vm.createContext({
+        console: { log() {}, warn() {}, error: console.error },
+        document,
+        window: {},
+        chrome: {
+            runtime: {
+                getManifest: () => ({ version: 'test' }),
+                onMessage: { addListener: listener => listeners.push(listener) },
+                sendMessage() {}
+            }
+        },
+        indexedDB: fakeIndexedDb,
+        IDBKeyRange: { upperBound: upper => ({ upper }) },
+        requestAnimationFrame: callback => frames.push(callback),
+        setTimeout,
+        clearTimeout,
+        structuredClone,
+        URL,
+        Blob
+    });
+    SOURCES.forEach(({ name, code }) => vm.runInContext(code, context, { filename: name }));
+    document.getElementById('autoScroll').checked = true;
+
+    return {
+        elements,
+        run: code => vm.runInContext(code, context),
+        // What content.js forwards from a tab
+        send: (events, tabId = 1, url = 'https://tenant.congacloud.eu/app') => {
+            listeners.forEach(listener => listener({ action: 'networkEvents', events }, { tab: { id: tabId, url } }));
+        }
+    };
+}
+
+(async () => {
+    const scenario = fs.readFileSync(0, 'utf8');
+    const run = new Function('panel', 'flush', 'storedRows', `return (async () => {\n${scenario}\n})();`);
+    const result = await run(panel, flush, storedRows);
+    process.stdout.write(JSON.stringify(result));
+})().catch(error => {
+    console.error(error);
+    process.exit(1);
+});
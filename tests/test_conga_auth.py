@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from conga_auth import TokenError, TokenProvider
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.payload = payload
+        self.text = str(payload)
+
+    def json(self):
+        return self.payload
+
+
+class FakeTokenEndpoint:
+    """Stands in for requests.Session; hands out numbered tokens after a short delay."""
+
+    def __init__(self, expires_in=3600, status_code=200, delay=0.0):
+        self.expires_in = expires_in
+        self.status_code = status_code
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, data, headers, timeout):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls += 1
+            number = self.calls
+        payload = {"access_token": f"token-{number}", "token_type": "Bearer", "expires_in": self.expires_in}
+        return FakeResponse(self.status_code, payload)
+
+
+def provider(endpoint, cache_path=None, **options):
+    return TokenProvider(token_url="https://login.test/token", cache_path=cache_path, session=endpoint, **options)
+
+
+def test_token_reused_until_refresh_buffer(tmp_path):
+    endpoint = FakeTokenEndpoint(expires_in=3600)
+    tokens = provider(endpoint, tmp_path / "tokens.json")
+    assert tokens.get_token() == "token-1"
+    assert tokens.get_token() == "token-1"
+    assert endpoint.calls == 1
+
+    # A token inside the refresh buffer is replaced before it expires
+    short_lived = FakeTokenEndpoint(expires_in=30)
+    tokens = provider(short_lived, refresh_buffer=60)
+    assert tokens.get_token() == "token-1"
+    assert tokens.get_token() == "token-2"
+
+
+def test_disk_cache_shared_between_providers(tmp_path):
+    endpoint = FakeTokenEndpoint()
+    cache_path = tmp_path / "tokens.json"
+    assert provider(endpoint, cache_path).get_token() == "token-1"
+    assert provider(endpoint, cache_path).get_token() == "token-1"
+    assert endpoint.calls == 1
+    assert cache_path.stat().st_mode & 0o777 == 0o600
+
+    # Different credentials don't share an entry
+    assert provider(endpoint, cache_path, client_id="other").get_token() == "token-2"
+
+
+def test_concurrent_callers_share_one_refresh(tmp_path):
+    endpoint = FakeTokenEndpoint(delay=0.1)
+    tokens = provider(endpoint, tmp_path / "tokens.json")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(tokens.get_token())) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["token-1"] * 10
+    assert endpoint.calls == 1
+
+
+def test_invalidate_and_errors(tmp_path):
+    endpoint = FakeTokenEndpoint()
+    tokens = provider(endpoint, tmp_path / "tokens.json")
+    tokens.get_token()
+    tokens.invalidate()
+    assert tokens.get_token() == "token-2"
+    assert tokens.get_token(force_refresh=True) == "token-3"
+
+    with pytest.raises(TokenError):
+        provider(FakeTokenEndpoint(status_code=401)).get_token()
@@ -0,0 +1,129 @@
+import asyncio
+import csv
+import json
+
+import httpx
+import pytest
+
+from conga_export import ExportError, Format, export_records
+from mock_conga_api import MockSettings, create_app
+
+BASE_URL = "http://mock.test/api/data"
+
+
+class FailingTransport(httpx.ASGITransport):
+    """Mock API that starts answering 400 after a number of page requests."""
+
+    def __init__(self, app, fail_after=None):
+        super().__init__(app=app)
+        self.fail_after = fail_after
+        self.offsets = []
+
+    async def handle_async_request(self, request):
+        self.offsets.append(int(request.url.params["offset"]))
+        if self.fail_after is not None and len(self.offsets) > self.fail_after:
+            return httpx.Response(400, json={"error": "boom"})
+        return await super().handle_async_request(request)
+
+
+def export(tmp_path, name, fmt, records=1050, fail_after=None, **options):
+    transport = FailingTransport(create_app(settings=MockSettings(records=records, require_auth=False)), fail_after)
+    stats = asyncio.run(export_records(
+        "Account", tmp_path / name, fmt, base_url=BASE_URL, auth=False, transport=transport, **options,
+    ))
+    return stats, transport
+
+
+def test_ndjson_export_in_order_with_concurrent_pages(tmp_path):
+    stats, transport = export(tmp_path, "accounts.ndjson", Format.ndjson, page_size=100, concurrency=4)
+    lines = (tmp_path / "accounts.ndjson").read_text().splitlines()
+    assert stats["records"] == len(lines) == 1050
+    assert [json.loads(line)["Id"] for line in lines] == [f"ACC{i:09d}" for i in range(1, 1051)]
+    assert sorted(transport.offsets) == list(range(0, 1100, 100))
+    assert not (tmp_path / "accounts.ndjson.checkpoint").exists()
+
+
+def test_csv_projection_and_limit(tmp_path):
+    stats, _ = export(tmp_path, "accounts.csv", Format.csv, fields=["Name", "Id", "Missing"], limit=250, page_size=100)
+    with open(tmp_path / "accounts.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert stats["records"] == len(rows) == 250
+    assert list(rows[0]) == ["Name", "Id", "Missing"]
+    assert rows[-1] == {"Name": "Account 250", "Id": "ACC000000250", "Missing": ""}
+
+
+def test_csv_header_covers_the_whole_first_page(tmp_path):
+    from conga_export import CsvWriter
+
+    output = tmp_path / "sparse.csv"
+    writer = CsvWriter(output, None)
+    # Region only appears on the first page's last row, Late only on the second page
+    writer.write([{"Id": "A1", "Name": "One"}, {"Id": "A2", "Region": "EU"}])
+    state = writer.checkpoint()
+    writer.close()
+    resumed = CsvWriter(output, None, state)
+    resumed.write([{"Id": "A3", "Late": True}])
+    resumed.close()
+
+    with open(output) as f:
+        rows = list(csv.DictReader(f))
+    assert state["columns"] == ["Id", "Name", "Region"]
+    assert rows == [
+        {"Id": "A1", "Name": "One", "Region": ""},
+        {"Id": "A2", "Name": "", "Region": "EU"},
+        {"Id": "A3", "Name": "", "Region": ""},
+    ]
+
+
+def test_resume_after_interruption(tmp_path):
+    with pytest.raises(ExportError):
+        export(tmp_path, "accounts.ndjson", Format.ndjson, page_size=100, concurrency=1, fail_after=4)
+    checkpoint = json.loads((tmp_path / "accounts.ndjson.checkpoint").read_text())
+    assert checkpoint["next_offset"] == 400
+
+    stats, transport = export(tmp_path, "accounts.ndjson", Format.ndjson, page_size=100, concurrency=1, resume=True)
+    assert stats["resumed_from"] == 400
+    assert transport.offsets[0] == 400
+    ids = [json.loads(line)["Id"] for line in (tmp_path / "accounts.ndjson").read_text().splitlines()]
+    assert ids == [f"ACC{i:09d}" for i in range(1, 1051)]
+
+    # A checkpoint can't be reused for a different export
+    (tmp_path / "accounts.ndjson.checkpoint").write_text(json.dumps({**checkpoint, "settings": {"page_size": 5}}))
+    with pytest.raises(ExportError):
+        export(tmp_path, "accounts.ndjson", Format.ndjson, page_size=100, resume=True)
+
+
+def test_parquet_parts(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    stats, _ = export(tmp_path, "accounts.parquet", Format.parquet, page_size=100, rows_per_part=300, fields=["Id", "Amount"])
+    parts = sorted(path.name for path in (tmp_path / "accounts.parquet").iterdir())
+    assert parts == [f"part-{i:05d}.parquet" for i in range(4)]
+    frame = pd.read_parquet(tmp_path / "accounts.parquet")
+    assert len(frame) == stats["records"] == 1050
+    assert list(frame.columns) == ["Id", "Amount"]
+
+
+def test_parquet_parts_share_one_schema(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    from conga_export import ParquetWriter
+
+    output = tmp_path / "sparse.parquet"
+    writer = ParquetWriter(output, None, rows_per_part=2)
+    # Notes is all-null and Amount missing in the first part; Region only appears on the first page's last row
+    writer.write([{"Id": "A1", "Notes": None}, {"Id": "A2", "Notes": None, "Amount": 1.5, "Region": "EU"}])
+    writer.write([{"Id": "A3", "Notes": "renewed", "Amount": None}, {"Id": "A4", "Notes": 7, "Late": True}])
+    assert writer.checkpoint() == {"parts": 2}
+
+    # A resumed run keeps the schema of the parts already written
+    resumed = ParquetWriter(output, None, {"parts": 2}, rows_per_part=2)
+    resumed.write([{"Id": "A5", "Amount": 3}])
+    resumed.close()
+
+    frame = pd.read_parquet(output)
+    assert list(frame.columns) == ["Id", "Notes", "Amount", "Region"]
+    assert list(frame["Id"]) == ["A1", "A2", "A3", "A4", "A5"]
+    assert list(frame["Notes"].fillna("")) == ["", "", "renewed", "7", ""]
+    assert frame["Amount"].tolist()[1::3] == [1.5, 3.0]
+    assert frame["Region"].tolist()[1] == "EU"
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import httpx
+
+from conga_probe import Probe, ProbeEngine, describe_status
+
+
+def delayed_transport(delays):
+    """Mock transport answering each path after the given delay in seconds."""
+    async def handler(request):
+        delay = delays.get(request.url.path, 0)
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    return httpx.MockTransport(handler)
+
+
+def run(probes, deadline=None, **options):
+    async def main():
+        async with ProbeEngine(**options) as engine:
+            return await engine.run(probes, deadline=deadline)
+
+    return asyncio.run(main())
+
+
+def test_probes_run_concurrently_and_keep_order():
+    delays = {f"/{i}": 0.2 - i * 0.02 for i in range(8)}
+    probes = [Probe(f"https://conga.test/{i}") for i in range(8)]
+    started = time.perf_counter()
+    results = run(probes, transport=delayed_transport(delays), concurrency=8)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.6
+    assert [result.json()["path"] for result in results] == [f"/{i}" for i in range(8)]
+    assert all(result.ok and result.size > 0 for result in results)
+
+
+def test_deadline_marks_unfinished_probes():
+    probes = [Probe("https://conga.test/fast"), Probe("https://conga.test/slow")]
+    results = run(probes, deadline=0.2, transport=delayed_transport({"/slow": 5}))
+    assert results[0].ok
+    assert results[1].status is None
+    assert "Deadline" in results[1].error
+
+
+def test_per_host_rate_limit_spaces_requests():
+    probes = [Probe(f"https://conga.test/{i}") for i in range(5)]
+    started = time.perf_counter()
+    run(probes, transport=delayed_transport({}), per_host_rate=20)
+    # Five requests at 20/s need at least four 50ms gaps
+    assert time.perf_counter() - started >= 0.2
+
+
+def test_rate_limited_probes_do_not_hold_concurrency_slots():
+    sent = {}
+
+    async def handler(request):
+        sent[request.url.host + request.url.path] = time.perf_counter()
+        return httpx.Response(200)
+
+    probes = [Probe(f"https://slow.test/{i}") for i in range(3)] + [Probe("https://other.test/")]
+    started = time.perf_counter()
+    results = run(probes, transport=httpx.MockTransport(handler), concurrency=1, per_host_rate=4)
+    assert all(result.ok for result in results)
+    # slow.test/1 and /2 wait 0.25s and 0.5s for their turn, outside the single slot
+    assert sent["other.test/"] - started < 0.2
+    assert sent["slow.test/2"] - started >= 0.45
+
+
+def test_invalid_url_is_a_failed_result():
+    probes = [Probe("https://conga.test/ok"), Probe("http://[bad"), Probe("https://conga.test:abc/")]
+    results = run(probes, transport=delayed_transport({}))
+    assert results[0].ok
+    assert all(not result.ok and result.error for result in results[1:])
+
+
+def test_describe_status():
+    assert describe_status(200) == "✅ 200"
+    assert describe_status(401) == "🔐 401 (Auth required)"
+    assert describe_status(500) == "⚠️  500"
@@ -0,0 +1,168 @@
+import asyncio
+
+import httpx
+
+import server
+from conga_client import CongaClient
+from conga_config import CLIENT_ID, CLIENT_SECRET
+from conga_proxy import CongaProxy
+from mock_conga_api import MockSettings, create_app
+
+
+def make_proxy(ttl=60, stale=300, write_paths=(), **settings):
+    conga = CongaClient(
+        "http://mock.test/api/data", "http://mock.test/api/v1/auth/connect/token", CLIENT_ID, CLIENT_SECRET,
+        transport=httpx.ASGITransport(app=create_app(settings=MockSettings(records=50, **settings))),
+    )
+    return CongaProxy(conga, ttl=ttl, stale=stale, cache_paths=["/v1/objects", "*/summary"], write_paths=write_paths)
+
+
+def backend(monkeypatch, proxy):
+    monkeypatch.setattr(server, "conga_proxy", proxy)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://backend.test")
+
+
+def test_cacheable_gets_share_one_upstream_call(monkeypatch):
+    async def run():
+        proxy = make_proxy()
+        async with backend(monkeypatch, proxy) as api:
+            first = await api.get("/api/conga/v1/objects")
+            second = await api.get("/api/conga/v1/objects")
+            revalidated = await api.get("/api/conga/v1/objects", headers={"If-None-Match": first.headers["etag"]})
+            summaries = [await api.get("/api/conga/v1/objects/Lead/summary") for _ in range(3)]
+            records = [await api.get("/api/conga/v1/objects/Lead", params={"limit": 5}) for _ in range(2)]
+            missing = await api.get("/api/conga/v1/objects/Nope/summary")
+            stats = (await api.get("/api/conga-proxy/stats")).json()
+        await proxy.client.close()
+        return first, second, revalidated, summaries, records, missing, stats
+
+    first, second, revalidated, summaries, records, missing, stats = asyncio.run(run())
+    assert first.status_code == second.status_code == 200
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert first.json()[0]["Name"] == "Account" and second.content == first.content
+    assert revalidated.status_code == 304
+    assert [r.headers["x-cache"] for r in summaries] == ["MISS", "HIT", "HIT"]
+    assert [r.headers["x-cache"] for r in records] == ["BYPASS", "BYPASS"]
+    assert records[0].json()["Data"][0]["Id"] == "LEA000000001"
+
+    # Errors pass through with their status but are never cached
+    assert missing.status_code == 404
+    assert stats["hits"] == 4 and stats["misses"] == 3 and stats["bypassed"] == 2
+    assert stats["upstream_requests"] == 5
+    assert stats["token_requests"] == 1
+
+
+def test_stale_entries_are_served_while_refreshed(monkeypatch):
+    async def run():
+        proxy = make_proxy(ttl=0.05)
+        async with backend(monkeypatch, proxy) as api:
+            await api.get("/api/conga/v1/objects")
+            await asyncio.sleep(0.1)
+            stale = await api.get("/api/conga/v1/objects")
+            await asyncio.gather(*proxy._refreshing.values())
+            fresh = await api.get("/api/conga/v1/objects")
+            bypassed = await api.get("/api/conga/v1/objects", headers={"Cache-Control": "no-cache"})
+        await proxy.client.close()
+        return stale, fresh, bypassed, proxy.stats()
+
+    stale, fresh, bypassed, stats = asyncio.run(run())
+    assert stale.headers["x-cache"] == "STALE"
+    assert fresh.headers["x-cache"] == "HIT"
+    assert bypassed.headers["x-cache"] == "MISS"
+    assert stats["refreshes"] == 1 and stats["refresh_failures"] == 0
+    assert stats["upstream_requests"] == 3
+
+
+def test_writes_bypass_and_clear_the_cache(monkeypatch):
+    async def run():
+        proxy = make_proxy(write_paths=["/v1/objects/Lead/*"])
+        async with backend(monkeypatch, proxy) as api:
+            await api.get("/api/conga/v1/objects/Lead/summary")
+            patched = await api.patch("/api/conga/v1/objects/Lead/LEA000000002", json={"Status": "Closed"})
+            after = await api.get("/api/conga/v1/objects/Lead/summary")
+        await proxy.client.close()
+        return patched, after
+
+    patched, after = asyncio.run(run())
+    assert patched.headers["x-cache"] == "BYPASS"
+    assert patched.json()["Status"] == "Closed"
+    assert after.headers["x-cache"] == "MISS"
+
+
+def test_proxy_is_read_only_by_default(monkeypatch):
+    async def run():
+        proxy = make_proxy(write_paths=["/v1/objects/Lead/*"])
+        async with backend(monkeypatch, proxy) as api:
+            lead = await api.patch("/api/conga/v1/objects/Lead/LEA000000002", json={"Status": "Closed"})
+            account = await api.patch("/api/conga/v1/objects/Account/ACC000000002", json={"Status": "Closed"})
+            deleted = await api.delete("/api/conga/v1/objects/Account/ACC000000002")
+            unchanged = await api.get("/api/conga/v1/objects/Account/ACC000000002")
+        await proxy.client.close()
+        return lead, account, deleted, unchanged, proxy.stats()
+
+    lead, account, deleted, unchanged, stats = asyncio.run(run())
+    assert lead.status_code == 200
+    assert account.status_code == deleted.status_code == 405
+    assert account.headers["allow"] == "GET"
+    assert unchanged.json()["Status"] != "Closed"
+    assert stats["upstream_requests"] == 2
+
+
+def test_cache_key_includes_accept(monkeypatch):
+    async def run():
+        proxy = make_proxy()
+        async with backend(monkeypatch, proxy) as api:
+            json_body = await api.get("/api/conga/v1/objects", headers={"Accept": "application/json"})
+            other = await api.get("/api/conga/v1/objects", headers={"Accept": "application/xml"})
+            again = await api.get("/api/conga/v1/objects", headers={"Accept": "application/json"})
+        await proxy.client.close()
+        return json_body, other, again
+
+    json_body, other, again = asyncio.run(run())
+    assert [r.headers["x-cache"] for r in (json_body, other, again)] == ["MISS", "MISS", "HIT"]
+
+
+def test_proxy_disabled_without_credentials(monkeypatch):
+    async def run():
+        async with backend(monkeypatch, None) as api:
+            return await api.get("/api/conga/v1/objects"), await api.get("/api/conga-proxy/stats")
+
+    response, stats = asyncio.run(run())
+    assert response.status_code == 503
+    assert stats.json() == {"enabled": False}
+
+
+def test_identical_concurrent_gets_are_coalesced():
+    async def burst(coalesce):
+        proxy = make_proxy(ttl=0, latency_ms=20)
+        proxy.client.coalesce = coalesce
+        results = await asyncio.gather(*(proxy.forward("GET", "/v1/objects", []) for _ in range(10)))
+        await proxy.client.close()
+        return results, proxy.stats()
+
+    results, stats = asyncio.run(burst(True))
+    assert {entry.body for entry, _ in results} == {results[0][0].body}
+    assert stats["upstream_requests"] == 1
+    assert stats["coalesced"] == 9 and stats["coalesced_ratio"] == 0.9
+
+    results, stats = asyncio.run(burst(False))
+    assert stats["upstream_requests"] == 10 and stats["coalesced"] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_request():
+    async def run():
+        proxy = make_proxy(latency_ms=20)
+        first = asyncio.create_task(proxy.client.request("GET", "/v1/objects/Lead", {"limit": 1}))
+        second = asyncio.create_task(proxy.client.request("GET", "/v1/objects/Lead", {"limit": 1}))
+        other = asyncio.create_task(proxy.client.request("GET", "/v1/objects/Lead", {"limit": 2}))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        response = await second
+        await other
+        await proxy.client.close()
+        return first, response, proxy.client.stats()
+
+    first, response, stats = asyncio.run(run())
+    assert first.cancelled()
+    assert response.json()["Data"][0]["Id"] == "LEA000000001"
+    assert stats["requests"] == 2 and stats["coalesced"] == 1 and stats["in_flight"] == 0
@@ -0,0 +1,180 @@
+import asyncio
+import json
+import os
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from conga_client import CongaClient
+from conga_config import CLIENT_ID, CLIENT_SECRET
+from conga_sync import CHECKPOINT_COLLECTION, INITIAL_WATERMARK, CongaSyncWorker
+from mock_conga_api import MockSettings, create_app
+
+BASE_URL = "http://mock.test/api/data"
+
+
+def make_client(app):
+    return CongaClient(
+        BASE_URL, "http://mock.test/api/v1/auth/connect/token", CLIENT_ID, CLIENT_SECRET,
+        transport=httpx.ASGITransport(app=app),
+    )
+
+
+def test_second_sync_only_fetches_changed_records(mongo_url):
+    async def run():
+        app = create_app(settings=MockSettings(records=45, types=("Account", "Contact")))
+        conga = make_client(app)
+        mongo = AsyncIOMotorClient(mongo_url)
+        db = mongo[os.environ["DB_NAME"]]
+        worker = CongaSyncWorker(conga, db, ["Account", "Contact"], page_size=10)
+
+        first = await worker.sync_all()
+        unchanged = await worker.sync_object("Account")
+
+        for record in ("ACC000000003", "ACC000000040"):
+            response = await conga.http.patch(
+                f"{BASE_URL}/v1/objects/Account/{record}",
+                json={"Status": "Renewed"},
+                headers={"Authorization": f"Bearer {await conga.token()}"},
+            )
+            assert response.status_code == 200
+        requests_before = conga.requests
+        delta = await worker.sync_object("Account")
+        delta_requests = conga.requests - requests_before
+
+        renewed = await db.conga_account.count_documents({"Status": "Renewed"})
+        counts = (await db.conga_account.count_documents({}), await db.conga_contact.count_documents({}))
+        checkpoint = await db[CHECKPOINT_COLLECTION].find_one({"_id": "Account"})
+        mongo.close()
+        await conga.close()
+        return first, unchanged, delta, delta_requests, renewed, counts, checkpoint
+
+    first, unchanged, delta, delta_requests, renewed, counts, checkpoint = asyncio.run(run())
+    assert first["Account"]["upserted"] == first["Contact"]["upserted"] == 45
+    assert counts == (45, 45)
+
+    # Only the record at the watermark comes back, and it is recognised as applied
+    assert unchanged["fetched"] == unchanged["skipped"] == 1
+    assert unchanged["upserted"] == unchanged["modified"] == 0
+
+    assert delta["modified"] == 2 and delta["upserted"] == 0
+    assert delta_requests == 1
+    assert renewed == 2
+    assert checkpoint["watermark"] == delta["watermark"]
+    assert checkpoint["boundary_ids"][-1] == "ACC000000040"
+
+
+def test_interrupted_sync_resumes_from_checkpoint(mongo_url):
+    async def run():
+        app = create_app(settings=MockSettings(records=30, types=("Account",)))
+        conga = make_client(app)
+        mongo = AsyncIOMotorClient(mongo_url)
+        db = mongo[os.environ["DB_NAME"]]
+        worker = CongaSyncWorker(conga, db, ["Account"], page_size=10)
+
+        list_records = conga.list_records
+        calls = []
+
+        async def failing_list_records(*args, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 2:
+                raise RuntimeError("connection reset")
+            return await list_records(*args, **kwargs)
+
+        conga.list_records = failing_list_records
+        failed = await worker.sync_all()
+        stored = await db.conga_account.count_documents({})
+        resumed = await worker.sync_object("Account")
+        total = await db.conga_account.count_documents({})
+        mongo.close()
+        await conga.close()
+        return failed, stored, resumed, total, calls
+
+    failed, stored, resumed, total, calls = asyncio.run(run())
+    assert "connection reset" in failed["Account"]["error"]
+    assert stored == 10
+    # Every page continues from the last record applied; the resumed run asks for the failed page again
+    assert calls[0]["modified_since"] == INITIAL_WATERMARK
+    assert calls[1]["modified_since"] == calls[2]["modified_since"] != INITIAL_WATERMARK
+    assert {call["offset"] for call in calls} == {0}
+    assert resumed["upserted"] == 20 and resumed["skipped"] == resumed["pages"] == 3
+    assert total == 30
+
+
+class UnsortedTransport(httpx.ASGITransport):
+    """Mock API that ignores orderBy and pages filtered records newest Id first."""
+
+    async def handle_async_request(self, request):
+        params = request.url.params
+        if request.method != "GET" or "modifiedSince" not in params:
+            return await super().handle_async_request(request)
+        everything = request.url.copy_merge_params({"offset": 0, "limit": 1000}).copy_remove_param("orderBy")
+        response = await super().handle_async_request(httpx.Request("GET", everything, headers=request.headers))
+        await response.aread()
+        body = json.loads(response.content)
+        data = sorted(body["Data"], key=lambda record: record["Id"], reverse=True)
+        offset, limit = int(params["offset"]), int(params["limit"])
+        return httpx.Response(200, json={**body, "Data": data[offset:offset + limit]})
+
+
+def test_unsorted_pages_fail_without_moving_the_watermark(mongo_url):
+    async def run():
+        app = create_app(settings=MockSettings(records=45, types=("Account",)))
+        conga = CongaClient(
+            BASE_URL, "http://mock.test/api/v1/auth/connect/token", CLIENT_ID, CLIENT_SECRET,
+            transport=UnsortedTransport(app=app),
+        )
+        mongo = AsyncIOMotorClient(mongo_url)
+        db = mongo[os.environ["DB_NAME"]]
+        worker = CongaSyncWorker(conga, db, ["Account"], page_size=10)
+
+        results = await worker.sync_all()
+        stored = await db.conga_account.count_documents({})
+        checkpoint = await db[CHECKPOINT_COLLECTION].find_one({"_id": "Account"})
+        mongo.close()
+        await conga.close()
+        return results, stored, checkpoint
+
+    results, stored, checkpoint = asyncio.run(run())
+    assert "out of (ModifiedDate, Id) order" in results["Account"]["error"]
+    assert stored == 0 and checkpoint is None
+
+
+def test_record_changed_between_pages_is_not_skipped(mongo_url):
+    async def run():
+        app = create_app(settings=MockSettings(records=30, types=("Account",)))
+        conga = make_client(app)
+        mongo = AsyncIOMotorClient(mongo_url)
+        db = mongo[os.environ["DB_NAME"]]
+        worker = CongaSyncWorker(conga, db, ["Account"], page_size=10)
+
+        list_records = conga.list_records
+        calls = []
+
+        async def changing_list_records(*args, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 2:
+                # Moves to the end of the ModifiedDate order; with offsets the
+                # rows after it shift down and one would fall between pages
+                response = await conga.http.patch(
+                    f"{BASE_URL}/v1/objects/Account/ACC000000003",
+                    json={"Status": "Renewed"},
+                    headers={"Authorization": f"Bearer {await conga.token()}"},
+                )
+                assert response.status_code == 200
+            return await list_records(*args, **kwargs)
+
+        conga.list_records = changing_list_records
+        first = await worker.sync_object("Account")
+        ids = sorted(await db.conga_account.distinct("Id"))
+        renewed = await db.conga_account.count_documents({"Status": "Renewed"})
+        again = await worker.sync_object("Account")
+        mongo.close()
+        await conga.close()
+        return first, ids, renewed, again
+
+    first, ids, renewed, again = asyncio.run(run())
+    assert ids == [f"ACC{position:09d}" for position in range(1, 31)]
+    assert renewed == 1
+    assert first["upserted"] == 30 and first["modified"] == 1
+    assert again["fetched"] == again["skipped"] == 1
@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+import httpx
+
+from har_replay import compare, endpoint_of, load_har, replay
+from mock_conga_api import MockSettings, create_app
+
+
+def har_entry(started, method, url, status, time_ms):
+    # Shaped like the sidepanel's exportNetworkLog entries
+    return {
+        "startedDateTime": started,
+        "time": time_ms,
+        "request": {"method": method, "url": url, "httpVersion": "HTTP/1.1", "cookies": [], "headers": [],
+                    "queryString": [], "headersSize": -1, "bodySize": -1},
+        "response": {"status": status, "statusText": "", "httpVersion": "HTTP/1.1", "cookies": [], "headers": [],
+                     "content": {"size": 0, "mimeType": "application/json"}, "redirectURL": "",
+                     "headersSize": -1, "bodySize": -1},
+        "cache": {},
+        "timings": {"send": 0, "wait": time_ms, "receive": 0},
+    }
+
+
+def write_har(path):
+    page = "https://rls-preview.congacloud.eu/api/data"
+    entries = [
+        har_entry("2026-10-17T09:00:00.500Z", "GET", f"{page}/v1/objects/Account?limit=5", 200, 40),
+        har_entry("2026-10-17T09:00:00.000Z", "GET", f"{page}/v1/objects", 200, 120),
+        har_entry("2026-10-17T09:00:00.700Z", "GET", f"{page}/v1/objects/Account/ACC000000002", 200, 30),
+        har_entry("2026-10-17T09:00:00.800Z", "GET", f"{page}/v1/objects/Account/ACC000000003", 200, 35),
+        har_entry("2026-10-17T09:00:00.900Z", "PATCH", f"{page}/v1/objects/Account/ACC000000003", 200, 50),
+        har_entry("2026-10-17T09:00:01.000Z", "GET", "https://rls-preview.congacloud.eu/ui/app.js", 200, 10),
+    ]
+    path.write_text(json.dumps({"log": {"version": "1.2", "creator": {"name": "Conga Inspector", "version": "1.0.0"},
+                                        "entries": entries}}))
+
+
+def test_load_har_keeps_data_api_gets_in_order(tmp_path):
+    har = tmp_path / "capture.har"
+    write_har(har)
+    requests = load_har(str(har))
+
+    assert [r.path for r in requests] == [
+        "/v1/objects", "/v1/objects/Account?limit=5",
+        "/v1/objects/Account/ACC000000002", "/v1/objects/Account/ACC000000003",
+    ]
+    assert [round(r.offset, 3) for r in requests] == [0.0, 0.5, 0.7, 0.8]
+    assert requests[2].endpoint == requests[3].endpoint == "GET /v1/objects/Account/{id}"
+    assert len(load_har(str(har), methods=("GET", "PATCH"))) == 5
+    assert endpoint_of("GET", "/v1/objects/Account?limit=5") == "GET /v1/objects/Account"
+
+
+def test_replay_against_mock_and_flag_regressions(tmp_path):
+    har = tmp_path / "capture.har"
+    write_har(har)
+    requests = load_har(str(har))
+    transport = httpx.ASGITransport(app=create_app(settings=MockSettings(records=10, require_auth=False)))
+
+    results = asyncio.run(replay(requests, "http://mock.test/api/data", speed=10, transport=transport))
+    report = compare(requests, results)
+
+    assert [result.status for result in results] == [200] * 4
+    assert report["requests"] == 4 and report["errors"] == 0 and report["status_mismatches"] == 0
+    assert report["endpoints"]["GET /v1/objects/Account/{id}"]["recorded_p95_ms"] == 35
+    assert report["regressions"] == []
+
+    baseline = {"endpoints": {name: {**stats, "p95_ms": stats["p95_ms"] / 10}
+                              for name, stats in report["endpoints"].items()}}
+    regressed = compare(requests, results, baseline, max_regression=25)
+    assert regressed["regressions"] == sorted(report["endpoints"])
+    assert regressed["endpoints"]["GET /v1/objects"]["p95_change_pct"] > 25
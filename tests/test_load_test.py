@@ -0,0 +1,63 @@
+import asyncio
+
+import httpx
+
+from load_test import Sample, percentile, run_load, summarize, timeline
+from mock_conga_api import MockSettings, create_app
+from test_final_extension import TEST_SCENARIOS
+
+
+def mock_transport(**settings):
+    return httpx.ASGITransport(app=create_app(settings=MockSettings(require_auth=False, **settings)))
+
+
+def test_percentiles_and_summary():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([], 95) == 0.0
+
+    samples = [Sample(0.1, 0.01, "a", 200, None), Sample(1.2, 0.03, "a", 503, None), Sample(1.5, 0.02, "b", None, "timeout")]
+    stats = summarize(samples, duration=2.0)
+    assert stats["requests"] == 3 and stats["errors"] == 2
+    assert stats["throughput_rps"] == 1.5
+    assert stats["status_codes"] == {"200": 1, "503": 1, "error": 1}
+    assert [row["requests"] for row in timeline(samples)] == [1, 2]
+
+
+def test_rejected_requests_stay_out_of_latencies():
+    samples = [Sample(0.0, 0.2, "a", 200, None)] + [Sample(0.1, None, "a", None, "max in-flight reached")] * 9
+    stats = summarize(samples, duration=1.0)
+    assert stats["requests"] == 10 and stats["errors"] == 9 and stats["rejected"] == 9
+    assert stats["latency_ms"]["mean"] == stats["latency_ms"]["p50"] == stats["latency_ms"]["p99"] == 200
+    assert timeline(samples)[0]["p50_ms"] == 200
+
+    report = asyncio.run(run_load(
+        TEST_SCENARIOS, "http://mock.test/api/data", mode="open", rps=100, duration=0.3, max_in_flight=1,
+        transport=mock_transport(latency_ms=50),
+    ))
+    overall = report["overall"]
+    assert overall["rejected"] > overall["requests"] / 2
+    assert overall["latency_ms"]["p50"] >= 50
+
+
+def test_open_loop_keeps_schedule():
+    report = asyncio.run(run_load(
+        TEST_SCENARIOS, "http://mock.test/api/data", mode="open", rps=100, duration=0.5,
+        transport=mock_transport(latency_ms=5),
+    ))
+    assert report["overall"]["requests"] == 50
+    assert report["overall"]["errors"] == 0
+    assert set(report["scenarios"]) == {scenario["name"] for scenario in TEST_SCENARIOS}
+    assert report["overall"]["latency_ms"]["p50"] >= 5
+
+
+def test_closed_loop_counts_injected_errors():
+    report = asyncio.run(run_load(
+        TEST_SCENARIOS, "http://mock.test/api/data", mode="closed", concurrency=4, duration=0.3, warmup=0.1,
+        transport=mock_transport(error_rate=0.2, seed=1),
+    ))
+    overall = report["overall"]
+    assert overall["requests"] > 0
+    assert 0 < overall["errors"] < overall["requests"]
+    assert "503" in overall["status_codes"]
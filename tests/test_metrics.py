@@ -0,0 +1,37 @@
+import logging
+from types import SimpleNamespace
+
+from metrics import CommandMetrics, Histogram, RequestMetrics, RequestTiming, current_request
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(("/api/status",), value)
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/api/status",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/api/status",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/api/status",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/api/status"} 4' in lines
+
+
+def test_commands_are_charged_to_the_current_request(caplog):
+    commands = CommandMetrics()
+    requests = RequestMetrics(slow_request_seconds=0.5)
+    timing = RequestTiming(capture_commands=True)
+    token = current_request.set(timing)
+    try:
+        for request_id, name, micros in ((1, "find", 400000), (2, "getMore", 250000)):
+            command = {name: "status_checks", "filter": {"client_name": "agent"}, "lsid": "x"}
+            commands.started(SimpleNamespace(request_id=request_id, command=command))
+            commands.succeeded(SimpleNamespace(request_id=request_id, command_name=name, duration_micros=micros))
+    finally:
+        current_request.reset(token)
+
+    assert timing.db_commands == 2
+    assert abs(timing.db_seconds - 0.65) < 1e-9
+    with caplog.at_level(logging.WARNING, logger="metrics"):
+        requests.record("GET", "/api/status", 200, 0.8, timing)
+    assert "slowest: find 400.0ms" in caplog.text
+    assert "'client_name': 'agent'" in caplog.text
+    assert "lsid" not in caplog.text
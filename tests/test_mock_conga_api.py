@@ -0,0 +1,82 @@
+from fastapi.testclient import TestClient
+
+import conga_config
+from mock_conga_api import BASE_PATH, TOKEN_PATH, MockSettings, create_app
+
+
+def client(**settings):
+    return TestClient(create_app(settings=MockSettings(**settings)))
+
+
+def authorize(api):
+    response = api.post(TOKEN_PATH, data={
+        "grant_type": "client_credentials",
+        "client_id": conga_config.CLIENT_ID,
+        "client_secret": conga_config.CLIENT_SECRET,
+    })
+    assert response.status_code == 200
+    assert response.json()["expires_in"] == 3600
+    api.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+
+def test_token_required_for_api_calls():
+    api = client()
+    assert api.get(f"{BASE_PATH}/v1/objects").status_code == 401
+    bad = api.post(TOKEN_PATH, data={"grant_type": "client_credentials", "client_id": "x", "client_secret": "y"})
+    assert bad.status_code == 401
+
+    authorize(api)
+    assert api.get(f"{BASE_PATH}/v1/objects").json()[0] == {"Name": "Account", "RecordCount": 1000}
+    assert api.get(f"{BASE_PATH}/swagger/v1/swagger.json").json()["info"]["version"] == "v1"
+
+
+def test_pagination_summary_and_records():
+    api = client(records=250, require_auth=False)
+    page = api.get(f"{BASE_PATH}/v1/objects/Account", params={"limit": 100, "offset": 200}).json()
+    assert page["RecordCount"] == 250
+    assert len(page["Data"]) == 50
+    assert page["Data"][0]["Id"] == "ACC000000201"
+
+    # Records are derived from their position, so every call agrees
+    record = api.get(f"{BASE_PATH}/v1/objects/account/ACC000000201").json()
+    assert record == page["Data"][0]
+    assert api.get(f"{BASE_PATH}/v1/objects/Account/ACC000000251").status_code == 404
+    assert api.get(f"{BASE_PATH}/v1/objects/Account/CON000000001").status_code == 404
+    assert api.get(f"{BASE_PATH}/v1/objects/Widget").status_code == 404
+
+    summary = api.get(f"{BASE_PATH}/v1/objects/Contact/summary").json()
+    assert summary["ObjectName"] == "Contact" and summary["RecordCount"] == 250
+
+
+def test_error_injection_is_seeded():
+    def statuses(seed):
+        api = client(require_auth=False, error_rate=0.5, error_status=500, seed=seed)
+        return [api.get(f"{BASE_PATH}/v1/objects/Lead/summary").status_code for _ in range(40)]
+
+    first = statuses(seed=7)
+    assert set(first) == {200, 500}
+    assert statuses(seed=7) == first
+
+
+def test_modified_since_lists_edits_last():
+    api = client(records=50, require_auth=False)
+    records = f"{BASE_PATH}/v1/objects/Contact"
+    since = api.get(f"{records}/CON000000045").json()["ModifiedDate"]
+    edited = api.patch(f"{records}/CON000000010", json={"Status": "Closed", "Id": "ignored"}).json()
+    assert edited["Id"] == "CON000000010" and edited["ModifiedDate"] > since
+
+    page = api.get(records, params={"modifiedSince": since, "limit": 4}).json()
+    assert page["RecordCount"] == 7
+    assert [r["Id"] for r in page["Data"]] == ["CON000000045", "CON000000046", "CON000000047", "CON000000048"]
+    tail = api.get(records, params={"modifiedSince": since, "offset": 4}).json()["Data"]
+    assert [r["Id"] for r in tail] == ["CON000000049", "CON000000050", "CON000000010"]
+
+    # An edited record moves out of its old place in the modified order
+    early = api.get(records, params={"modifiedSince": "2024-01-01T00:00:00Z", "limit": 10}).json()["Data"]
+    assert "CON000000010" not in [r["Id"] for r in early]
+    assert api.get(records, params={"modifiedSince": "yesterday"}).status_code == 400
+
+    # The client's explicit sort is the mock's only order; anything else is refused
+    ordered = api.get(records, params={"orderBy": "ModifiedDate ASC, Id ASC", "offset": 48}).json()["Data"]
+    assert [r["Id"] for r in ordered] == ["CON000000050", "CON000000010"]
+    assert api.get(records, params={"orderBy": "Name DESC"}).status_code == 400
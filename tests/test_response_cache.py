@@ -0,0 +1,70 @@
+import asyncio
+
+import server
+from response_cache import CachedResponse, LocalCacheStore, ResponseCache, make_etag
+
+
+def entry(body):
+    return CachedResponse(body, make_etag(body), "application/json", {})
+
+
+def test_lru_eviction_and_expiry():
+    async def run():
+        store = LocalCacheStore(max_entries=2)
+        await store.set("a", entry(b"a"), ttl=60)
+        await store.set("b", entry(b"b"), ttl=60)
+        await store.get("a")
+        await store.set("c", entry(b"c"), ttl=60)
+        await store.set("d", entry(b"d"), ttl=-1)
+        return [await store.get(key) is not None for key in "abcd"]
+
+    # "b" was least recently used when "c" arrived; "d" expired on arrival
+    assert asyncio.run(run()) == [False, False, True, False]
+
+
+def test_invalidation_only_affects_its_namespace():
+    async def run():
+        cache = ResponseCache(LocalCacheStore(), ttl=60)
+        await cache.set("status_checks", "/api/status?", entry(b"[]"), await cache.generation("status_checks"))
+        await cache.set("root", "/api/?", entry(b"{}"), await cache.generation("root"))
+        before = await cache.get("status_checks", "/api/status?")
+        await cache.invalidate("status_checks")
+        return before, await cache.get("status_checks", "/api/status?"), await cache.get("root", "/api/?"), cache
+
+    before, after, other, cache = asyncio.run(run())
+    assert before.body == b"[]"
+    assert after is None
+    assert other.body == b"{}"
+    assert (cache.hits, cache.misses, cache.invalidations) == (2, 1, 1)
+
+
+def test_read_racing_a_write_is_not_cached():
+    async def run():
+        cache = ResponseCache(LocalCacheStore(), ttl=60)
+        rendering, written = asyncio.Event(), asyncio.Event()
+
+        async def read():
+            generation = await cache.generation("status_checks")
+            assert await cache.get("status_checks", "/api/status?", generation) is None
+            rendering.set()
+            await written.wait()  # the body was rendered from the pre-write data
+            await cache.set("status_checks", "/api/status?", entry(b"[]"), generation)
+
+        async def write():
+            await rendering.wait()
+            await cache.invalidate("status_checks")
+            written.set()
+
+        await asyncio.gather(read(), write())
+        return await cache.get("status_checks", "/api/status?")
+
+    assert asyncio.run(run()) is None
+
+
+def test_etag_matching():
+    etag = make_etag(b"[]")
+    assert server.etag_matches(etag, etag)
+    assert server.etag_matches(etag, f'"other", W/{etag}')
+    assert server.etag_matches(etag, "*")
+    assert not server.etag_matches(etag, '"other"')
+    assert not server.etag_matches(etag, None)
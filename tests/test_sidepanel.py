@@ -0,0 +1,98 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+HARNESS = Path(__file__).resolve().parent / "sidepanel_harness.js"
+
+
+def run_panel(scenario):
+    """Result of a side panel scenario run by sidepanel_harness.js; skips without node."""
+    node = shutil.which("node")
+    if not node:
+        pytest.skip("node is not installed")
+    completed = subprocess.run([node, str(HARNESS)], input=scenario, capture_output=True, text=True, timeout=60)
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout)
+
+
+def test_reopened_panel_at_capacity_still_tracks_new_calls():
+    result = run_panel("""
+        const first = panel();
+        await first.run('initializeNetworkMonitor()');
+        const calls = [];
+        const max = first.run('MAX_NETWORK_REQUESTS');
+        for (let id = 1; id <= max; id++) {
+            calls.push(['c', id, 'GET', `/api/data/v1/objects/Account/${id}`, new Date(1e12 + id).toISOString()],
+                       ['r', id, 200, 5, 10, 100, 'application/json'], ['t', id, 4, 12, 100]);
+        }
+        calls.push(['c', max + 1, 'GET', '/api/data/v1/objects', new Date(2e12).toISOString()]);
+        first.send(calls);
+        await first.run('persistNetworkRequests()');
+        const firstLive = first.run('liveNetworkCalls.size');
+
+        const reopened = panel();
+        await reopened.run('initializeNetworkMonitor()');
+        const loaded = reopened.run('networkRequests.length');
+        reopened.send([['c', 1, 'GET', '/api/data/v1/objects/Contact', new Date(3e12).toISOString()]], 2);
+        reopened.send([['r', 1, 201, 7, 30, 50, 'application/json']], 2);
+        flush();
+        const requests = reopened.run('networkRequests');
+        const newest = requests[requests.length - 1];
+        return {
+            firstLive, loaded, stored: storedRows.size,
+            count: requests.length, first: requests[0].url,
+            newest: [newest.url, newest.status, newest.duration],
+            live: reopened.run('liveNetworkCalls.size')
+        };
+    """)
+
+    # Completed calls leave the live map; only the unanswered one stays
+    assert result["firstLive"] == 1
+    assert result["loaded"] == result["count"] == 5000
+    assert result["stored"] == 5001
+    assert result["first"].endswith("/Account/3")
+    assert result["newest"] == ["https://tenant.congacloud.eu/api/data/v1/objects/Contact", 201, 30]
+    # The response arrived before Resource Timing, which may still refine it
+    assert result["live"] == 1
+
+
+def test_live_calls_end_with_timing_or_error_in_either_order():
+    result = run_panel("""
+        const view = panel();
+        await view.run('initializeNetworkMonitor()');
+        const at = new Date(1e12).toISOString();
+        view.send([['c', 1, 'GET', '/api/data/v1/a', at], ['c', 2, 'GET', '/api/data/v1/b', at],
+                   ['c', 3, 'GET', '/api/data/v1/c', at]]);
+        view.send([['t', 1, 4, 12, 100], ['r', 2, 200, 5, 10, 100, ''], ['e', 3, 'Network error']]);
+        const pending = view.run('Array.from(liveNetworkCalls.keys())');
+        view.send([['r', 1, 200, 4, 12, 100, ''], ['t', 2, 4, 12, 100]]);
+        const requests = view.run('networkRequests');
+        return { pending, live: view.run('liveNetworkCalls.size'),
+                 requests: requests.map(r => [r.status, r.duration]) };
+    """)
+
+    assert result["pending"] == ["1:1", "1:2"]
+    assert result["live"] == 0
+    assert result["requests"] == [[200, 12], [200, 12], ["error", None]]
+
+
+def test_request_details_escape_page_supplied_fields():
+    result = run_panel("""
+        const view = panel();
+        await view.run('initializeNetworkMonitor()');
+        const markup = '<img src=x onerror=alert(1)>';
+        view.send([['c', 1, markup, `/api/data/v1/objects?q=${markup}`, new Date(1e12).toISOString()],
+                   ['r', 1, markup, 5, 10, 100, ''], ['c', 2, 'GET', '/api/data/v1/a', new Date(1e12).toISOString()],
+                   ['e', 2, markup]]);
+        return [1, 2].map(id => {
+            view.run(`selectNetworkRequest(${id})`);
+            return view.elements.requestDetails.innerHTML;
+        });
+    """)
+
+    for html in result:
+        assert "<img" not in html
+        assert "&lt;img src=x onerror=alert(1)&gt;" in html
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from status_buffer import BufferFull, StatusWriteBuffer
+
+
+class RecordingWriter:
+    def __init__(self, fail_ids=()):
+        self.batches = []
+        self.fail_ids = set(fail_ids)
+
+    async def __call__(self, documents):
+        self.batches.append([document["id"] for document in documents])
+        await asyncio.sleep(0)
+        return ["duplicate" if document["id"] in self.fail_ids else None for document in documents]
+
+
+def test_concurrent_submits_are_coalesced():
+    async def run():
+        writer = RecordingWriter()
+        buffer = StatusWriteBuffer(writer, max_items=10, max_delay_ms=50)
+        buffer.start()
+        await asyncio.gather(*(buffer.submit({"id": i}) for i in range(25)))
+        await buffer.close()
+        return writer, buffer.stats()
+
+    writer, stats = asyncio.run(run())
+    assert [len(batch) for batch in writer.batches] == [10, 10, 5]
+    assert stats["documents"] == 25
+    assert stats["batch_size_max"] == 10
+    assert stats["batch_size_buckets"]["10"] == 2
+    assert stats["batch_size_buckets"]["5"] == 1
+
+
+def test_durable_submit_reports_write_errors():
+    async def run():
+        buffer = StatusWriteBuffer(RecordingWriter(fail_ids={1}), max_delay_ms=1)
+        buffer.start()
+        results = await asyncio.gather(buffer.submit({"id": 0}), buffer.submit({"id": 1}), return_exceptions=True)
+        await buffer.close()
+        return results, buffer.stats()
+
+    results, stats = asyncio.run(run())
+    assert results[0] is None
+    assert isinstance(results[1], RuntimeError)
+    assert stats["failed"] == 1
+
+
+def test_backpressure_and_flush_on_close():
+    async def run():
+        writer = RecordingWriter()
+        # A long delay keeps everything pending until close()
+        buffer = StatusWriteBuffer(writer, max_items=100, max_delay_ms=60000, max_pending=3)
+        buffer.start()
+        for i in range(3):
+            await buffer.submit({"id": i}, wait=False)
+        with pytest.raises(BufferFull):
+            await buffer.submit({"id": 3}, wait=False)
+        await buffer.close()
+        return writer, buffer.stats()
+
+    writer, stats = asyncio.run(run())
+    assert writer.batches == [[0, 1, 2]]
+    assert stats["rejected"] == 1
+    assert stats["pending"] == 0
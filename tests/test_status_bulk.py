@@ -0,0 +1,41 @@
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorClient
+
+import server
+
+
+def test_parse_bulk_body_accepts_array_and_ndjson():
+    array = server.parse_bulk_body(b'[{"client_name": "a"}, {"client_name": "b"}]', "application/json")
+    ndjson = server.parse_bulk_body(b'{"client_name": "a"}\n\n{"client_name": "b"}\n', "application/x-ndjson")
+    assert array == ndjson == [{"client_name": "a"}, {"client_name": "b"}]
+
+
+@pytest.mark.parametrize("body", [b'{"client_name": "a"}', b"[{", b""])
+def test_parse_bulk_body_rejects_non_arrays(body):
+    with pytest.raises(HTTPException) as exc_info:
+        server.parse_bulk_body(body, "application/json")
+    assert exc_info.value.status_code == 400
+
+
+def test_duplicate_ids_fail_individually(mongo_url, monkeypatch):
+    async def run():
+        client = AsyncIOMotorClient(mongo_url)
+        monkeypatch.setattr(server, "db", client[os.environ["DB_NAME"]])
+        await server.db.status_checks.create_indexes(server.STATUS_CHECK_INDEXES)
+        documents = [
+            {"id": doc_id, "client_name": "agent", "timestamp": datetime(2024, 1, 1)}
+            for doc_id in ["a", "b", "a", "c", "b", "d"]
+        ]
+        errors = await server.insert_status_documents(documents, chunk_size=4)
+        count = await server.db.status_checks.count_documents({})
+        client.close()
+        return errors, count
+
+    errors, count = asyncio.run(run())
+    assert [error is None for error in errors] == [True, True, False, True, False, True]
+    assert count == 4
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+from pymongo import MongoClient
+
+import server
+
+
+def plan_stages(plan):
+    """Every stage name in an explain plan, however deeply nested."""
+    if isinstance(plan, dict):
+        stages = [plan["stage"]] if "stage" in plan else []
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+        return stages
+    if isinstance(plan, list):
+        return [stage for item in plan for stage in plan_stages(item)]
+    return []
+
+
+def test_projection_matches_response_model():
+    projection = dict(server.STATUS_CHECK_PROJECTION)
+    assert projection.pop("_id") == 0
+    assert set(projection) == set(server.StatusCheck.model_fields)
+
+
+def test_status_queries_use_indexes(mongo_url):
+    client = MongoClient(mongo_url)
+    collection = client[os.environ["DB_NAME"]].status_checks
+    collection.create_indexes(server.STATUS_CHECK_INDEXES)
+    start = datetime(2024, 1, 1)
+    collection.insert_many([
+        {"id": f"{i:04d}", "client_name": f"agent-{i % 5}", "timestamp": start + timedelta(seconds=i)}
+        for i in range(500)
+    ])
+
+    after = server.decode_status_cursor(server.encode_status_cursor({"id": "0250", "timestamp": start}))
+    for query in ({}, after):
+        explain = (
+            collection.find(query, server.STATUS_CHECK_PROJECTION)
+            .sort(server.STATUS_SORT)
+            .limit(server.STATUS_PAGE_SIZE + 1)
+            .explain()
+        )
+        stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+        assert "COLLSCAN" not in stages, stages
+        if not query:
+            # The first page walks the timestamp_id index in order
+            assert "SORT" not in stages, stages
+    client.close()
+
+
+def test_status_summary_uses_indexes(mongo_url):
+    client = MongoClient(mongo_url)
+    database = client[os.environ["DB_NAME"]]
+    database.status_checks.create_indexes(server.STATUS_CHECK_INDEXES)
+    start = datetime(2024, 1, 1)
+    database.status_checks.insert_many([
+        {"id": f"{i:04d}", "client_name": f"agent-{i % 5}", "timestamp": start + timedelta(minutes=i)}
+        for i in range(500)
+    ])
+
+    for client_name in (None, "agent-1"):
+        pipeline = server.status_summary_pipeline(start, start + timedelta(hours=3), "hour", client_name)
+        explain = database.command("aggregate", "status_checks", pipeline=pipeline, explain=True)
+        assert "COLLSCAN" not in plan_stages(explain)
+
+    summary = list(database.status_checks.aggregate(
+        server.status_summary_pipeline(start, start + timedelta(hours=2), "hour", "agent-1")
+    ))
+    assert summary == [{
+        "client_name": "agent-1",
+        "count": 24,
+        "last_seen": start + timedelta(minutes=116),
+        "histogram": [
+            {"bucket": start, "count": 12},
+            {"bucket": start + timedelta(hours=1), "count": 12},
+        ],
+    }]
+    client.close()
+
+
+def test_startup_skips_setup_when_mongo_is_unreachable(monkeypatch):
+    calls = []
+
+    async def ensure():
+        calls.append("ensure")
+
+    monkeypatch.setattr(server, "mongo_url", "mongodb://127.0.0.1:9/?serverSelectionTimeoutMS=30000")
+    monkeypatch.setattr(server, "MONGO_STARTUP_TIMEOUT_SECONDS", 0.2)
+    for name in ("ensure_status_collection", "ensure_indexes", "ensure_status_retention"):
+        monkeypatch.setattr(server, name, ensure)
+
+    async def run():
+        started = time.perf_counter()
+        await server.startup_db_client()
+        elapsed = time.perf_counter() - started
+        await server.shutdown_db_client()
+        return elapsed
+
+    assert asyncio.run(run()) < 5
+    assert calls == []
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+from fastapi import HTTPException, Response
+from motor.motor_asyncio import AsyncIOMotorClient
+
+import server
+
+
+def test_cursor_round_trip():
+    doc = {"id": "b", "timestamp": datetime(2024, 5, 1, 12, 30, 15, 123000)}
+    query = server.decode_status_cursor(server.encode_status_cursor(doc))
+    assert query == {"$or": [
+        {"timestamp": {"$lt": doc["timestamp"]}},
+        {"timestamp": doc["timestamp"], "id": {"$lt": "b"}},
+    ]}
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        server.decode_status_cursor("not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+def test_pages_cover_collection_without_gaps(mongo_url, monkeypatch):
+    async def run():
+        client = AsyncIOMotorClient(mongo_url)
+        monkeypatch.setattr(server, "db", client[os.environ["DB_NAME"]])
+        start = datetime(2024, 1, 1)
+        # Pairs of documents share a timestamp so the id tie-breaker is exercised
+        await server.db.status_checks.insert_many([
+            {"id": f"{i:03d}", "client_name": "agent", "timestamp": start + timedelta(seconds=i // 2)}
+            for i in range(25)
+        ])
+
+        seen, after = [], None
+        while True:
+            response = Response()
+            page = await server.get_status_checks(response, limit=7, after=after, fmt="json")
+            seen.extend(check.id for check in page)
+            after = response.headers.get("X-Next-Cursor")
+            if after is None:
+                break
+
+        streamed = await server.get_status_checks(Response(), limit=None, after=None, fmt="ndjson")
+        lines = [json.loads(line) async for line in streamed.body_iterator]
+        client.close()
+        return seen, [line["id"] for line in lines]
+
+    seen, streamed = asyncio.run(run())
+    expected = [f"{i:03d}" for i in reversed(range(25))]
+    assert seen == expected
+    assert streamed == expected
+
+
+@pytest.mark.parametrize("timestamp", [datetime(2024, 5, 1, 12, 30), datetime(2024, 5, 1, 12, 30, 15, 123000)])
+def test_fast_json_matches_model_encoding(timestamp):
+    doc = {"id": "a", "client_name": "agent", "timestamp": timestamp}
+    assert json.loads(orjson.dumps(doc)) == json.loads(server.StatusCheck(**doc).model_dump_json())
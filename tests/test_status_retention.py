@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
+
+import migrate_status_checks
+import server
+
+
+class FakeStatusChecks:
+    def __init__(self, indexes=()):
+        self.indexes = {name: {} for name in indexes}
+        self.calls = []
+
+    async def index_information(self):
+        return dict(self.indexes)
+
+    async def drop_index(self, name):
+        self.calls.append(("drop_index", name))
+
+    async def create_index(self, keys, **options):
+        self.calls.append(("create_index", keys, options))
+
+
+class FakeDatabase:
+    def __init__(self, indexes=()):
+        self.status_checks = FakeStatusChecks(indexes)
+        self.calls = self.status_checks.calls
+
+    async def command(self, name, collection, **options):
+        self.calls.append((name, collection, options))
+
+
+def test_collection_options_and_indexes_per_mode(monkeypatch):
+    monkeypatch.setattr(server, "STATUS_TIMESERIES_GRANULARITY", "minutes")
+    monkeypatch.setattr(server, "STATUS_RETENTION_SECONDS", 0)
+    assert server.status_collection_options("standard") == {}
+    assert server.status_collection_options("timeseries") == {"timeseries": {
+        "timeField": "timestamp", "metaField": "client_name", "granularity": "minutes",
+    }}
+
+    monkeypatch.setattr(server, "STATUS_RETENTION_SECONDS", 86400)
+    assert server.status_collection_options("standard") == {}
+    assert server.status_collection_options("timeseries")["expireAfterSeconds"] == 86400
+
+    standard = [index.document["name"] for index in server.status_check_indexes("standard")]
+    timeseries = [index.document["name"] for index in server.status_check_indexes("timeseries")]
+    assert standard == ["timestamp_id", "client_name_timestamp", "id_unique"]
+    # Time-series collections reject unique indexes
+    assert timeseries == ["timestamp_id", "client_name_timestamp"]
+
+
+@pytest.mark.parametrize("mode, retention, indexes, expected", [
+    ("standard", 3600, [], [("create_index", [("timestamp", 1)],
+                             {"name": "timestamp_ttl", "expireAfterSeconds": 3600})]),
+    ("standard", 7200, ["timestamp_ttl"], [("collMod", "status_checks",
+                                            {"index": {"name": "timestamp_ttl", "expireAfterSeconds": 7200}})]),
+    ("standard", 0, ["timestamp_ttl"], [("drop_index", "timestamp_ttl")]),
+    ("standard", 0, [], []),
+    ("timeseries", 3600, [], [("collMod", "status_checks", {"expireAfterSeconds": 3600})]),
+    ("timeseries", 0, [], [("collMod", "status_checks", {"expireAfterSeconds": "off"})]),
+])
+def test_ensure_status_retention(monkeypatch, mode, retention, indexes, expected):
+    database = FakeDatabase(indexes)
+    monkeypatch.setattr(server, "db", database)
+    monkeypatch.setattr(server, "STATUS_COLLECTION_MODE", mode)
+    monkeypatch.setattr(server, "STATUS_RETENTION_SECONDS", retention)
+    asyncio.run(server.ensure_status_retention())
+    assert database.calls == expected
+
+
+class FakeSource:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query, projection, batch_size):
+        since = query.get("timestamp", {}).get("$gte")
+        return [
+            {key: value for key, value in document.items() if projection.get(key)}
+            for document in self.documents if since is None or document["timestamp"] >= since
+        ]
+
+
+class FakeTarget:
+    """Keeps the first copy of each id, like a standard collection's id_unique index."""
+
+    def __init__(self):
+        self.documents = {}
+
+    def insert_many(self, batch, ordered):
+        inserted = 0
+        for document in batch:
+            if document["id"] not in self.documents:
+                self.documents[document["id"]] = document
+                inserted += 1
+        if inserted < len(batch):
+            raise BulkWriteError({"nInserted": inserted, "writeErrors": []})
+        return type("InsertManyResult", (), {"inserted_ids": list(range(inserted))})()
+
+
+def test_copy_documents_in_batches_skipping_expired_and_duplicates(capsys):
+    start = datetime(2024, 1, 1)
+    documents = [
+        {"_id": i, "id": f"{i % 8:02d}", "client_name": "agent", "timestamp": start + timedelta(hours=i)}
+        for i in range(12)
+    ]
+    target = FakeTarget()
+    copied = migrate_status_checks.copy_documents(FakeSource(documents), target, 3, since=start + timedelta(hours=2))
+
+    # Hours 2-11; ids 02-07 then 00-03 again, of which 02 and 03 are duplicates
+    assert copied == 8
+    assert sorted(target.documents) == [f"{i:02d}" for i in range(8)]
+    assert set(target.documents["00"]) == set(server.StatusCheck.model_fields)
+
+
+def run_migration(monkeypatch, mode, *options):
+    monkeypatch.setattr(sys, "argv", ["migrate_status_checks.py", "--to", mode, *options])
+    return migrate_status_checks.main()
+
+
+def test_migration_round_trip(mongo_url, monkeypatch):
+    client = MongoClient(mongo_url)
+    if tuple(client.server_info()["versionArray"][:2]) < (6, 0):
+        client.close()
+        pytest.skip("time-series retention needs MongoDB 6.0")
+    database = client[os.environ["DB_NAME"]]
+    monkeypatch.setattr(server, "mongo_url", mongo_url)
+    monkeypatch.setattr(server, "STATUS_RETENTION_SECONDS", 7 * 86400)
+
+    now = datetime.utcnow().replace(microsecond=0)
+    database.status_checks.insert_many([
+        {"id": f"{i:03d}", "client_name": f"agent-{i % 3}", "timestamp": now - timedelta(days=i % 10)}
+        for i in range(100)
+    ])
+
+    assert run_migration(monkeypatch, "timeseries", "--drop-backup") == 0
+    info = next(database.list_collections(filter={"name": "status_checks"}))
+    assert info["type"] == "timeseries"
+    assert info["options"]["expireAfterSeconds"] == 7 * 86400
+    assert info["options"]["timeseries"]["metaField"] == "client_name"
+    # Checks at 7 days or older are already past the retention window
+    assert database.status_checks.count_documents({}) == 70
+    assert not [name for name in database.list_collection_names() if name.startswith("status_checks_backup_")]
+    assert run_migration(monkeypatch, "timeseries") == 0
+
+    assert run_migration(monkeypatch, "standard") == 0
+    indexes = database.status_checks.index_information()
+    assert indexes["id_unique"]["unique"] is True
+    assert indexes[server.STATUS_TTL_INDEX_NAME]["expireAfterSeconds"] == 7 * 86400
+    assert database.status_checks.count_documents({}) == 70
+    assert migrate_status_checks.TEMP_COLLECTION not in database.list_collection_names()
+    client.close()
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+import requests
+
+from swagger_cache import SpecIndex, SwaggerCache
+
+SPEC = {
+    "swagger": "2.0",
+    "info": {"title": "Conga Data API", "version": "v1"},
+    "basePath": "/api/data",
+    "parameters": {"objectName": {"name": "objectName", "in": "path", "required": True, "type": "string"}},
+    "paths": {
+        "/objects": {"get": {"operationId": "listObjects"}},
+        "/objects/{objectName}": {
+            "parameters": [{"$ref": "#/parameters/objectName"}],
+            "get": {"parameters": [{"name": "limit", "in": "query", "type": "integer"}]},
+            "delete": {},
+        },
+        "/objects/{objectName}/fields": {"get": {}},
+        "/objectsets": {"get": {}},
+        "/metadata": {"get": {}, "parameters": []},
+    },
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code))
+
+
+class FakeSpecServer:
+    """Stands in for requests.Session and answers conditional GETs like a real server."""
+
+    def __init__(self, spec=SPEC, etag='"v1"'):
+        self.body = json.dumps(spec).encode()
+        self.etag = etag
+        self.requests = []
+        self.down = False
+
+    def get(self, url, headers, timeout):
+        if self.down:
+            raise requests.exceptions.ConnectionError("unreachable")
+        self.requests.append(headers)
+        if headers.get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.body, {"ETag": self.etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+
+def test_index_lookups():
+    index = SpecIndex.from_spec(SPEC)
+    assert index.has("/objects") and index.has("/objects/{objectName}", "delete")
+    assert not index.has("/objects", "POST") and not index.has("/missing")
+    assert index.under("/objects/") == ["/objects/{objectName}", "/objects/{objectName}/fields"]
+    assert index.under("/objects") == ["/objects", "/objects/{objectName}", "/objects/{objectName}/fields", "/objectsets"]
+
+    operation = index.operation("/objects/{objectName}")
+    assert [(p.name, p.location, p.required, p.type) for p in operation.parameters] == [
+        ("objectName", "path", True, "string"),
+        ("limit", "query", False, "integer"),
+    ]
+    assert [p.name for p in operation.path_parameters] == ["objectName"]
+    assert len(list(index.operations("GET"))) == 5
+
+
+def test_revalidates_with_etag_and_survives_restarts(tmp_path):
+    server = FakeSpecServer()
+    cache = SwaggerCache("https://conga.test/swagger.json", tmp_path, max_age=0, session=server)
+    assert cache.load().has("/metadata")
+    assert cache.last_source == "downloaded"
+
+    # A new process revalidates the pickled index and gets a 304
+    cache = SwaggerCache("https://conga.test/swagger.json", tmp_path, max_age=0, session=server)
+    assert cache.load().has("/metadata")
+    assert cache.last_source == "not-modified"
+    assert server.requests[-1]["If-None-Match"] == '"v1"'
+    assert "If-Modified-Since" in server.requests[-1]
+
+    # Within max_age, and offline, nothing goes over the network
+    cache = SwaggerCache("https://conga.test/swagger.json", tmp_path, max_age=60, session=server)
+    cache.load()
+    cache.load(offline=True)
+    assert len(server.requests) == 2
+
+    # An unreachable server falls back to the cached index
+    server.down = True
+    cache = SwaggerCache("https://conga.test/swagger.json", tmp_path, max_age=0, session=server)
+    assert cache.load().has("/objects")
+    assert cache.last_source == "stale"
+
+
+def test_changed_spec_is_downloaded_again(tmp_path):
+    server = FakeSpecServer()
+    SwaggerCache("https://conga.test/swagger.json", tmp_path, max_age=0, session=server).load()
+    server.body = json.dumps({"paths": {"/health": {"get": {}}}}).encode()
+    server.etag = '"v2"'
+
+    index = SwaggerCache("https://conga.test/swagger.json", tmp_path, max_age=0, session=server).load()
+    assert index.has("/health") and not index.has("/objects")
+
+    with pytest.raises(FileNotFoundError):
+        SwaggerCache("https://other.test/swagger.json", tmp_path, session=server).load(offline=True)
@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+
+from mock_conga_api import SAMPLE_SPEC, MockSettings, create_app
+from swagger_cache import SpecIndex
+from swagger_sweep import fill_path, pick_value, sweep
+
+BASE_URL = "http://mock.test/api/data"
+
+
+def run_sweep(**options):
+    transport = httpx.ASGITransport(app=create_app(settings=MockSettings(records=20, require_auth=False)))
+    return asyncio.run(sweep(SpecIndex.from_spec(SAMPLE_SPEC), BASE_URL, transport=transport, **options))
+
+
+def test_sweep_fills_parameters_from_parent_collections():
+    results = run_sweep()
+    assert len(results) == len(SAMPLE_SPEC["paths"])
+    assert all(r.result.status == 200 for r in results), [(r.path, r.result.status) for r in results]
+
+    by_operation = {r.operation.path: r for r in results}
+    record = by_operation["/v1/objects/{Type}/{id}"]
+    assert record.filled_from == "discovered"
+    assert record.path == "/v1/objects/Account/ACC000000001"
+    assert by_operation["/v1/objects"].filled_from == ""
+
+
+def test_sweep_respects_budget_and_samples():
+    results = run_sweep(budget=5, samples={"Type": "Lead"})
+    called = [r for r in results if r.result is not None]
+    assert len(called) == 5
+    assert all(r.skipped == "request budget spent" for r in results if r.result is None)
+
+    # Unknown sample values reach the mock, which rejects them like the real API
+    results = run_sweep(samples={"Type": "Nope"})
+    summary = next(r for r in results if r.operation.path == "/v1/objects/{Type}/summary")
+    assert summary.filled_from == "sample"
+    assert summary.result.status == 404
+
+
+def test_pick_value_and_placeholders():
+    assert pick_value({"Data": [{"Id": "a1", "Name": "Account"}]}, "objectName") == "Account"
+    assert pick_value([{"Id": "a1", "Name": "Account"}], "id") == "a1"
+    assert pick_value({"message": "no records"}, "id") is None
+
+    operation = SpecIndex.from_spec(
+        {"paths": {"/jobs/{jobId}": {"get": {"parameters": [{"name": "jobId", "in": "path", "type": "integer"}]}}}}
+    ).operation("/jobs/{jobId}")
+    assert fill_path(operation, {}, {}) == ("/jobs/1", "placeholder")